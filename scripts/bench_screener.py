@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+스크리너 벤치마크 (오프라인)
+합성 KRX 유니버스(기본 3,000종목)를 임시 BarStore/ListingCache에 만들어 두고
+네트워크 없이 StockScreener를 프로필별로 반복 실행해 성능을 측정합니다.
+
+측정 항목 (프로필별)
+- 처리량: 검사 종목 수 / 실행 시간 (symbols/s)
+- 지연: 반복 실행 p50 / p95 (ms)
+- 최대 메모리: tracemalloc 피크 (MB, 별도 1회 실행)
+- 참고: 종목별 check_momentum_surge(기존 행 단위 경로) 처리량 / p50 / p95
+
+사용법:
+    python scripts/bench_screener.py --symbols 5000 --repeat 10
+    python scripts/bench_screener.py --json bench.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../services/ai-engine'))
+
+from collectors.bar_store import BAR_DTYPE, BarSource, BarStore
+from collectors.listing_cache import ListingCache
+from strategies.screener import StockScreener
+from strategies.screener_panel import PROFILE_CONDITIONS
+
+# 프로필별 기본 min_score (결과가 너무 적거나 많지 않도록)
+DEFAULT_MIN_SCORES = {"momentum_surge": 8, "value_bounce": 2, "breakout": 2}
+
+
+def offline_fetcher(symbol, start, end):
+    """벤치마크 중 네트워크 호출이 발생하면 실패 처리"""
+    raise RuntimeError(f"network fetch during benchmark: {symbol} {start}~{end}")
+
+
+def synth_universe(n_symbols: int, days: int, seed: int = 42):
+    """
+    합성 유니버스 생성 -> (종목 리스트 DataFrame, {symbol: BAR_DTYPE 배열})
+
+    - 시가총액: 로그정규 (수백억 ~ 수백조), KOSPI 40% / KOSDAQ 60%
+    - 종가: 종목별 변동성이 다른 기하 브라운 운동 + 가끔 급등/급락
+    - 거래량: 로그정규 + 가격 변동 클수록 증가, 가끔 거래량 폭증
+    - 일부 종목은 상장 기간이 짧음 (봉 수 부족)
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=datetime.now().date() - timedelta(days=1), periods=days)
+    date_ints = (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype=np.int32)
+
+    symbols = [f"{i:06d}" for i in range(n_symbols)]
+    markets = np.where(rng.random(n_symbols) < 0.4, "KOSPI", "KOSDAQ")
+    market_caps = np.exp(rng.normal(np.log(3e11), 1.6, n_symbols)).clip(2e10, 4e14)
+
+    bars = {}
+    closes_last = np.zeros(n_symbols)
+    for i, symbol in enumerate(symbols):
+        sigma = rng.uniform(0.012, 0.05)
+        returns = rng.normal(0.0003, sigma, days)
+        jumps = rng.random(days) < 0.01
+        returns[jumps] += rng.normal(0, 0.12, jumps.sum())
+        returns = returns.clip(-0.3, 0.3)  # 가격제한폭
+
+        close = np.round(rng.uniform(1000, 80000) * np.cumprod(1 + returns))
+        open_ = np.round(close / (1 + returns) * (1 + rng.normal(0, sigma / 3, days)))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, sigma / 2, days)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, sigma / 2, days)))
+        base_volume = np.exp(rng.normal(np.log(2e5), 1.0))
+        volume = base_volume * np.exp(rng.normal(0, 0.5, days)) * (1 + 20 * np.abs(returns))
+        volume[rng.random(days) < 0.02] *= rng.uniform(3, 10)
+
+        length = days if rng.random() > 0.03 else int(rng.integers(5, 60))  # 신규 상장
+        arr = np.empty(length, dtype=BAR_DTYPE)
+        arr["date"] = date_ints[-length:]
+        arr["open"] = open_[-length:]
+        arr["high"] = np.round(high[-length:])
+        arr["low"] = np.round(low[-length:])
+        arr["close"] = close[-length:]
+        arr["volume"] = np.round(volume[-length:])
+        bars[symbol] = arr
+        closes_last[i] = close[-1]
+
+    listing = pd.DataFrame({
+        "Code": symbols,
+        "Name": [f"SYN{s}" for s in symbols],
+        "Market": markets,
+        "Marcap": market_caps,
+        "Close": closes_last,
+    })
+    return listing, bars
+
+
+def build_stand_in(root: str, listing: pd.DataFrame, bars: dict, days: int):
+    """임시 BarStore / ListingCache 구성 (모두 최신 상태로 표시 -> 네트워크 없음)"""
+    store = BarStore(os.path.join(root, "bars"), source=BarSource("offline", offline_fetcher))
+    covered_from = (datetime.now() - timedelta(days=days * 7 // 5 + 30)).date()
+    for symbol, arr in bars.items():
+        store.write(symbol, arr, covered_from=covered_from)
+
+    listings = ListingCache(os.path.join(root, "listing", "stock_list.npz"), ttl=86400,
+                            fetcher=lambda: listing, krx_json=None)
+    listings.get()
+    return store, listings
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000) if samples else 0.0
+
+
+def bench_profile(screener: StockScreener, profile_id: str, min_score: int,
+                  max_stocks: int, repeat: int) -> dict:
+    """run_screen_timed 반복 실행 + tracemalloc 피크 측정"""
+    screener.run_screen_timed(profile_id, min_score=min_score, max_stocks=max_stocks)  # 워밍업 (페이지 캐시)
+
+    latencies, checked, matches, fetch_ms, compute_ms = [], 0, 0, [], []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results, stats = screener.run_screen_timed(profile_id, min_score=min_score, max_stocks=max_stocks)
+        latencies.append(time.perf_counter() - t0)
+        checked, matches = stats.get("checked", 0), len(results)
+        fetch_ms.append(stats.get("fetch_ms", 0.0))
+        compute_ms.append(stats.get("compute_ms", 0.0))
+
+    tracemalloc.start()
+    screener.run_screen_timed(profile_id, min_score=min_score, max_stocks=max_stocks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentile_ms(latencies, 50)
+    return {
+        "profile_id": profile_id,
+        "min_score": min_score,
+        "checked": checked,
+        "matches": matches,
+        "throughput": round(checked / (p50 / 1000), 1) if p50 else 0.0,
+        "p50_ms": round(p50, 1),
+        "p95_ms": round(percentile_ms(latencies, 95), 1),
+        "fetch_ms_p50": round(float(np.median(fetch_ms)), 1),
+        "compute_ms_p50": round(float(np.median(compute_ms)), 1),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+    }
+
+
+def bench_reference(screener: StockScreener, listing: pd.DataFrame, sample: int) -> dict:
+    """기존 행 단위 경로 (get_stock_data + check_momentum_surge) 종목별 지연"""
+    params = screener.resolve_params("momentum_surge")
+    rows = listing.head(sample)
+    latencies = []
+    t_start = time.perf_counter()
+    for row in rows.itertuples(index=False):
+        t0 = time.perf_counter()
+        df = screener.get_stock_data(row.Code, days=30)
+        if df is not None:
+            screener.check_momentum_surge(row.Code, row.Name, row.Market, df, row.Marcap / 1e8, params)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - t_start
+    return {
+        "profile_id": "momentum_surge (check_momentum_surge)",
+        "checked": len(latencies),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile_ms(latencies, 50), 3),
+        "p95_ms": round(percentile_ms(latencies, 95), 3),
+    }
+
+
+def bench_batch(screener: StockScreener, min_scores: dict, max_stocks: int, repeat: int) -> dict:
+    """전체 프로필을 run_screens로 한 번에 평가"""
+    specs = [{"profile_id": p, "min_score": s} for p, s in min_scores.items()]
+    latencies, checked = [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _, stats = screener.run_screens(specs, max_stocks=max_stocks)
+        latencies.append(time.perf_counter() - t0)
+        checked = stats.get("checked", 0)
+    p50 = percentile_ms(latencies, 50)
+    return {
+        "profile_id": f"batch ({len(min_scores)} profiles)",
+        "checked": checked,
+        "throughput": round(checked / (p50 / 1000), 1) if p50 else 0.0,
+        "p50_ms": round(p50, 1),
+        "p95_ms": round(percentile_ms(latencies, 95), 1),
+    }
+
+
+def print_table(rows):
+    print(f"\n{'profile':<42}{'checked':>8}{'matches':>8}{'sym/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'peak MB':>9}")
+    print("-" * 98)
+    for r in rows:
+        print(f"{r['profile_id']:<42}{r['checked']:>8}{r.get('matches', ''):>8}{r['throughput']:>11}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r.get('peak_mb', ''):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스크리너 오프라인 벤치마크")
+    parser.add_argument("--symbols", type=int, default=3000, help="합성 종목 수 (기본 3000)")
+    parser.add_argument("--days", type=int, default=300, help="종목당 일봉 수 (기본 300)")
+    parser.add_argument("--repeat", type=int, default=5, help="프로필별 반복 횟수 (기본 5)")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILE_CONDITIONS),
+                        help="측정할 프로필 (기본 전체)")
+    parser.add_argument("--reference-sample", type=int, default=500,
+                        help="check_momentum_surge 측정 종목 수 (0이면 생략)")
+    parser.add_argument("--workers", type=int, default=None, help="SCREENER_FETCH_WORKERS 대신 사용할 스레드 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON으로 저장")
+    parser.add_argument("--keep", action="store_true", help="임시 데이터 디렉터리 유지")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="stockiq-bench-")
+    try:
+        print(f"Generating synthetic universe: {args.symbols} symbols x {args.days} bars ...")
+        t0 = time.perf_counter()
+        listing, bars = synth_universe(args.symbols, args.days, args.seed)
+        store, listings = build_stand_in(root, listing, bars, args.days)
+        print(f"  ready in {time.perf_counter() - t0:.1f}s ({root})")
+
+        screener = StockScreener(bar_store=store, fetch_workers=args.workers, listing_cache=listings)
+        min_scores = {p: DEFAULT_MIN_SCORES.get(p, len(PROFILE_CONDITIONS[p])) for p in args.profiles}
+
+        rows = []
+        for profile_id, min_score in min_scores.items():
+            print(f"Benchmarking {profile_id} (min_score={min_score}) ...")
+            rows.append(bench_profile(screener, profile_id, min_score, args.symbols, args.repeat))
+        if len(min_scores) > 1:
+            rows.append(bench_batch(screener, min_scores, args.symbols, args.repeat))
+        if args.reference_sample > 0:
+            rows.append(bench_reference(screener, listing, args.reference_sample))
+
+        print_table(rows)
+
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({
+                    "run_at": datetime.now().isoformat(timespec="seconds"),
+                    "symbols": args.symbols,
+                    "days": args.days,
+                    "repeat": args.repeat,
+                    "workers": screener.fetch_workers,
+                    "results": rows,
+                }, f, ensure_ascii=False, indent=2)
+            print(f"\nSaved: {args.json}")
+    finally:
+        if args.keep:
+            print(f"Data kept at {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
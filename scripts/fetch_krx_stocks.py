@@ -4,9 +4,15 @@ FinanceDataReader를 사용하여 KOSPI/KOSDAQ 전체 종목 리스트를 JSON
 Market Cap 정보를 포함하고 대형/중형/소형주로 분류합니다.
 """
 
+import argparse
 import json
+import os
+import sys
 from datetime import datetime
 
+# services/ai-engine 모듈 (BarStore) 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../services/ai-engine'))
+
 def classify_size(market, rank):
     """
     시장별 시가총액 순위에 따른 규모 분류
@@ -23,8 +29,38 @@ def classify_size(market, rank):
         return "Small"
     return "Small"
 
+def warm_bar_store(symbols, days):
+    """
+    로컬 일봉 저장소(BarStore) 일괄 동기화
+    스크리너/ChartAnalyst가 같은 저장소를 읽으므로, 이후 실행은 네트워크 없이 동작합니다.
+    이미 받은 종목은 마지막 봉 이후만 증분으로 받습니다.
+    """
+    from collectors.bar_store import bars_start, get_bar_store
+
+    store = get_bar_store()
+    # 스크리너(ensure_bars)와 같은 거래일 -> 달력일 환산
+    start = bars_start(days)
+    synced = 0
+    for i, symbol in enumerate(symbols, 1):
+        if not store.needs_sync(symbol, start):
+            continue
+        try:
+            store.sync(symbol, start)
+            synced += 1
+        except Exception as e:
+            print(f"  {symbol} bar sync failed: {e}")
+        if i % 200 == 0:
+            print(f"  {i}/{len(symbols)} processed")
+    print(f"  Bars synced: {synced} / {len(symbols)} symbols ({store.root})")
+
+
 def main():
     import FinanceDataReader as fdr
+
+    parser = argparse.ArgumentParser(description="KRX 종목 리스트 저장")
+    parser.add_argument("--bars", type=int, default=0, metavar="DAYS",
+                        help="KOSPI/KOSDAQ 종목의 최근 DAYS개 거래일 일봉을 로컬 저장소에 동기화")
+    args = parser.parse_args()
     
     print("=" * 50)
     print("전체 종목 리스트 가져오기 (FinanceDataReader)")
@@ -46,6 +82,7 @@ def main():
             "name": row['Name'],
             "market": "KOSPI",
             "marcap": int(row['Marcap']) if 'Marcap' in row and str(row['Marcap']).isdigit() else 0,
+            "close": int(row['Close']) if 'Close' in row and str(row['Close']).isdigit() else 0,
             "size": size
         })
     print(f"  KOSPI: {len(kospi)} stocks (Processed with ranking)")
@@ -62,6 +99,7 @@ def main():
             "name": row['Name'],
             "market": "KOSDAQ",
             "marcap": int(row['Marcap']) if 'Marcap' in row and str(row['Marcap']).isdigit() else 0,
+            "close": int(row['Close']) if 'Close' in row and str(row['Close']).isdigit() else 0,
             "size": size
         })
     print(f"  KOSDAQ: {len(kosdaq)} stocks (Processed with ranking)")
@@ -85,7 +123,6 @@ def main():
     # JSON 저장
     output_file = "data/krx_stock_list.json"
     
-    import os
     os.makedirs("data", exist_ok=True)
     
     with open(output_file, "w", encoding="utf-8") as f:
@@ -96,6 +133,11 @@ def main():
         }, f, ensure_ascii=False, indent=2)
     
     print(f"\n✅ 총 {len(stocks)} 종목 저장 완료: {output_file}")
+    
+    # 4. 일봉 저장소 동기화 (선택)
+    if args.bars > 0:
+        print(f"\nSyncing daily bars ({args.bars} days)...")
+        warm_bar_store([s["symbol"] for s in stocks if s["market"] != "ETF"], args.bars)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+키움 REST/WebSocket API 로컬 시뮬레이터 (오프라인 부하 테스트용)
+실계좌 없이 KiwoomCollector / AsyncKiwoomCollector / KiwoomConditionCollector / AutoTrader를
+그대로 붙여 매매 루프의 처리량과 지연을 재현 가능하게 측정하기 위한 가짜 서버입니다.
+
+지원 API
+- REST: au10001(토큰), ka10001(종목명), ka10004(호가), ka10080/81/82(분/일/주봉, cont-yn/next-key 연속조회),
+        kt00001(예수금), kt00004(잔고), kt10000/kt10001(매수/매도 - 가상 계좌에 즉시 체결)
+- WebSocket (/api/dostk/websocket): LOGIN, CNSRLST, CNSRREQ(조건검색 실시간 편입 REAL 02),
+        REG/REMOVE(실시간 체결 REAL 0B), 서버 PING -> 클라이언트 에코
+- 부하 요소: 응답 지연(평균 + 지터), api-id 그룹별 초당 요청 제한(초과 시 429), 임의 500 에러
+- 시세: 종목별 시드 고정 랜덤워크 또는 --replay 파일(JSON lines) 재생
+- 제어: GET /sim/stats, POST /sim/condition {"symbol"}, POST /sim/price {"symbol", "price"}
+
+재생 파일 형식 (한 줄에 이벤트 하나, t는 시작 후 초):
+    {"t": 0.5, "type": "tick", "symbol": "005930", "price": 70100}
+    {"t": 1.0, "type": "condition", "symbol": "005930"}
+
+사용법:
+    python scripts/kiwoom_simulator.py --port 9100 --latency-ms 30 --jitter-ms 10 --query-rate 5
+    KIWOOM_BASE_URL=http://127.0.0.1:9100 KIWOOM_APP_KEY=sim KIWOOM_SECRET_KEY=sim \\
+        KIWOOM_ACCOUNT=00000000 python services/ai-engine/main_auto.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '../services/ai-engine'))
+
+from collectors.kiwoom_token import KST
+from collectors.kiwoom_transport import API_GROUPS, WS_PATH
+from collectors.listing_cache import DEFAULT_KRX_JSON, read_krx_json
+from utils.rate_limit import RateLimiter
+
+DAILY_PAGE = 600    # 일/주봉 한 페이지 봉 수 (실서버와 비슷하게)
+MINUTE_PAGE = 900   # 분봉 한 페이지 봉 수
+RATE_LIMIT_BODY = {"return_code": 5, "return_msg": "허용된 요청 개수를 초과하였습니다"}
+
+
+@dataclass
+class SimConfig:
+    latency_ms: float = 20.0      # 평균 응답 지연
+    jitter_ms: float = 5.0        # 지연 표준편차
+    error_rate: float = 0.0       # 임의 500 응답 비율
+    query_rate: float = 5.0       # 조회 api-id 초당 허용 요청 수 (0이면 제한 없음)
+    order_rate: float = 5.0       # 주문 api-id 초당 허용 요청 수
+    token_ttl: float = 24 * 3600  # 토큰 유효 시간 (초)
+    symbols: int = 200            # 시세를 만들 종목 수
+    daily_bars: int = 1500
+    minute_bars: int = 2000
+    cash: int = 100_000_000       # 가상 계좌 예수금
+    tick_interval: float = 1.0    # 실시간 체결(0B) 전송 주기 (초)
+    condition_interval: float = 0.0  # 조건검색 편입(02) 전송 주기 (초, 0이면 /sim/condition 또는 재생만)
+    ping_interval: float = 30.0
+    replay: Optional[str] = None
+    replay_speed: float = 1.0
+    seed: int = 42
+
+
+@dataclass
+class Position:
+    qty: int = 0
+    avg: float = 0.0
+
+
+@dataclass
+class SimStats:
+    requests: Dict[str, int] = field(default_factory=dict)
+    rate_limited: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    orders: int = 0
+    ws_clients: int = 0
+    ticks_sent: int = 0
+    conditions_sent: int = 0
+
+
+class MarketSim:
+    """종목 목록 + 현재가 + 차트 생성 (종목별 시드 고정이라 같은 설정이면 같은 데이터)"""
+
+    def __init__(self, config: SimConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.names = self._load_names(config.symbols)
+        self.symbols = list(self.names)
+        self.prices = {symbol: self._base_price(symbol) for symbol in self.symbols}
+        self._charts: Dict[tuple, List[dict]] = {}
+
+    @staticmethod
+    def _load_names(n: int) -> Dict[str, str]:
+        df, _ = read_krx_json(DEFAULT_KRX_JSON)
+        if df is not None and not df.empty:
+            return dict(zip(df["Code"].head(n), df["Name"].head(n)))
+        names = {"005930": "삼성전자", "000660": "SK하이닉스", "035420": "NAVER", "035720": "카카오"}
+        for i in range(len(names), n):
+            names[f"{900000 + i:06d}"] = f"시뮬종목{i:04d}"
+        return names
+
+    def _seed(self, symbol: str) -> int:
+        return zlib.crc32(symbol.encode()) ^ self.config.seed
+
+    def _base_price(self, symbol: str) -> int:
+        return tick_round(random.Random(self._seed(symbol)).uniform(2_000, 300_000))
+
+    def name(self, symbol: str) -> str:
+        return self.names.get(symbol, f"시뮬종목{symbol}")
+
+    def price(self, symbol: str) -> int:
+        if symbol not in self.prices:
+            self.prices[symbol] = self._base_price(symbol)
+        return self.prices[symbol]
+
+    def step(self, symbol: str) -> int:
+        """랜덤워크 한 걸음 (±0.5% 내외)"""
+        price = tick_round(self.price(symbol) * (1 + self.rng.gauss(0, 0.005)))
+        self.prices[symbol] = max(price, 10)
+        return self.prices[symbol]
+
+    def ask(self, symbol: str) -> int:
+        price = self.price(symbol)
+        return price + tick_size(price)
+
+    def _path(self, symbol: str, n: int, vol: float) -> np.ndarray:
+        """마지막 값이 현재 기준가인 기하 랜덤워크 종가 n개"""
+        rng = np.random.default_rng(self._seed(symbol))
+        log_path = np.cumsum(rng.normal(0, vol, n))
+        return self._base_price(symbol) * np.exp(log_path - log_path[-1])
+
+    def chart(self, symbol: str, api_id: str, tic_scope: str = "1") -> List[dict]:
+        """차트 봉 목록 (최신 봉이 먼저, 키움 응답 순서)"""
+        key = (symbol, api_id, tic_scope)
+        if key in self._charts:
+            return self._charts[key]
+
+        if api_id == "ka10080":
+            stamps = session_minutes(datetime.now(), int(tic_scope or 1), self.config.minute_bars)
+            closes = self._path(symbol, len(stamps), 0.002)
+            stamp_key, fmt = "cntr_tm", "%Y%m%d%H%M%S"
+        else:
+            freq = "W-FRI" if api_id == "ka10082" else "B"
+            n = self.config.daily_bars // 5 if api_id == "ka10082" else self.config.daily_bars
+            stamps = list(pd.date_range(end=datetime.now().date(), periods=n, freq=freq))
+            closes = self._path(symbol, len(stamps), 0.02)
+            stamp_key, fmt = "dt", "%Y%m%d"
+
+        rng = np.random.default_rng(self._seed(symbol) + 1)
+        opens = np.concatenate([[closes[0]], closes[:-1]])
+        spread = np.abs(rng.normal(0, 0.01, len(closes)))
+        highs = np.maximum(opens, closes) * (1 + spread)
+        lows = np.minimum(opens, closes) * (1 - spread)
+        volumes = rng.lognormal(11, 1, len(closes)).astype(np.int64)
+
+        items = [
+            {
+                stamp_key: stamp.strftime(fmt),
+                "cur_prc": str(tick_round(c)), "open_pric": str(tick_round(o)),
+                "high_pric": str(tick_round(h)), "low_pric": str(tick_round(l)),
+                "trde_qty": str(v),
+            }
+            for stamp, o, h, l, c, v in zip(stamps, opens, highs, lows, closes, volumes)
+        ]
+        items.reverse()
+        self._charts[key] = items
+        return items
+
+
+def tick_size(price: float) -> int:
+    """KRX 호가 단위 (2023 개편 기준)"""
+    for limit, tick in ((2_000, 1), (5_000, 5), (20_000, 10), (50_000, 50), (200_000, 100), (500_000, 500)):
+        if price < limit:
+            return tick
+    return 1_000
+
+
+def tick_round(price: float) -> int:
+    tick = tick_size(price)
+    return int(round(price / tick) * tick)
+
+
+def session_minutes(now: datetime, scope: int, n: int) -> List[datetime]:
+    """now 이전 정규장(평일 09:00~15:30) 분봉 시각 n개, 오래된 순"""
+    stamps = []
+    t = now.replace(second=0, microsecond=0)
+    t -= timedelta(minutes=t.minute % scope)
+    while len(stamps) < n:
+        if t.weekday() < 5 and (9, 0) <= (t.hour, t.minute) <= (15, 30):
+            stamps.append(t)
+            t -= timedelta(minutes=scope)
+        elif t.weekday() < 5 and (t.hour, t.minute) > (15, 30):
+            t = t.replace(hour=15, minute=30 - 30 % scope)
+        else:
+            t = (t - timedelta(days=1)).replace(hour=15, minute=30 - 30 % scope)
+    stamps.reverse()
+    return stamps
+
+
+class KiwoomSimulator:
+    """가상 계좌 + 토큰 + 속도 제한 + WebSocket 구독자 관리"""
+
+    def __init__(self, config: SimConfig):
+        self.config = config
+        self.market = MarketSim(config)
+        self.stats = SimStats()
+        self.rng = random.Random(config.seed + 1)
+        self.cash = config.cash
+        self.positions: Dict[str, Position] = {}
+        self.tokens: Dict[str, float] = {}
+        rates = {"query": config.query_rate, "order": config.order_rate}
+        self.limiters = {group: RateLimiter(rate) for group, rate in rates.items() if rate > 0}
+        self.condition_clients: Set[WebSocket] = set()
+        self.tick_clients: Dict[WebSocket, Set[str]] = {}
+
+    # --- REST helpers ---
+
+    def issue_token(self) -> dict:
+        token = f"SIM{len(self.tokens) + 1:06d}{self.rng.getrandbits(32):08x}"
+        expires_at = time.time() + self.config.token_ttl
+        self.tokens[token] = expires_at
+        return {
+            "token": token, "token_type": "bearer",
+            "expires_dt": datetime.fromtimestamp(expires_at, KST).strftime("%Y%m%d%H%M%S"),
+            "return_code": 0, "return_msg": "정상적으로 처리되었습니다",
+        }
+
+    def authorized(self, header: Optional[str]) -> bool:
+        token = (header or "").replace("Bearer ", "", 1)
+        return self.tokens.get(token, 0) > time.time()
+
+    def rate_limited(self, api_id: str) -> bool:
+        limiter = self.limiters.get(API_GROUPS.get(api_id, "query"))
+        return limiter is not None and limiter.try_acquire() > 0
+
+    async def delay(self):
+        latency = self.rng.gauss(self.config.latency_ms, self.config.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    # --- API handlers (api-id -> response body) ---
+
+    def stock_info(self, body: dict) -> dict:
+        symbol = body.get("stk_cd", "")
+        return {"stk_cd": symbol, "stk_nm": self.market.name(symbol),
+                "cur_prc": str(self.market.price(symbol)), "return_code": 0}
+
+    def hoga(self, body: dict) -> dict:
+        symbol = body.get("stk_cd", "")
+        ask = self.market.ask(symbol)
+        return {"sel_fpr_bid": f"-{ask}", "buy_fpr_bid": f"-{self.market.price(symbol)}",
+                "sel_fpr_req": "1000", "buy_fpr_req": "1000", "return_code": 0}
+
+    def chart_page(self, api_id: str, body: dict, next_key: Optional[str]):
+        items = self.market.chart(body.get("stk_cd", ""), api_id, body.get("tic_scope", "1"))
+        page = MINUTE_PAGE if api_id == "ka10080" else DAILY_PAGE
+        offset = int(next_key) if next_key and next_key.isdigit() else 0
+        chunk = items[offset:offset + page]
+        list_key = {"ka10080": "stk_min_pole_chart_qry", "ka10082": "stk_week_pole_chart_qry"}.get(
+            api_id, "stk_day_pole_chart_qry")
+        more = offset + page < len(items)
+        headers = {"cont-yn": "Y" if more else "N", "next-key": str(offset + page) if more else ""}
+        return {"stk_cd": body.get("stk_cd", ""), list_key: chunk, "return_code": 0}, headers
+
+    def deposit(self) -> dict:
+        return {"entr": str(self.cash), "ord_alow_amt": str(self.cash), "return_code": 0}
+
+    def holdings(self) -> dict:
+        rows = []
+        for symbol, pos in self.positions.items():
+            if pos.qty <= 0:
+                continue
+            price = self.market.price(symbol)
+            pl = (price - pos.avg) * pos.qty
+            rows.append({
+                "stk_cd": f"A{symbol}", "stk_nm": self.market.name(symbol),
+                "rmnd_qty": str(pos.qty), "avg_prc": str(int(pos.avg)), "cur_prc": str(price),
+                "evlt_amt": str(price * pos.qty), "pl_amt": str(int(pl)),
+                "pl_rt": f"{(price / pos.avg - 1) * 100:.2f}" if pos.avg else "0.00",
+            })
+        return {"stk_acnt_evlt_prst": rows, "entr": str(self.cash), "return_code": 0}
+
+    def order(self, api_id: str, body: dict) -> dict:
+        """시장가(가격 0)는 현재 호가에, 지정가는 지정 가격에 즉시 전량 체결"""
+        symbol = body.get("stk_cd", "").replace("A", "")
+        qty = int(body.get("ord_qty") or 0)
+        limit = int(body.get("ord_uv") or 0)
+        self.stats.orders += 1
+        if qty <= 0:
+            return {"return_code": 1, "return_msg": "주문수량 오류"}
+
+        pos = self.positions.setdefault(symbol, Position())
+        if api_id == "kt10000":
+            price = limit or self.market.ask(symbol)
+            if price * qty > self.cash:
+                return {"return_code": 1, "return_msg": "주문가능금액이 부족합니다"}
+            self.cash -= price * qty
+            pos.avg = (pos.avg * pos.qty + price * qty) / (pos.qty + qty)
+            pos.qty += qty
+        else:
+            if qty > pos.qty:
+                return {"return_code": 1, "return_msg": "매도가능수량이 부족합니다"}
+            self.cash += (limit or self.market.price(symbol)) * qty
+            pos.qty -= qty
+        return {"ord_no": f"{self.stats.orders:07d}", "return_code": 0, "return_msg": "정상적으로 처리되었습니다"}
+
+    # --- WebSocket push ---
+
+    async def push_condition(self, symbol: str):
+        packet = json.dumps({"trnm": "REAL", "data": [{
+            "type": "02", "name": "조건검색", "item": f"A{symbol}",
+            "values": {"841": "0", "9001": f"A{symbol}", "843": "I",
+                       "20": datetime.now().strftime("%H%M%S"), "907": "2"},
+        }]})
+        for ws in list(self.condition_clients):
+            try:
+                await ws.send_text(packet)
+                self.stats.conditions_sent += 1
+            except Exception:
+                self.condition_clients.discard(ws)
+
+    async def push_tick(self, symbol: str, price: int):
+        packet = json.dumps({"trnm": "REAL", "data": [{
+            "type": "0B", "name": "주식체결", "item": symbol,
+            "values": {"20": datetime.now().strftime("%H%M%S"), "10": f"+{price}",
+                       "27": f"+{price + tick_size(price)}", "28": f"+{price}",
+                       "15": f"+{self.rng.randint(1, 500)}"},
+        }]})
+        for ws, symbols in list(self.tick_clients.items()):
+            if symbol in symbols:
+                try:
+                    await ws.send_text(packet)
+                    self.stats.ticks_sent += 1
+                except Exception:
+                    self.tick_clients.pop(ws, None)
+
+    async def tick_loop(self):
+        """구독 중인 종목 시세를 tick_interval마다 한 걸음씩 움직여 0B 전송"""
+        while True:
+            await asyncio.sleep(self.config.tick_interval)
+            for symbol in set().union(*self.tick_clients.values()) if self.tick_clients else ():
+                await self.push_tick(symbol, self.market.step(symbol))
+
+    async def condition_loop(self):
+        while True:
+            await asyncio.sleep(self.config.condition_interval)
+            await self.push_condition(self.rng.choice(self.market.symbols))
+
+    async def replay_loop(self, path: str):
+        """재생 파일 이벤트를 시간 순서대로 전송 (replay_speed 배속)"""
+        with open(path, encoding="utf-8") as f:
+            events = sorted((json.loads(line) for line in f if line.strip()), key=lambda e: e.get("t", 0))
+        started = time.monotonic()
+        for event in events:
+            wait = event.get("t", 0) / self.config.replay_speed - (time.monotonic() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            symbol = str(event["symbol"])
+            if event.get("type") == "condition":
+                await self.push_condition(symbol)
+            else:
+                self.market.prices[symbol] = int(event["price"])
+                await self.push_tick(symbol, int(event["price"]))
+
+
+def create_app(config: SimConfig) -> FastAPI:
+    sim = KiwoomSimulator(config)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        tasks = [asyncio.create_task(sim.tick_loop())]
+        if config.condition_interval > 0:
+            tasks.append(asyncio.create_task(sim.condition_loop()))
+        if config.replay:
+            tasks.append(asyncio.create_task(sim.replay_loop(config.replay)))
+        yield
+        for task in tasks:
+            task.cancel()
+
+    app = FastAPI(title="Kiwoom API Simulator", lifespan=lifespan)
+    app.state.sim = sim
+
+    async def handle(request: Request):
+        api_id = request.headers.get("api-id", "")
+        sim.stats.requests[api_id] = sim.stats.requests.get(api_id, 0) + 1
+        body = await request.json()
+        await sim.delay()
+
+        if api_id == "au10001":
+            return JSONResponse(sim.issue_token())
+        if not sim.authorized(request.headers.get("authorization")):
+            return JSONResponse({"return_code": 3, "return_msg": "인증에 실패했습니다"}, status_code=401)
+        if sim.rate_limited(api_id):
+            sim.stats.rate_limited[api_id] = sim.stats.rate_limited.get(api_id, 0) + 1
+            return JSONResponse(RATE_LIMIT_BODY, status_code=429)
+        if config.error_rate and sim.rng.random() < config.error_rate:
+            sim.stats.errors += 1
+            return JSONResponse({"return_code": 1, "return_msg": "시뮬레이터 임의 오류"}, status_code=500)
+
+        headers = {"api-id": api_id}
+        if api_id == "ka10001":
+            data = sim.stock_info(body)
+        elif api_id == "ka10004":
+            data = sim.hoga(body)
+        elif api_id in ("ka10080", "ka10081", "ka10082"):
+            next_key = request.headers.get("next-key") if request.headers.get("cont-yn") == "Y" else None
+            data, page_headers = sim.chart_page(api_id, body, next_key)
+            headers.update(page_headers)
+        elif api_id == "kt00001":
+            data = sim.deposit()
+        elif api_id == "kt00004":
+            data = sim.holdings()
+        elif api_id in ("kt10000", "kt10001"):
+            data = sim.order(api_id, body)
+        else:
+            return JSONResponse({"return_code": 1, "return_msg": f"unknown api-id {api_id}"}, status_code=400)
+        return JSONResponse(data, headers=headers)
+
+    for path in ("/oauth2/token", "/api/dostk/stkinfo", "/api/dostk/mrkcond",
+                 "/api/dostk/chart", "/api/dostk/acnt", "/api/dostk/ordr"):
+        app.add_api_route(path, handle, methods=["POST"])
+
+    @app.websocket(WS_PATH)
+    async def websocket_endpoint(ws: WebSocket):
+        await ws.accept()
+        sim.stats.ws_clients += 1
+        logged_in = False
+
+        async def ping():
+            while True:
+                await asyncio.sleep(config.ping_interval)
+                await ws.send_text(json.dumps({"trnm": "PING"}))
+
+        pinger = asyncio.create_task(ping())
+        try:
+            while True:
+                packet = json.loads(await ws.receive_text())
+                trnm = packet.get("trnm")
+                if trnm == "LOGIN":
+                    logged_in = sim.authorized(packet.get("token"))
+                    await ws.send_text(json.dumps({
+                        "trnm": "LOGIN", "return_code": 0 if logged_in else 100013,
+                        "return_msg": "" if logged_in else "인증에 실패했습니다",
+                    }))
+                elif trnm == "PING":
+                    continue  # client echo
+                elif not logged_in:
+                    await ws.send_text(json.dumps({"trnm": trnm, "return_code": 100013,
+                                                   "return_msg": "로그인이 필요합니다"}))
+                elif trnm == "CNSRLST":
+                    await ws.send_text(json.dumps({"trnm": "CNSRLST", "return_code": 0,
+                                                   "data": [["0", "시뮬 급등주"]]}))
+                elif trnm == "CNSRREQ":
+                    sim.condition_clients.add(ws)
+                    await ws.send_text(json.dumps({"trnm": "CNSRREQ", "return_code": 0,
+                                                   "seq": packet.get("seq", "0"), "data": []}))
+                elif trnm in ("REG", "REMOVE"):
+                    symbols = sim.tick_clients.setdefault(ws, set())
+                    for group in packet.get("data", []):
+                        if "0B" in group.get("type", []):
+                            items = {str(item).replace("A", "") for item in group.get("item", [])}
+                            if trnm == "REG":
+                                symbols |= items
+                            else:
+                                symbols -= items
+                    await ws.send_text(json.dumps({"trnm": trnm, "return_code": 0}))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            pinger.cancel()
+            sim.condition_clients.discard(ws)
+            sim.tick_clients.pop(ws, None)
+            sim.stats.ws_clients -= 1
+
+    @app.get("/sim/stats")
+    def sim_stats():
+        return {
+            "requests": sim.stats.requests, "rate_limited": sim.stats.rate_limited,
+            "errors": sim.stats.errors, "orders": sim.stats.orders,
+            "ws_clients": sim.stats.ws_clients, "ticks_sent": sim.stats.ticks_sent,
+            "conditions_sent": sim.stats.conditions_sent,
+            "cash": sim.cash, "positions": {s: vars(p) for s, p in sim.positions.items() if p.qty},
+        }
+
+    @app.post("/sim/condition")
+    async def sim_condition(payload: dict):
+        await sim.push_condition(str(payload["symbol"]))
+        return {"sent": len(sim.condition_clients)}
+
+    @app.post("/sim/price")
+    async def sim_price(payload: dict):
+        symbol, price = str(payload["symbol"]), int(payload["price"])
+        sim.market.prices[symbol] = price
+        await sim.push_tick(symbol, price)
+        return {"symbol": symbol, "price": price}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키움 REST/WebSocket API 로컬 시뮬레이터")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="평균 응답 지연 (기본 20ms)")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="응답 지연 표준편차 (기본 5ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="임의 500 응답 비율 (0~1)")
+    parser.add_argument("--query-rate", type=float, default=5.0, help="조회 초당 허용 요청 수, 0이면 무제한")
+    parser.add_argument("--order-rate", type=float, default=5.0, help="주문 초당 허용 요청 수, 0이면 무제한")
+    parser.add_argument("--token-ttl", type=float, default=24 * 3600, help="토큰 유효 시간 (초)")
+    parser.add_argument("--symbols", type=int, default=200, help="시세를 만들 종목 수")
+    parser.add_argument("--cash", type=int, default=100_000_000, help="가상 계좌 예수금")
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="실시간 체결 전송 주기 (초)")
+    parser.add_argument("--condition-interval", type=float, default=0.0,
+                        help="조건검색 편입 전송 주기 (초, 0이면 수동/재생만)")
+    parser.add_argument("--ping-interval", type=float, default=30.0)
+    parser.add_argument("--replay", metavar="PATH", help="시세/조건검색 이벤트 재생 파일 (JSON lines)")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="재생 배속")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    config = SimConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        query_rate=args.query_rate, order_rate=args.order_rate, token_ttl=args.token_ttl,
+        symbols=args.symbols, cash=args.cash, tick_interval=args.tick_interval,
+        condition_interval=args.condition_interval, ping_interval=args.ping_interval,
+        replay=args.replay, replay_speed=args.replay_speed, seed=args.seed,
+    )
+    print(f"Kiwoom simulator: http://{args.host}:{args.port}  ws://{args.host}:{args.port}{WS_PATH}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, List, Optional
+
+from collectors.kiwoom import KiwoomCollector
+from collectors.symbol_master import get_symbol_master
+
+logger = logging.getLogger(__name__)
+
+# Consumers that find the state older than this (seconds) refresh it themselves
+ACCOUNT_MAX_AGE = float(os.getenv("ACCOUNT_MAX_AGE", "60"))
+# A symbol we just sold is ignored by refresh for this long (kt00004 may still list it)
+SOLD_GRACE = 60.0
+# An accepted limit buy that kt00004 has not listed after this long (seconds) is forgotten
+PENDING_BUY_TTL = float(os.getenv("ACCOUNT_PENDING_TTL", "1800"))
+# refresh() re-reads the broker when our own orders land mid-read; gives up after this many reads
+REFRESH_ATTEMPTS = 3
+
+
+def parse_price(value) -> float:
+    """Kiwoom signed price string ('+70100', '-69900') -> absolute price, 0 if missing"""
+    try:
+        return abs(float(value))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class Holding:
+    symbol: str
+    name: str
+    qty: int
+    avg_price: float
+    last_price: float = 0.0
+    price_at: float = 0.0  # time.monotonic() of the last real-time tick
+
+    @property
+    def pl_rt(self) -> float:
+        """P/L (%) against the local average price"""
+        if self.avg_price <= 0 or self.last_price <= 0:
+            return 0.0
+        return (self.last_price / self.avg_price - 1) * 100
+
+    def to_row(self) -> dict:
+        """kt00004 row format (what the Telegram menus render)"""
+        return {
+            'stk_cd': f"A{self.symbol}",
+            'stk_nm': self.name,
+            'rmnd_qty': str(self.qty),
+            'avg_prc': str(int(self.avg_price)),
+            'cur_prc': str(int(self.last_price)),
+            'pl_rt': f"{self.pl_rt:.2f}",
+        }
+
+
+@dataclass
+class PendingBuy:
+    """Accepted limit buy not yet seen in kt00004 (not a holding, so the monitor ignores it)"""
+    symbol: str
+    name: str
+    qty: int
+    price: float
+    placed_at: float  # time.time()
+
+
+@dataclass
+class _LocalOrder:
+    """Our own order, applied locally until kt00004/kt00001 reflect it"""
+    seq: int
+    symbol: str
+    side: str  # 'buy' (filled), 'sell' or 'pending' (limit buy)
+    qty: int
+    price: float
+    name: Optional[str] = None
+    at: float = field(default_factory=time.time)
+
+
+@dataclass
+class AccountSnapshot:
+    cash: int
+    holdings: Dict[str, Holding]
+    updated_at: float
+    pending: Dict[str, PendingBuy] = field(default_factory=dict)
+
+
+# listener(added symbols, removed symbols); may be called from any thread
+Listener = Callable[[List[str], List[str]], None]
+
+
+class AccountState:
+    """
+    In-memory holdings and buying power for one account, shared by the buy path,
+    the position monitor, /status and the /m menu.
+    - refresh(): kt00004 + kt00001 (periodic reconcile, or on demand when older than ACCOUNT_MAX_AGE)
+    - apply_fill(): our own filled orders update qty/average price/cash right away
+    - add_pending_buy(): accepted limit buys hold their cash but only become holdings
+      once kt00004 lists them
+    - update_price(): real-time ticks keep last price (and P/L) current
+    - reserve_cash()/release_cash(): concurrent buys size from cash not already set aside
+      for another in-flight buy
+    Thread-safe: buys run in worker threads, the monitor on the event loop.
+    """
+
+    def __init__(self, account_no: str, kiwoom: Optional[KiwoomCollector] = None):
+        self.account_no = account_no
+        self.kiwoom = kiwoom or KiwoomCollector()
+        self.cash = 0
+        self.holdings: Dict[str, Holding] = {}
+        self.pending: Dict[str, PendingBuy] = {}
+        self.updated_at = 0.0
+        self._seq = 0  # bumped by every local update (refresh checks it did not move during a read)
+        self._sold: Dict[str, float] = {}
+        self._reserved: Dict[str, int] = {}  # symbol -> cash set aside for an in-flight buy
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def add_listener(self, listener: Listener):
+        self._listeners.append(listener)
+
+    def _notify(self, added: Iterable[str], removed: Iterable[str]):
+        added, removed = list(added), list(removed)
+        if not added and not removed:
+            return
+        for listener in self._listeners:
+            try:
+                listener(added, removed)
+            except Exception as e:
+                logger.error(f"Account listener error: {e}")
+
+    # --- Reconcile ---
+
+    def refresh(self):
+        """
+        Reload holdings and buying power from the broker (raises on failure, state kept).
+        If one of our own orders was applied while kt00004/kt00001 were being read, the
+        data may or may not include it, so it is read again (up to REFRESH_ATTEMPTS times).
+        """
+        with self._refresh_lock:
+            for _ in range(REFRESH_ATTEMPTS):
+                with self._lock:
+                    start_seq = self._seq
+                read_at = time.monotonic()
+                rows = self.kiwoom.fetch_holdings(self.account_no)
+                cash = self.kiwoom.fetch_balance(self.account_no)
+                with self._lock:
+                    if self._seq == start_seq:
+                        added, removed = self._replace_locked(rows, cash, read_at)
+                        break
+                logger.info("Local order applied during account refresh, reading again")
+            else:
+                raise RuntimeError(f"account kept changing during {REFRESH_ATTEMPTS} reads")
+        self._notify(added, removed)
+
+    def _replace_locked(self, rows: List[dict], cash: int, read_at: float):
+        now = time.monotonic()
+        self._sold = {s: at for s, at in self._sold.items() if now - at < SOLD_GRACE}
+        fresh: Dict[str, Holding] = {}
+        for row in rows:
+            try:
+                symbol = row['stk_cd'].replace('A', '')
+                qty = int(row['rmnd_qty'])
+            except (KeyError, ValueError):
+                continue
+            if qty <= 0 or symbol in self._sold:
+                continue
+            avg_price = parse_price(row.get('avg_prc') or row.get('pur_pric'))
+            cur_price = parse_price(row.get('cur_prc'))
+            holding = self.holdings.get(symbol)
+            if holding is None:
+                holding = Holding(symbol=symbol, name=row.get('stk_nm', symbol), qty=qty,
+                                  avg_price=avg_price, last_price=cur_price)
+            else:
+                # Update in place (the monitor may hold a reference)
+                holding.qty, holding.avg_price = qty, avg_price or holding.avg_price
+                # kt00004's price wins unless a tick arrived after the read started, so a stalled
+                # feed cannot pin an old price (and hide a stop-loss) across reconciles
+                if cur_price > 0 and holding.price_at < read_at:
+                    holding.last_price = cur_price
+            fresh[symbol] = holding
+
+        before = set(self.holdings)
+        self.holdings, self.cash, self.updated_at = fresh, cash, time.time()
+        # A pending limit buy that kt00004 lists has filled (ord_alow_amt already excludes
+        # the cash of the ones still open)
+        self.pending = {s: p for s, p in self.pending.items()
+                        if s not in fresh and self.updated_at - p.placed_at < PENDING_BUY_TTL}
+        return self.holdings.keys() - before, before - self.holdings.keys()
+
+    def snapshot(self, max_age: float = ACCOUNT_MAX_AGE) -> AccountSnapshot:
+        """Current state (copies), refreshed first if it is older than max_age"""
+        if time.time() - self.updated_at > max_age:
+            try:
+                self.refresh()
+            except Exception as e:
+                if not self.updated_at:
+                    raise
+                logger.warning(f"Account refresh failed, using state from {time.time() - self.updated_at:.0f}s ago: {e}")
+        with self._lock:
+            return AccountSnapshot(
+                cash=self.cash,
+                holdings={s: replace(h) for s, h in self.holdings.items()},
+                updated_at=self.updated_at,
+                pending={s: replace(p) for s, p in self.pending.items()},
+            )
+
+    def holdings_list(self, max_age: float = ACCOUNT_MAX_AGE) -> List[dict]:
+        """Holdings as kt00004-style rows"""
+        return [h.to_row() for h in self.snapshot(max_age).holdings.values()]
+
+    # --- Local updates ---
+
+    def apply_fill(self, symbol: str, side: str, qty: int, price: float, name: Optional[str] = None):
+        """Apply our own filled order (side 'buy' / 'sell') until the next refresh confirms it"""
+        self._record(symbol, side, qty, price, name)
+
+    def add_pending_buy(self, symbol: str, qty: int, price: float, name: Optional[str] = None):
+        """Record an accepted limit buy: its cash is held, the position waits for kt00004"""
+        self._record(symbol, 'pending', qty, price, name)
+
+    def _record(self, symbol: str, side: str, qty: int, price: float, name: Optional[str]):
+        with self._lock:
+            self._seq += 1
+            order = _LocalOrder(self._seq, symbol, side, qty, price, name)
+            before = set(self.holdings)
+            self._apply_locked(order)
+            added = self.holdings.keys() - before
+            removed = before - self.holdings.keys()
+        self._notify(added, removed)
+
+    def _apply_locked(self, order: _LocalOrder):
+        symbol, qty, price = order.symbol, order.qty, order.price
+        holding = self.holdings.get(symbol)
+        if order.side in ('buy', 'pending'):
+            self._sold.pop(symbol, None)
+            self._reserved.pop(symbol, None)  # the order below takes the cash
+            self.cash = max(0, self.cash - int(qty * price))
+            name = order.name or get_symbol_master().name(symbol, symbol)
+            if order.side == 'pending':
+                self.pending[symbol] = PendingBuy(symbol=symbol, name=name, qty=qty, price=price,
+                                                  placed_at=order.at)
+            elif holding is None:
+                self.holdings[symbol] = Holding(symbol=symbol, name=name, qty=qty, avg_price=price, last_price=price)
+            else:
+                total = holding.qty + qty
+                holding.avg_price = (holding.avg_price * holding.qty + price * qty) / total
+                holding.qty = total
+        elif holding is not None:
+            self.cash += int(qty * (price or holding.last_price))
+            holding.qty -= qty
+            if holding.qty <= 0:
+                del self.holdings[symbol]
+                self._sold[symbol] = time.monotonic()
+
+    def reserve_cash(self, symbol: str, fraction: float) -> int:
+        """Set aside fraction of the unreserved cash for a buy of symbol; returns the amount"""
+        with self._lock:
+            available = self.cash - sum(self._reserved.values())
+            amount = max(0, int(available * fraction))
+            self._reserved[symbol] = amount
+            return amount
+
+    def release_cash(self, symbol: str):
+        """Drop symbol's reservation when the buy is abandoned (apply_fill of the buy drops it too)"""
+        with self._lock:
+            self._reserved.pop(symbol, None)
+
+    def update_price(self, symbol: str, price: float) -> Optional[Holding]:
+        """Record a tick; returns the (live) holding, or None if not held"""
+        holding = self.holdings.get(symbol)
+        if holding is not None and price > 0:
+            holding.last_price, holding.price_at = price, time.monotonic()
+        return holding
+
+
+# Shared per account (AutoTrader instances, PositionMonitor, Telegram handlers)
+_account_states: Dict[str, AccountState] = {}
+_account_states_lock = threading.Lock()
+
+def get_account_state(account_no: str) -> AccountState:
+    with _account_states_lock:
+        if account_no not in _account_states:
+            _account_states[account_no] = AccountState(account_no)
+        return _account_states[account_no]
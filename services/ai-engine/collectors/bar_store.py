@@ -0,0 +1,322 @@
+"""
+BarStore - 로컬 일봉 OHLCV 저장소
+종목별 컬럼형 NumPy 파일(.npy, mmap 읽기)에 일봉을 쌓아두고,
+마지막 저장 봉 이후 구간만 증분으로 받아 덧붙입니다.
+
+- 소스(FinanceDataReader 원주가 / 키움 수정주가)마다 저장소를 따로 둡니다 (bars/<source>/).
+  한 종목 파일에 두 시계열이 섞이지 않도록 메타에 소스를 기록하고, 다르면 전체를 다시 받습니다.
+- 장중 동기화로 저장된 당일 봉은 미완성이므로 BAR_INTRADAY_TTL(기본 60초)만 유효합니다.
+- 장 마감/당일 판단은 호스트 시간대와 무관하게 한국 시간(KST) 기준입니다.
+"""
+
+import os
+import json
+import logging
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, date, time, timedelta
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from collectors.kiwoom_token import kst_now
+from utils.rate_limit import RateLimiter, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.getenv(
+    "STOCKIQ_DATA_DIR",
+    os.path.join(os.path.dirname(__file__), '../data')
+)
+
+BAR_DTYPE = np.dtype([
+    ("date", "<i4"),  # YYYYMMDD
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+MARKET_OPEN = time(9, 0)     # KST
+MARKET_CLOSE = time(15, 30)  # KST
+
+# 장중에 저장된 당일(미완성) 봉의 유효 시간 (초)
+INTRADAY_TTL = float(os.getenv("BAR_INTRADAY_TTL", "60"))
+
+# fetcher(symbol, start, end) -> FinanceDataReader 형식 DataFrame
+Fetcher = Callable[[str, date, date], Optional[pd.DataFrame]]
+
+
+@dataclass(frozen=True)
+class BarSource:
+    """일봉 다운로더 (name: 저장소 하위 폴더/메타 기록/호스트별 속도 제한 키)"""
+    name: str
+    fetch: Fetcher
+    adjusted: bool = False  # 수정주가 여부
+
+
+def fdr_fetcher(symbol: str, start: date, end: date) -> Optional[pd.DataFrame]:
+    """기본 다운로더: FinanceDataReader 일봉"""
+    import FinanceDataReader as fdr
+    return fdr.DataReader(symbol, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+
+FDR_SOURCE = BarSource("fdr", fdr_fetcher)
+
+
+def bars_start(days: int, now: Optional[datetime] = None) -> date:
+    """
+    최근 days개 거래일을 덮는 시작일 (주 5일 + 공휴일 여유로 달력일 환산)
+    공휴일은 연 15일 안팎이라 긴 구간(52주 신고가 253봉)은 days//15만큼 더 거슬러 올라감
+    """
+    now = kst_now(now)
+    return (now - timedelta(days=days * 7 // 5 + days // 15 + 10)).date()
+
+
+def last_session_close(now: Optional[datetime] = None) -> datetime:
+    """가장 최근 장 마감 시각 (KST naive, 주말 제외, 공휴일은 고려하지 않음)"""
+    now = kst_now(now)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return datetime.combine(day, MARKET_CLOSE)
+
+
+def in_session(now: Optional[datetime] = None) -> bool:
+    """정규장 시간인지 (KST, 주말 제외, 공휴일은 고려하지 않음)"""
+    now = kst_now(now)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def _atomic_write(path: str, write: Callable[[str], None]):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일만 봄)"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def frame_to_bars(df: pd.DataFrame) -> np.ndarray:
+    """FinanceDataReader 형식 DataFrame -> BAR_DTYPE 배열"""
+    if df is None or df.empty:
+        return np.empty(0, dtype=BAR_DTYPE)
+    index = pd.to_datetime(df.index)
+    bars = np.empty(len(df), dtype=BAR_DTYPE)
+    bars["date"] = index.year * 10000 + index.month * 100 + index.day
+    for col in ("open", "high", "low", "close", "volume"):
+        bars[col] = df[col.capitalize()].to_numpy(dtype=np.float64)
+    return np.sort(bars, order="date")
+
+
+def bars_to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """BAR_DTYPE 배열 -> FinanceDataReader 형식 DataFrame (Date 인덱스)"""
+    index = pd.to_datetime(bars["date"].astype(str), format="%Y%m%d")
+    return pd.DataFrame(
+        {col.capitalize(): np.asarray(bars[col]) for col in ("open", "high", "low", "close", "volume")},
+        index=pd.DatetimeIndex(index, name="Date"),
+    )
+
+
+def kiwoom_to_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """KiwoomCollector.get_price_history 일봉 결과 -> FinanceDataReader 형식"""
+    if df is None or df.empty or 'date' not in df.columns:
+        return pd.DataFrame()
+    out = df[['open', 'high', 'low', 'close', 'volume']].copy()
+    out.columns = [c.capitalize() for c in out.columns]
+    out.index = pd.DatetimeIndex(pd.to_datetime(df['date'].astype(str), format="%Y%m%d"), name="Date")
+    return out
+
+
+def frame_to_kiwoom(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    FinanceDataReader 형식 -> KiwoomCollector.get_price_history 형식
+    (date 문자열, open/high/low/close/volume int64, timestamp datetime64 - parse_price_history와 같은 컬럼/타입)
+    """
+    out = pd.DataFrame({col: np.rint(df[col.capitalize()].to_numpy(dtype="float64")).astype("int64")
+                        for col in ("open", "high", "low", "close", "volume")})
+    out.insert(0, 'date', np.array(df.index.strftime("%Y%m%d"), dtype=object))
+    out['timestamp'] = df.index.to_numpy(dtype="datetime64[s]")
+    return out
+
+
+class BarStore:
+    """종목별 일봉 저장소 (append-only, 원자적 파일 교체, 소스 하나당 저장소 하나)"""
+
+    def __init__(self, root: Optional[str] = None, source: BarSource = FDR_SOURCE,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.source = source
+        self.root = root or os.path.join(DEFAULT_DATA_DIR, 'bars', source.name)
+        self.rate_limiter = rate_limiter
+        os.makedirs(self.root, exist_ok=True)
+
+    def _bars_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.npy")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol}.json")
+
+    def read(self, symbol: str) -> np.ndarray:
+        """저장된 일봉 (mmap, 읽기 전용)"""
+        path = self._bars_path(symbol)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(path, mmap_mode="r")
+
+    def read_meta(self, symbol: str) -> dict:
+        try:
+            with open(self._meta_path(symbol), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def frame(self, symbol: str, days: Optional[int] = None) -> pd.DataFrame:
+        """저장된 일봉을 DataFrame으로 반환 (days: 최근 N개)"""
+        bars = self.read(symbol)
+        if days is not None:
+            bars = bars[-days:]
+        return bars_to_frame(bars)
+
+    def write(self, symbol: str, new_bars: np.ndarray, covered_from: Optional[date] = None,
+              replace: bool = False, now: Optional[datetime] = None) -> int:
+        """
+        새 봉 반영. 마지막 저장일 이후 봉만 덧붙이되,
+        마지막 저장일과 같은 날짜의 봉은 교체 (장중에 저장된 미완성 봉 갱신)
+        replace=True면 기존 봉/커버 구간을 버리고 새 봉으로 교체 (소스가 바뀐 경우)
+        """
+        now = kst_now(now)
+        bars = np.array(self.read(symbol)) if not replace else np.empty(0, dtype=BAR_DTYPE)
+        stored = len(bars)
+        appended = 0
+        merged = bars
+        if len(new_bars) or replace:
+            if len(bars) and len(new_bars):
+                # 과거 구간 보강 (backfill) + 마지막 저장일 이후 봉
+                head = new_bars[new_bars["date"] < bars["date"][0]]
+                tail = new_bars[new_bars["date"] >= bars["date"][-1]]
+                if len(tail):
+                    bars = bars[bars["date"] < tail["date"][0]]
+                merged = np.concatenate([head, bars, tail])
+            else:
+                merged = new_bars
+            appended = len(merged) - stored
+
+            def _write_bars(p):
+                with open(p, "wb") as f:
+                    np.save(f, merged.astype(BAR_DTYPE))
+            _atomic_write(self._bars_path(symbol), _write_bars)
+
+        meta = {} if replace else self.read_meta(symbol)
+        meta["source"] = self.source.name
+        meta["synced_at"] = now.isoformat(timespec="seconds")
+        # 장 마감 전에 받은 당일 봉은 미완성 (is_fresh가 짧은 TTL만 인정)
+        today = int(now.strftime("%Y%m%d"))
+        if len(merged) and int(merged["date"][-1]) == today and now.time() < MARKET_CLOSE:
+            meta["partial"] = today
+        else:
+            meta.pop("partial", None)
+        if covered_from is not None:
+            prev = meta.get("covered_from")
+            if prev is None or covered_from.isoformat() < prev:
+                meta["covered_from"] = covered_from.isoformat()
+
+        def _write_meta(p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        _atomic_write(self._meta_path(symbol), _write_meta)
+        return appended
+
+    def write_frame(self, symbol: str, df: pd.DataFrame, covered_from: Optional[date] = None,
+                    replace: bool = False) -> int:
+        """FinanceDataReader 형식 DataFrame 반영"""
+        return self.write(symbol, frame_to_bars(df), covered_from, replace)
+
+    def source_matches(self, meta: dict) -> bool:
+        """저장된 봉이 이 저장소의 소스로 받은 것인지 (소스 기록이 없는 옛 파일은 다시 받음)"""
+        return meta.get("source") == self.source.name
+
+    def is_fresh(self, symbol: str, now: Optional[datetime] = None, intraday: bool = False) -> bool:
+        """
+        마지막 장 마감 이후 동기화된 적이 있는지.
+        미완성 당일 봉이 들어 있으면 동기화 후 INTRADAY_TTL 동안만 유효
+        intraday=True면 장중에는 당일 봉이 있어야 최신 (전일 마감 후 동기화만으로는 부족)
+        """
+        now = kst_now(now)
+        meta = self.read_meta(symbol)
+        synced_at = meta.get("synced_at")
+        if not synced_at or not self.source_matches(meta):
+            return False
+        synced_at = datetime.fromisoformat(synced_at)
+        if meta.get("partial"):
+            return (now - synced_at).total_seconds() < INTRADAY_TTL
+        if intraday and in_session(now):
+            return False
+        return synced_at >= last_session_close(now)
+
+    def needs_sync(self, symbol: str, start: date, now: Optional[datetime] = None) -> bool:
+        """마지막 장 마감 이후 동기화되지 않았거나, 요청 구간(start~)을 아직 받지 않은 경우"""
+        covered_from = self.read_meta(symbol).get("covered_from")
+        if not covered_from or covered_from > start.isoformat():
+            return True
+        return not self.is_fresh(symbol, now)
+
+    def sync(self, symbol: str, start: date, end: Optional[date] = None) -> int:
+        """
+        증분 동기화: 저장된 마지막 봉부터 end까지만 다운로드
+        (처음이거나 start 이전 구간이 비어 있으면 start부터 전체 다운로드)
+        """
+        end = end or kst_now().date()
+        meta = self.read_meta(symbol)
+        bars = self.read(symbol)
+        fetch_from = start
+        covered_from = meta.get("covered_from")
+        # 다른 소스로 받은 봉은 이어 붙이지 않고 start부터 통째로 교체
+        replace = len(bars) > 0 and not self.source_matches(meta)
+        if len(bars) and not replace and covered_from and covered_from <= start.isoformat():
+            last = str(int(bars["date"][-1]))
+            fetch_from = datetime.strptime(last, "%Y%m%d").date()
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        df = self.source.fetch(symbol, fetch_from, end)
+        return self.write_frame(symbol, df, covered_from=start, replace=replace)
+
+    def ensure_bars(self, symbol: str, days: int, start: Optional[date] = None) -> np.ndarray:
+        """최근 days개 봉 (구조화 배열). 필요할 때만 네트워크 동기화"""
+        start = start or bars_start(days)
+        if self.needs_sync(symbol, start):
+            self.sync(symbol, start)
+        return self.read(symbol)[-days:]
+
+    def ensure(self, symbol: str, days: int, start: Optional[date] = None) -> pd.DataFrame:
+        """최근 days개 봉 (DataFrame). 필요할 때만 네트워크 동기화"""
+        return bars_to_frame(self.ensure_bars(symbol, days, start))
+
+
+# 싱글톤 인스턴스 (소스별)
+_bar_stores: Dict[str, BarStore] = {}
+
+def get_bar_store(source: Optional[str] = None) -> BarStore:
+    """
+    source: "fdr" / "kiwoom" (기본값 BAR_SOURCE 환경변수, 없으면 fdr)
+    키움 수정주가를 쓰는 경로(ChartAnalyst, sync_bars)는 "kiwoom"을 명시합니다.
+    """
+    source = source or os.getenv("BAR_SOURCE", "fdr")
+    if source not in _bar_stores:
+        if source == "kiwoom":
+            # 키움 일봉 (연속조회). 요청 속도는 키움 전송 계층의 스케줄러가 제한
+            from collectors.kiwoom import KIWOOM_SOURCE
+            _bar_stores[source] = BarStore(source=KIWOOM_SOURCE)
+        elif source == "fdr":
+            rate = float(os.getenv("BAR_FETCH_RATE", "10"))  # 호스트당 초당 요청 수
+            _bar_stores[source] = BarStore(source=FDR_SOURCE, rate_limiter=get_rate_limiter(FDR_SOURCE.name, rate))
+        else:
+            raise ValueError(f"Unknown bar source: {source}")
+    return _bar_stores[source]
@@ -1,10 +1,24 @@
 import os
-import requests
 import pandas as pd
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # optional speedup
+    import json
+    _json_loads = json.loads
 from dotenv import load_dotenv
 
+from collectors.bar_store import BarSource, get_bar_store, kiwoom_to_frame
+from collectors.kiwoom_cache import Uncached
+from collectors.symbol_master import get_symbol_master
+from collectors.kiwoom_transport import default_base_url, get_transport
+
 # Configure Logging
 logger = logging.getLogger(__name__)
 
@@ -12,270 +26,434 @@ logger = logging.getLogger(__name__)
 # services/ai-engine/collectors/kiwoom.py -> ../../../.env.local
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../../.env.local'))
 
+# --- Request builders / response parsers (shared by sync and async clients) ---
+
+def price_history_request(symbol: str, interval: str = "D"):
+    """(api_id, body) for a chart query. Daily: ka10081, Minute: ka10080, Weekly: ka10082"""
+    api_id = "ka10081"
+    req_body = {
+        "stk_cd": symbol,
+        "upd_stkpc_tp": "1"
+    }
+    today = datetime.now().strftime("%Y%m%d")
+
+    if interval == "D":
+        api_id = "ka10081"
+        req_body["base_dt"] = today
+    elif interval.endswith("m"): # 5m, 15m -> ka10080
+        api_id = "ka10080"
+        tick = interval.replace("m", "")
+        req_body["tic_scope"] = tick
+    elif interval == "W":
+        api_id = "ka10082"
+        req_body["base_dt"] = today
+    return api_id, req_body
+
+
+# Chart list keys by api-id family
+CHART_LIST_KEYS = [
+    "stk_day_pole_chart_qry", 
+    "stk_week_pole_chart_qry", 
+    "stk_mth_pole_chart_qry", 
+    "stk_min_pole_chart_qry",
+    "stk_tic_pole_chart_qry"
+]
+
+# Output column -> candidate item keys
+CHART_FIELDS = {
+    'date': ('dt', '일자'),
+    'time': ('cntr_tm', '체결시간'),
+    'open': ('open_pric', '시가'),
+    'high': ('high_pric', '고가'),
+    'low': ('low_pric', '저가'),
+    'close': ('cur_prc', '종가'),
+    'volume': ('trde_qty', '거래량'),
+}
+
+
+def loads(raw):
+    """JSON decode (orjson when installed); dicts are passed through"""
+    if isinstance(raw, (bytes, bytearray, memoryview, str)):
+        return _json_loads(raw)
+    return raw
+
+
+def _find_chart_items(data: dict) -> list:
+    for key in CHART_LIST_KEYS:
+        if key in data and isinstance(data[key], list):
+            return data[key]
+
+    # Fallback scan
+    for k, v in data.items():
+        if isinstance(v, list) and len(v) > 0:
+            sample = v[0]
+            if isinstance(sample, dict) and any(x in sample for x in ['dt', 'date', 'cur_prc', 'close', 'open_pric']):
+                return v
+    return []
+
+
+def _int_column(values: list) -> Optional[np.ndarray]:
+    """Numeric strings (Kiwoom prices are signed, e.g. '-245000' for a drop) -> int64, None if malformed"""
+    try:
+        return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _abs_int_column(values: list) -> np.ndarray:
+    """Signed price/volume strings -> absolute int64 (float64 with NaN if any value is malformed)"""
+    ints = _int_column(values)
+    if ints is None:
+        return pd.to_numeric(pd.Series(values), errors='coerce').abs().to_numpy()
+    return np.abs(ints)
+
+
+def _to_datetime64(stamps: np.ndarray, sort_key: str) -> np.ndarray:
+    """YYYYMMDD / YYYYMMDDHHMMSS ints -> datetime64[s] without string parsing"""
+    if sort_key == 'time':
+        day, hms = np.divmod(stamps, 1000000)
+    else:
+        day, hms = stamps, np.zeros_like(stamps)
+    year, md = np.divmod(day, 10000)
+    month, dom = np.divmod(md, 100)
+    hour, ms = np.divmod(hms, 10000)
+    minute, second = np.divmod(ms, 100)
+    days = ((year - 1970) * 12 + (month - 1)).astype('datetime64[M]').astype('datetime64[D]') \
+        + (dom - 1).astype('timedelta64[D]')
+    return days.astype('datetime64[s]') + (hour * 3600 + minute * 60 + second).astype('timedelta64[s]')
+
+
+def parse_chart_arrays(data) -> Dict[str, np.ndarray]:
+    """
+    Chart response (raw bytes or dict) -> typed column arrays, oldest first.
+    Prices/volume are int64, 'timestamp' is datetime64, 'date'/'time' keep the raw strings.
+    """
+    items = _find_chart_items(loads(data))
+    if not items:
+        return {}
+
+    sample = items[0]
+    columns: Dict[str, np.ndarray] = {}
+    raw: Dict[str, list] = {}
+    for name, keys in CHART_FIELDS.items():
+        key = next((k for k in keys if k in sample), name if name in sample else None)
+        if key is None:
+            continue
+        values = [item.get(key) for item in items]
+        if name in ('date', 'time'):
+            raw[name] = values
+            columns[name] = np.array([str(v) for v in values], dtype=object)
+        else:
+            columns[name] = _abs_int_column(values)
+
+    # Kiwoom returns newest first; order oldest first on date (daily/weekly) or time (minute)
+    sort_key = 'date' if 'date' in columns else 'time' if 'time' in columns else None
+    if sort_key is None:
+        return columns
+
+    stamps = _int_column(raw[sort_key])
+    if stamps is None:
+        order = np.argsort(columns[sort_key], kind='stable')
+    elif np.all(stamps[:-1] > stamps[1:]):
+        order = slice(None, None, -1)  # strictly newest first (the normal case)
+    else:
+        order = np.argsort(stamps, kind='stable')
+    columns = {name: arr[order] for name, arr in columns.items()}
+
+    if stamps is None:
+        fmt = "%Y%m%d%H%M%S" if sort_key == 'time' else "%Y%m%d"
+        columns['timestamp'] = pd.to_datetime(columns[sort_key], format=fmt, errors='coerce').to_numpy()
+    else:
+        columns['timestamp'] = _to_datetime64(stamps[order], sort_key)
+    return columns
+
+
+def parse_price_history(data, symbol: str, count: Optional[int] = None) -> pd.DataFrame:
+    """Chart response (raw bytes or dict) -> DataFrame (date/time, open, high, low, close, volume, timestamp), oldest first"""
+    columns = parse_chart_arrays(data)
+    if not columns:
+        keys = list(data.keys()) if isinstance(data, dict) else "?"
+        logger.warning(f"No data for {symbol}. Resp: {keys}")
+        return pd.DataFrame()
+
+    if count:
+        columns = {name: arr[-count:] for name, arr in columns.items()}
+    return pd.DataFrame(columns)
+
+
+# --- Pagination (cont-yn / next-key) ---
+# Pages form a chain (each next-key comes from the previous response), so one
+# query's pages are fetched in order; concurrency is across symbols/intervals.
+
+# Safety cap on pages per query (daily pages are ~600 bars)
+MAX_PAGES = 50
+
+
+def next_page_key(headers) -> Optional[str]:
+    """next-key from response headers if Kiwoom says there is another page"""
+    if headers.get("cont-yn") == "Y" and headers.get("next-key"):
+        return headers.get("next-key")
+    return None
+
+
+def continuation_headers(next_key: Optional[str]) -> Optional[dict]:
+    """Request headers for the page after next_key"""
+    if not next_key:
+        return None
+    return {"cont-yn": "Y", "next-key": next_key}
+
+
+def _sort_key(df: pd.DataFrame) -> Optional[str]:
+    if 'date' in df.columns: return 'date'
+    if 'time' in df.columns: return 'time'
+    return None
+
+
+def history_complete(pages, count: Optional[int], start: Optional[str]) -> bool:
+    """Enough bars collected: `count` bars, or back to `start` (YYYYMMDD)"""
+    if start:
+        key = _sort_key(pages[-1])
+        return key is not None and str(pages[-1][key].iloc[0])[:8] <= start
+    return count is not None and sum(len(p) for p in pages) >= count
+
+
+def merge_pages(pages, count: Optional[int], start: Optional[str]) -> pd.DataFrame:
+    """Pages (newest first) -> one DataFrame, oldest first, trimmed to start/count"""
+    if not pages:
+        return pd.DataFrame()
+    df = pd.concat(pages, ignore_index=True)
+    key = _sort_key(df)
+    if key is not None:
+        df = df.drop_duplicates(subset=key).sort_values(key)
+        if start:
+            df = df[df[key].astype(str).str[:8] >= start]
+    df = df.reset_index(drop=True)
+    return df.tail(count) if count else df
+
+
+def balance_request(account_no: str):
+    return "kt00001", {
+        "acc_no": account_no,
+        "qry_tp": "3" # Deposit
+    }
+
+
+def parse_balance(data: dict) -> int:
+    # User script uses 'entr', but previously we saw 'ord_alow_amt'. 
+    # User script: entry = response.json()['entr']
+    # Let's try 'ord_alow_amt' (Order Allowable) as it's safer for trading.
+    val = data.get('ord_alow_amt') or data.get('entr') or '0'
+    return int(val)
+
+
+def holdings_request(account_no: str):
+    return "kt00004", {
+        "acc_no": account_no,
+        "qry_tp": "0",
+        "dmst_stex_tp": "KRX"
+    }
+
+
+def parse_hoga(data: dict) -> float:
+    # sel_fpr_bid = Sell First Price Bid (Best Ask)
+    val = data.get('sel_fpr_bid', '0')
+    return abs(float(val))
+
+
+def order_request(account_no: str, symbol: str, qty: int, price: int, type: str = 'buy'):
+    """(api_id, body) for fn_kt10000 (Buy) / fn_kt10001 (Sell)"""
+    # Buy: kt10000, Sell: kt10001
+    api_id = "kt10000" if type == 'buy' else "kt10001"
+    # Trade Type: 00(Limit), 03(Market)
+    # User script used '0' (Limit?) for Buy and '3' (Market) for Sell.
+    # Let's standardize: If price is 0, Market (03), else Limit (00).
+    # Actually user script `buy_stock` had `trde_tp`: '0' (Limit) and passed `ord_uv`.
+    
+    trade_type = "00" # Limit
+    if price == 0: trade_type = "03" # Market
+    
+    params = {
+        "acc_no": account_no,
+        "dmst_stex_tp": "KRX",
+        "stk_cd": symbol,
+        "ord_qty": str(qty),
+        "ord_uv": str(price) if price > 0 else "0",
+        "trde_tp": trade_type,
+        "ord_gb": trade_type, # Some docs say ord_gb, user script says trde_tp. Keep both or follow user.
+        # User script: 'trde_tp': '0'
+        # Kiwoom REST specs vary. Let's include what user script had + standard.
+        "ord_type": "1" if type == 'buy' else "2" # 1: New
+    }
+    return api_id, params
+
+
+def parse_order(data: dict, symbol: str, qty: int, type: str = 'buy') -> bool:
+    ret_code = data.get('return_code')
+    if ret_code == '0' or ret_code == 0:
+        logger.info(f"Order Placed: {type.upper()} {symbol} {qty}ea")
+        return True
+    else:
+        logger.error(f"Order Failed: {data.get('return_msg')}")
+        return False
+
+
 class KiwoomCollector:
-    def __init__(self):
-        self.base_url = "https://api.kiwoom.com"
+    def __init__(self, base_url: Optional[str] = None):
+        # KIWOOM_BASE_URL (default https://api.kiwoom.com)
+        self.base_url = (base_url or default_base_url()).rstrip("/")
         self.app_key = os.getenv("KIWOOM_APP_KEY")
         self.app_secret = os.getenv("KIWOOM_SECRET_KEY")
-        self.token = None
+        # Shared keep-alive session + token (reused across collectors)
+        self.transport = get_transport(self.base_url)
         
         if not self.app_key or not self.app_secret:
             logger.error("Kiwoom API Keys not found in environment variables!")
 
     def _get_token(self):
-        if self.token: return self.token
-        
-        url = f"{self.base_url}/oauth2/token"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": "au10001"
-        }
-        data = {
-            "grant_type": "client_credentials",
-            "appkey": self.app_key,
-            "secretkey": self.app_secret
-        }
-        try:
-            res = requests.post(url, headers=headers, json=data, timeout=5)
-            res.raise_for_status()
-            self.token = res.json().get('token')
-            return self.token
-        except Exception as e:
-            logger.error(f"Failed to get Kiwoom Token: {e}")
-            return None
+        """Shared, auto-refreshed token (see TokenManager)"""
+        return self.transport.tokens.get()
+
+    def get_price_history(self, symbol: str, interval: str = "D", count: Optional[int] = 60,
+                          start: Optional[str] = None, max_pages: int = MAX_PAGES):
+        """
+        Chart bars, oldest first. Follows cont-yn/next-key pages until `count` bars
+        are collected, or (if `start` is given, YYYYMMDD) until bars reach back to start.
+        Daily/weekly charts are served from the response cache until the next session.
+        """
+        api_id, req_body = price_history_request(symbol, interval)
+        df = self.transport.cache.get_or_load(
+            api_id, (symbol, interval, count, start, max_pages),
+            lambda: self._load_price_history(symbol, api_id, req_body, count, start, max_pages),
+        )
+        return df.copy()
 
-    def get_price_history(self, symbol: str, interval: str = "D", count: int = 60):
+    def _load_price_history(self, symbol, api_id, req_body, count, start, max_pages):
         token = self._get_token()
         if not token: 
             logger.error("Checking Token Failed")
-            return pd.DataFrame()
+            return Uncached(pd.DataFrame())
 
-        # Determine Params
-        # Daily: ka10081, Minute: ka10080
-        api_id = "ka10081"
-        req_body = {
-            "stk_cd": symbol,
-            "upd_stkpc_tp": "1"
-        }
-        today = datetime.now().strftime("%Y%m%d")
-
-        if interval == "D":
-            api_id = "ka10081"
-            req_body["base_dt"] = today
-        elif interval.endswith("m"): # 5m, 15m -> ka10080
-            api_id = "ka10080"
-            tick = interval.replace("m", "")
-            req_body["tic_scope"] = tick
-        elif interval == "W":
-            api_id = "ka10082"
-            req_body["base_dt"] = today
-        
-        url = f"{self.base_url}/api/dostk/chart"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": api_id,
-            "Authorization": f"Bearer {token}"
-        }
+        pages, next_key = [], None
 
         try:
-            # print(f"[DEBUG] Fetching {symbol} {interval} from Kiwoom Cloud API ({api_id})")
-            res = requests.post(url, headers=headers, json=req_body, timeout=10)
-            res.raise_for_status()
-            data = res.json()
-            
-            # --- Dynamic List Finding ---
-            items = []
-            possible_keys = [
-                "stk_day_pole_chart_qry", 
-                "stk_week_pole_chart_qry", 
-                "stk_mth_pole_chart_qry", 
-                "stk_min_pole_chart_qry",
-                "stk_tic_pole_chart_qry"
-            ]
-            
-            for key in possible_keys:
-                if key in data and isinstance(data[key], list):
-                    items = data[key]
+            for _ in range(max_pages):
+                # print(f"[DEBUG] Fetching {symbol} {interval} from Kiwoom Cloud API ({api_id})")
+                res = self.transport.post(api_id, req_body, extra_headers=continuation_headers(next_key))
+                page = parse_price_history(res.content, symbol)
+                if page.empty:
+                    break
+                pages.append(page)
+                next_key = next_page_key(res.headers)
+                if not next_key or history_complete(pages, count, start):
                     break
-            
-            if not items:
-                # Fallback scan
-                for k, v in data.items():
-                    if isinstance(v, list) and len(v) > 0:
-                        sample = v[0]
-                        if any(x in sample for x in ['dt', 'date', 'cur_prc', 'close', 'open_pric']):
-                            items = v
-                            break
-
-            # print(f"[DEBUG] Found {len(items)} items")
-
-            if not items:
-                logger.warning(f"No data for {symbol}. Resp: {str(data.keys())}")
-                return pd.DataFrame()
-
-            # DataFrame & Mapping
-            df = pd.DataFrame(items)
-            column_map = {
-                '일자': 'date', 'dt': 'date',
-                '시가': 'open', 'open_pric': 'open',
-                '고가': 'high', 'high_pric': 'high',
-                '저가': 'low', 'low_pric': 'low',
-                '종가': 'close', 'cur_prc': 'close',
-                '거래량': 'volume', 'trde_qty': 'volume',
-                '체결시간': 'time', 'cntr_tm': 'time'
-            }
-            df = df.rename(columns=column_map)
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                if col in df.columns:
-                    # Kiwoom returns signed strings (e.g., -245000) for drops. We need absolute values.
-                    df[col] = pd.to_numeric(df[col], errors='coerce').abs()
-            
-            if 'date' in df.columns: df = df.sort_values('date')
-            elif 'time' in df.columns: df = df.sort_values('time')
-
-            return df.tail(count)
-
         except Exception as e:
             logger.error(f"Kiwoom Request Error: {e}")
-            return pd.DataFrame()
+            if not pages:
+                return Uncached(pd.DataFrame())
+            logger.warning(f"Returning {len(pages)} page(s) fetched before the error for {symbol}")
+            return Uncached(merge_pages(pages, count, start))
+
+        df = merge_pages(pages, count, start)
+        return Uncached(df) if df.empty else df
+
+    def sync_bars(self, symbol: str, start: date, store=None) -> int:
+        """
+        Download daily bars back to `start` (all pages) and write them into the
+        local bar store (the adjusted-price "kiwoom" store by default).
+        Returns the number of bars appended.
+        """
+        store = store or get_bar_store("kiwoom")
+        df = self.get_price_history(symbol, "D", count=None, start=start.strftime("%Y%m%d"))
+        return store.write_frame(symbol, kiwoom_to_frame(df), covered_from=start)
 
     def get_master_name(self, symbol: str):
-        """fn_ka10001: Get Stock Name"""
+        """fn_ka10001: Get Stock Name (symbol master first, then cached for a day)"""
+        name = get_symbol_master().name(symbol)
+        if name:
+            return name
+
         token = self._get_token()
         if not token: return ""
         
-        url = f"{self.base_url}/api/dostk/stkinfo"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": "ka10001",
-            "Authorization": f"Bearer {token}"
-        }
         try:
-            res = requests.post(url, headers=headers, json={"stk_cd": symbol}, timeout=5)
-            res.raise_for_status()
-            return res.json().get('stk_nm', '')
+            return self.transport.cache.get_or_load("ka10001", symbol, lambda: self._load_master_name(symbol))
         except Exception as e:
             logger.error(f"Failed to get name for {symbol}: {e}")
             return ""
 
+    def _load_master_name(self, symbol: str):
+        name = self.transport.post("ka10001", {"stk_cd": symbol}).json().get('stk_nm', '')
+        return name or Uncached(name)
+
     def get_balance(self, account_no: str):
         """fn_kt00001: Get Deposit (Jesus)"""
         token = self._get_token()
         if not token: return 0
         
-        url = f"{self.base_url}/api/dostk/acnt"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": "kt00001",
-            "Authorization": f"Bearer {token}"
-        }
-        params = {
-            "acc_no": account_no,
-            "qry_tp": "3" # Deposit
-        }
         try:
-            res = requests.post(url, headers=headers, json=params, timeout=5)
-            res.raise_for_status()
-            # User script uses 'entr', but previously we saw 'ord_alow_amt'. 
-            # User script: entry = response.json()['entr']
-            # Let's try 'ord_alow_amt' (Order Allowable) as it's safer for trading.
-            data = res.json()
-            val = data.get('ord_alow_amt') or data.get('entr') or '0'
-            return int(val)
+            return self.fetch_balance(account_no)
         except Exception as e:
             logger.error(f"Failed to get balance: {e}")
             return 0
 
+    def fetch_balance(self, account_no: str) -> int:
+        """kt00001 like get_balance, but raises on failure"""
+        return parse_balance(self.transport.post(*balance_request(account_no)).json())
+
     def get_holdings(self, account_no: str):
         """fn_kt00004: Get Holdings"""
         token = self._get_token()
         if not token: return []
         
-        url = f"{self.base_url}/api/dostk/acnt"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": "kt00004",
-            "Authorization": f"Bearer {token}"
-        }
-        params = {
-            "acc_no": account_no,
-            "qry_tp": "0",
-            "dmst_stex_tp": "KRX"
-        }
         try:
-            res = requests.post(url, headers=headers, json=params, timeout=5)
-            res.raise_for_status()
-            return res.json().get('stk_acnt_evlt_prst', [])
+            return self.fetch_holdings(account_no)
         except Exception as e:
             logger.error(f"Failed to get holdings: {e}")
             return []
 
+    def fetch_holdings(self, account_no: str):
+        """kt00004 like get_holdings, but raises on failure (so [] really means no holdings)"""
+        res = self.transport.post(*holdings_request(account_no))
+        return res.json().get('stk_acnt_evlt_prst', [])
+
     def get_hoga(self, symbol: str):
-        """fn_ka10004: Get Sell Ask Price (Best Ask)"""
+        """fn_ka10004: Get Sell Ask Price (Best Ask), cached for KIWOOM_HOGA_TTL (sub-second)"""
         token = self._get_token()
         if not token: return 0
         
-        url = f"{self.base_url}/api/dostk/mrkcond"
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": "ka10004",
-            "Authorization": f"Bearer {token}"
-        }
         try:
-            res = requests.post(url, headers=headers, json={"stk_cd": symbol}, timeout=5)
-            res.raise_for_status()
-            # sel_fpr_bid = Sell First Price Bid (Best Ask)
-            val = res.json().get('sel_fpr_bid', '0')
-            return abs(float(val))
+            return self.transport.cache.get_or_load("ka10004", symbol, lambda: self._load_hoga(symbol))
         except Exception as e:
             logger.error(f"Failed to get hoga for {symbol}: {e}")
             return 0
 
+    def _load_hoga(self, symbol: str):
+        price = parse_hoga(self.transport.post("ka10004", {"stk_cd": symbol}).json())
+        return price if price > 0 else Uncached(price)
+
     def place_order(self, account_no: str, symbol: str, qty: int, price: int, type: str = 'buy'):
         """fn_kt10000 (Buy) / fn_kt10001 (Sell)"""
         token = self._get_token()
         if not token: return False
         
-        url = f"{self.base_url}/api/dostk/ordr"
-        # Buy: kt10000, Sell: kt10001
-        api_id = "kt10000" if type == 'buy' else "kt10001"
-        # Trade Type: 00(Limit), 03(Market)
-        # User script used '0' (Limit?) for Buy and '3' (Market) for Sell.
-        # Let's standardize: If price is 0, Market (03), else Limit (00).
-        # Actually user script `buy_stock` had `trde_tp`: '0' (Limit) and passed `ord_uv`.
-        
-        trade_type = "00" # Limit
-        if price == 0: trade_type = "03" # Market
-        
-        headers = {
-            "content-type": "application/json;charset=UTF-8",
-            "api-id": api_id,
-            "Authorization": f"Bearer {token}"
-        }
-        params = {
-            "acc_no": account_no,
-            "dmst_stex_tp": "KRX",
-            "stk_cd": symbol,
-            "ord_qty": str(qty),
-            "ord_uv": str(price) if price > 0 else "0",
-            "trde_tp": trade_type,
-            "ord_gb": trade_type, # Some docs say ord_gb, user script says trde_tp. Keep both or follow user.
-            # User script: 'trde_tp': '0'
-            # Kiwoom REST specs vary. Let's include what user script had + standard.
-            "ord_type": "1" if type == 'buy' else "2" # 1: New
-        }
+        api_id, params = order_request(account_no, symbol, qty, price, type)
         
         try:
-            res = requests.post(url, headers=headers, json=params, timeout=5)
-            res.raise_for_status()
-            ret_code = res.json().get('return_code')
-            if ret_code == '0' or ret_code == 0:
-                logger.info(f"Order Placed: {type.upper()} {symbol} {qty}ea")
-                return True
-            else:
-                logger.error(f"Order Failed: {res.json().get('return_msg')}")
-                return False
+            res = self.transport.post(api_id, params)
+            return parse_order(res.json(), symbol, qty, type)
         except Exception as e:
             logger.error(f"Order Request Error: {e}")
             return False
+
+
+def kiwoom_fetcher(symbol: str, start: date, end: date) -> pd.DataFrame:
+    """BarStore fetcher backed by paginated Kiwoom daily charts (FinanceDataReader format)"""
+    df = kiwoom_to_frame(KiwoomCollector().get_price_history(
+        symbol, "D", count=None, start=start.strftime("%Y%m%d")
+    ))
+    if df.empty:
+        return df
+    return df[df.index.date <= end]
+
+# Adjusted daily bars; rate limiting is done by the Kiwoom transport scheduler
+KIWOOM_SOURCE = BarSource("kiwoom", kiwoom_fetcher, adjusted=True)
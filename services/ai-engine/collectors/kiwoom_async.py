@@ -0,0 +1,279 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import httpx
+import pandas as pd
+
+from collectors.kiwoom import (
+    price_history_request, parse_price_history,
+    balance_request, parse_balance, holdings_request, parse_hoga,
+    order_request, parse_order,
+    MAX_PAGES, next_page_key, continuation_headers, history_complete, merge_pages,
+)
+from collectors.bar_store import get_bar_store, kiwoom_to_frame
+from collectors.kiwoom_cache import Uncached
+from collectors.symbol_master import get_symbol_master
+from collectors.kiwoom_transport import (
+    API_PATHS, API_TIMEOUTS, DEFAULT_TIMEOUT, KiwoomAuthError, default_base_url, get_transport,
+)
+from utils.latency import observe_request
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncKiwoomCollector:
+    """
+    asyncio client for the Kiwoom REST API (httpx).
+    Same method surface as KiwoomCollector, but every method is a coroutine, so
+    many quote/chart requests can be in flight on one event loop without a thread each.
+    Request bodies and response parsing are shared with the sync client.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, max_connections: int = 50):
+        self.base_url = (base_url or default_base_url()).rstrip("/")
+        self.app_key = os.getenv("KIWOOM_APP_KEY")
+        self.app_secret = os.getenv("KIWOOM_SECRET_KEY")
+        self.max_connections = max_connections
+        # Token manager, rate-limit scheduler and response cache are shared with the sync client
+        # through its transport
+        transport = get_transport(self.base_url)
+        self.tokens = transport.tokens
+        self.scheduler = transport.scheduler
+        self.cache = transport.cache
+
+        # httpx connections belong to the loop that opened them: one client per event loop
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = \
+            weakref.WeakKeyDictionary()
+        self._clients_lock = threading.Lock()
+
+        if not self.app_key or not self.app_secret:
+            logger.error("Kiwoom API Keys not found in environment variables!")
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None:
+                # Clients of closed loops can no longer be aclose()d; dropping them lets their
+                # sockets go with the loop's transports instead of piling up here
+                for stale in [l for l in self._clients if l.is_closed()]:
+                    del self._clients[stale]
+                client = self._clients[loop] = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers={"content-type": "application/json;charset=UTF-8"},
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                )
+            return client
+
+    async def _send(self, api_id: str, body: Dict[str, Any], token: Optional[str],
+                    extra_headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        headers = {"api-id": api_id}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if extra_headers:
+            headers.update(extra_headers)
+        connect, read = API_TIMEOUTS.get(api_id, DEFAULT_TIMEOUT)
+        queued = time.monotonic()
+        await self.scheduler.acquire_async(api_id)
+        sent = time.monotonic()
+        try:
+            return await self._get_client().post(
+                API_PATHS[api_id], headers=headers, json=body,
+                timeout=httpx.Timeout(read, connect=connect),
+            )
+        finally:
+            observe_request(api_id, sent - queued, time.monotonic() - sent)
+
+    async def _post(self, api_id: str, body: Dict[str, Any],
+                    extra_headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """POST with the shared token; a 401 refreshes it once and retries once"""
+        token = await self._get_token()
+        if not token:
+            raise KiwoomAuthError(f"No Kiwoom token for {api_id}")
+        res = await self._send(api_id, body, token, extra_headers)
+        if res.status_code == 401:
+            logger.warning(f"Kiwoom {api_id} returned 401, refreshing token")
+            token = await asyncio.to_thread(self.tokens.refresh, token)
+            if token:
+                res = await self._send(api_id, body, token, extra_headers)
+        res.raise_for_status()
+        return res
+
+    async def _get_token(self):
+        """Shared token; only hits the network (in a worker thread) when it must be issued/refreshed"""
+        return self.tokens.current() or await asyncio.to_thread(self.tokens.get)
+
+    async def get_price_history(self, symbol: str, interval: str = "D", count: Optional[int] = 60,
+                                start: Optional[str] = None, max_pages: int = MAX_PAGES):
+        """Chart bars, oldest first, following cont-yn/next-key pages (see KiwoomCollector)"""
+        api_id, req_body = price_history_request(symbol, interval)
+        df = await self.cache.get_or_load_async(
+            api_id, (symbol, interval, count, start, max_pages),
+            lambda: self._load_price_history(symbol, api_id, req_body, count, start, max_pages),
+        )
+        return df.copy()
+
+    async def _load_price_history(self, symbol, api_id, req_body, count, start, max_pages):
+        token = await self._get_token()
+        if not token:
+            logger.error("Checking Token Failed")
+            return Uncached(pd.DataFrame())
+
+        pages, next_key = [], None
+        try:
+            for _ in range(max_pages):
+                res = await self._post(api_id, req_body, continuation_headers(next_key))
+                page = parse_price_history(res.content, symbol)
+                if page.empty:
+                    break
+                pages.append(page)
+                next_key = next_page_key(res.headers)
+                if not next_key or history_complete(pages, count, start):
+                    break
+        except Exception as e:
+            logger.error(f"Kiwoom Request Error: {e}")
+            if not pages:
+                return Uncached(pd.DataFrame())
+            logger.warning(f"Returning {len(pages)} page(s) fetched before the error for {symbol}")
+            return Uncached(merge_pages(pages, count, start))
+
+        df = merge_pages(pages, count, start)
+        return Uncached(df) if df.empty else df
+
+    async def get_price_bundle(self, symbol: str, intervals: List[str],
+                               count: Optional[int] = 60) -> Dict[str, pd.DataFrame]:
+        """
+        Several intervals for one symbol at once: duplicates are fetched once and all
+        queries run concurrently, so latency is roughly that of the slowest interval.
+        """
+        unique = list(dict.fromkeys(intervals))
+        frames = await asyncio.gather(*(self.get_price_history(symbol, interval, count) for interval in unique))
+        return dict(zip(unique, frames))
+
+    async def sync_bars(self, symbol: str, start: date, store=None) -> int:
+        """Download daily bars back to `start` and write them into the local (kiwoom) bar store"""
+        store = store or get_bar_store("kiwoom")
+        df = await self.get_price_history(symbol, "D", count=None, start=start.strftime("%Y%m%d"))
+        return store.write_frame(symbol, kiwoom_to_frame(df), covered_from=start)
+
+    async def sync_many(self, symbols: List[str], start: date, store=None,
+                        concurrency: int = 8) -> Dict[str, int]:
+        """
+        sync_bars for many symbols concurrently (pages of one symbol stay sequential;
+        the shared scheduler keeps the whole batch within Kiwoom's rate limits)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(symbol):
+            async with semaphore:
+                try:
+                    return symbol, await self.sync_bars(symbol, start, store)
+                except Exception as e:
+                    logger.error(f"Bar sync failed for {symbol}: {e}")
+                    return symbol, 0
+
+        return dict(await asyncio.gather(*(one(symbol) for symbol in symbols)))
+
+    async def get_master_name(self, symbol: str):
+        """fn_ka10001: Get Stock Name (symbol master first, then cached for a day)"""
+        name = get_symbol_master().name(symbol)
+        if name:
+            return name
+
+        token = await self._get_token()
+        if not token: return ""
+
+        try:
+            return await self.cache.get_or_load_async("ka10001", symbol, lambda: self._load_master_name(symbol))
+        except Exception as e:
+            logger.error(f"Failed to get name for {symbol}: {e}")
+            return ""
+
+    async def _load_master_name(self, symbol: str):
+        name = (await self._post("ka10001", {"stk_cd": symbol})).json().get('stk_nm', '')
+        return name or Uncached(name)
+
+    async def get_balance(self, account_no: str):
+        """fn_kt00001: Get Deposit"""
+        token = await self._get_token()
+        if not token: return 0
+
+        try:
+            res = await self._post(*balance_request(account_no))
+            return parse_balance(res.json())
+        except Exception as e:
+            logger.error(f"Failed to get balance: {e}")
+            return 0
+
+    async def get_holdings(self, account_no: str):
+        """fn_kt00004: Get Holdings"""
+        token = await self._get_token()
+        if not token: return []
+
+        try:
+            return await self.fetch_holdings(account_no)
+        except Exception as e:
+            logger.error(f"Failed to get holdings: {e}")
+            return []
+
+    async def fetch_holdings(self, account_no: str):
+        """kt00004 like get_holdings, but raises on failure (so [] really means no holdings)"""
+        res = await self._post(*holdings_request(account_no))
+        return res.json().get('stk_acnt_evlt_prst', [])
+
+    async def get_hoga(self, symbol: str):
+        """fn_ka10004: Get Sell Ask Price (Best Ask), cached for KIWOOM_HOGA_TTL (sub-second)"""
+        token = await self._get_token()
+        if not token: return 0
+
+        try:
+            return await self.cache.get_or_load_async("ka10004", symbol, lambda: self._load_hoga(symbol))
+        except Exception as e:
+            logger.error(f"Failed to get hoga for {symbol}: {e}")
+            return 0
+
+    async def _load_hoga(self, symbol: str):
+        price = parse_hoga((await self._post("ka10004", {"stk_cd": symbol})).json())
+        return price if price > 0 else Uncached(price)
+
+    async def place_order(self, account_no: str, symbol: str, qty: int, price: int, type: str = 'buy'):
+        """fn_kt10000 (Buy) / fn_kt10001 (Sell)"""
+        token = await self._get_token()
+        if not token: return False
+
+        api_id, params = order_request(account_no, symbol, qty, price, type)
+        try:
+            res = await self._post(api_id, params)
+            return parse_order(res.json(), symbol, qty, type)
+        except Exception as e:
+            logger.error(f"Order Request Error: {e}")
+            return False
+
+    async def aclose(self):
+        """Close every loop's client (each on its own loop; call before closing a short-lived loop)"""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+        for client_loop, client in clients:
+            if client_loop is loop:
+                await client.aclose()
+            elif client_loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), client_loop))
+
+
+# Singleton instance (one connection pool per process)
+_async_kiwoom_instance = None
+
+def get_async_kiwoom() -> AsyncKiwoomCollector:
+    global _async_kiwoom_instance
+    if _async_kiwoom_instance is None:
+        _async_kiwoom_instance = AsyncKiwoomCollector()
+    return _async_kiwoom_instance
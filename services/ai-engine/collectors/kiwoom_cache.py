@@ -0,0 +1,217 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, time as dtime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from collectors.kiwoom_token import kst_now
+
+logger = logging.getLogger(__name__)
+
+# KRX session (KST, whatever the host timezone)
+SESSION_OPEN = dtime(9, 0)
+SESSION_CLOSE = dtime(15, 30)
+# Daily/weekly bars while the market is open: today's bar is still moving
+INTRADAY_BAR_TTL = 60.0
+
+
+def until_next_session(now: Optional[datetime] = None) -> float:
+    """
+    Seconds a daily/weekly chart stays valid: short while the session is open,
+    otherwise until the next weekday open (holidays are not considered).
+    An aware `now` is converted to KST; a naive one is taken to be KST.
+    """
+    now = kst_now(now)
+    if now.weekday() < 5 and SESSION_OPEN <= now.time() < SESSION_CLOSE:
+        return INTRADAY_BAR_TTL
+    day = now.date()
+    if now.weekday() >= 5 or now.time() >= SESSION_CLOSE:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return (datetime.combine(day, SESSION_OPEN) - now).total_seconds()
+
+
+# api-id -> TTL in seconds (or a function returning it). api-ids not listed are never cached
+# (account queries and orders must always hit the server).
+Ttl = Union[float, Callable[[], float]]
+API_TTLS: Dict[str, Ttl] = {
+    "ka10001": 24 * 3600,            # Stock name
+    "ka10081": until_next_session,   # Daily chart
+    "ka10082": until_next_session,   # Weekly chart
+    "ka10004": float(os.getenv("KIWOOM_HOGA_TTL", "0.5")),  # Hoga
+}
+
+
+class Uncached:
+    """Loader result that is returned to the caller (and single-flight waiters) but not stored,
+    e.g. an error placeholder or a partial chart"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _unwrap(value: Any) -> Any:
+    return value.value if isinstance(value, Uncached) else value
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache for read-only Kiwoom results, keyed by (api-id, request key).
+    - Each api-id has its own TTL (API_TTLS); others pass straight through
+    - Concurrent identical misses are single-flight: one caller loads,
+      the others wait for its result (an exception is shared, not cached)
+    - A loader can return Uncached(value) to hand back a result without caching it
+    - hit/miss/coalesced/eviction counters per api-id via stats()
+    """
+
+    def __init__(self, max_entries: int = 4096, ttls: Optional[Dict[str, Ttl]] = None):
+        self.max_entries = max_entries
+        self.ttls = API_TTLS if ttls is None else ttls
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable], Future] = {}
+        self._inflight_async: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def ttl(self, api_id: str) -> Optional[float]:
+        ttl = self.ttls.get(api_id)
+        return ttl() if callable(ttl) else ttl
+
+    def _count(self, api_id: str, name: str):
+        counters = self._counters.setdefault(
+            api_id, {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+        )
+        counters[name] += 1
+
+    def _lookup_locked(self, key) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store_locked(self, key, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._count(evicted[0], "evictions")
+
+    def get_or_load(self, api_id: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Cached value for (api_id, key), calling loader() once on a miss"""
+        ttl = self.ttl(api_id)
+        if not ttl or ttl <= 0:
+            return _unwrap(loader())
+
+        full_key = (api_id, key)
+        with self._lock:
+            found, value = self._lookup_locked(full_key)
+            if found:
+                self._count(api_id, "hits")
+                return value
+            pending = self._inflight.get(full_key)
+            if pending is None:
+                self._count(api_id, "misses")
+                pending = self._inflight[full_key] = Future()
+                owner = True
+            else:
+                self._count(api_id, "coalesced")
+                owner = False
+
+        if not owner:
+            return pending.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[full_key]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            if not isinstance(value, Uncached):
+                self._store_locked(full_key, value, ttl)
+            del self._inflight[full_key]
+        value = _unwrap(value)
+        pending.set_result(value)
+        return value
+
+    async def get_or_load_async(self, api_id: str, key: Hashable,
+                                loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Coroutine version of get_or_load (entries are shared with the sync path)"""
+        ttl = self.ttl(api_id)
+        if not ttl or ttl <= 0:
+            return _unwrap(await loader())
+
+        full_key = (api_id, key)
+        with self._lock:
+            found, value = self._lookup_locked(full_key)
+            if found:
+                self._count(api_id, "hits")
+                return value
+            pending = self._inflight_async.get(full_key)
+            if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+                self._count(api_id, "misses")
+                pending = self._inflight_async[full_key] = asyncio.get_running_loop().create_future()
+                owner = True
+            else:
+                self._count(api_id, "coalesced")
+                owner = False
+
+        if not owner:
+            # shield: a cancelled waiter must not cancel the shared load
+            return await asyncio.shield(pending)
+
+        try:
+            value = await loader()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight_async.get(full_key) is pending:
+                    del self._inflight_async[full_key]
+            if isinstance(e, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(e)
+                pending.exception()  # mark retrieved when nobody was waiting
+            raise
+        with self._lock:
+            if not isinstance(value, Uncached):
+                self._store_locked(full_key, value, ttl)
+            if self._inflight_async.get(full_key) is pending:
+                del self._inflight_async[full_key]
+        value = _unwrap(value)
+        pending.set_result(value)
+        return value
+
+    def invalidate(self, api_id: Optional[str] = None):
+        """Drop all entries (or only those of one api-id)"""
+        with self._lock:
+            if api_id is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == api_id]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_api = {api_id: dict(counters) for api_id, counters in self._counters.items()}
+            size = len(self._entries)
+        hits = sum(c["hits"] + c["coalesced"] for c in per_api.values())
+        lookups = hits + sum(c["misses"] for c in per_api.values())
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "apis": per_api,
+        }
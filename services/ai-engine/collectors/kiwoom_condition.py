@@ -3,47 +3,26 @@ import asyncio
 import websockets
 import json
 import logging
-import os
 from collectors.kiwoom import KiwoomCollector
+from collectors.kiwoom_transport import default_ws_url
 from strategies.auto_trader import AutoTrader
+from strategies.order_pipeline import OrderPipeline
 
 logger = logging.getLogger(__name__)
 
-# Socket URL is usually wss://openapi.kiwoom.com/websocket or similar.
-# User script: socket_url + '/api/dostk/websocket'
-# Need to check what 'config.socket_url' was in user script. 
-# Assuming standard Kiwoom Cloud WebSocket OR we use the same base URL as REST but wss:// ?
-# Actually user script imports `config.socket_url`.
-# Let's try to infer from `base_url`. 
-# If REST is https://api.kiwoom.com, Websocket might be wss://api.kiwoom.com/websocket ? Or separate domain.
-# Let's use env variable or default.
-
 class KiwoomConditionCollector:
     def __init__(self):
         self.kiwoom = KiwoomCollector()
         self.trader = AutoTrader()
-        # Websocket URL:
-        # User script: `socket_url` imported.
-        # Known Kiwoom REST WS: check docs. 
-        # Notion says: wss://openapi.kiwoom.com/websocket (KIS) ? No user said NOT KIS.
-        # Kiwoom Open API uses OCX.
-        # BUT User provided script `rt_search.py` specifically uses `/api/dostk/websocket` path.
-        # This implies standard Kiwoom REST is being used.
-        # Let's derive from .env or hardcode typical.
-        self.ws_url = "wss://openapi.kiwoom.com/websocket" # Default guess
-        # Wait, user script has `from config import socket_url`.
-        # Let's assume standard `wss://openapi.kiwoom.com/websocket` for now?
-        # Actually, previous REST url was `https://api.kiwoom.com`.
-        # So maybe `wss://api.kiwoom.com/api/dostk/websocket`?
-        # User script: `socket_url + '/api/dostk/websocket'`
-        # I will use a safe default and allow env override.
-        
+        # KIWOOM_WS_URL, else derived from the REST base URL:
+        # https://api.kiwoom.com -> wss://api.kiwoom.com/api/dostk/websocket
+        self.ws_url = default_ws_url(self.kiwoom.base_url)
+        # Condition hits are queued and bought by background workers
+        self.orders = OrderPipeline(self.trader.check_and_buy)
+
     async def run(self):
-        # Determine URL
-        # Currently we use `https://api.kiwoom.com` for REST.
-        # Let's try `wss://api.kiwoom.com/websocket` or similar.
-        # Kiwoom Cloud API (Core): wss://openapi.kiwoom.com/websocket
-        uri = os.getenv("KIWOOM_WS_URL", "wss://api.kiwoom.com/api/dostk/websocket")
+        uri = self.ws_url
+        self.orders.start()
         
         logger.info(f"Connecting to Kiwoom WebSocket: {uri}")
         
@@ -105,12 +84,8 @@ class KiwoomConditionCollector:
                                 code = vals.get('9001') # Symbol Code
                                 if code:
                                     logger.info(f"Condition Match: {code}")
-                                    # Trigger Auto Buy
-                                    # Run in thread or async to avoid blocking WS? 
-                                    # check_and_buy is sync (requests).
-                                    # loop.run_in_executor needed.
-                                    loop = asyncio.get_event_loop()
-                                    await loop.run_in_executor(None, self.trader.check_and_buy, code)
+                                    # Trigger Auto Buy (queued; the receive loop never waits for orders)
+                                    self.orders.submit(code)
 
             except websockets.ConnectionClosed:
                 logger.warning("WebSocket Connection Closed. Reconnecting in 5s...")
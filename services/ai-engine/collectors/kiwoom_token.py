@@ -0,0 +1,124 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Refresh this long before expires_dt
+REFRESH_MARGIN = float(os.getenv("KIWOOM_TOKEN_REFRESH_MARGIN", "600"))
+# Used when the token response has no (parsable) expires_dt
+DEFAULT_TOKEN_TTL = 12 * 3600
+# Retry delay for a failed background refresh
+RETRY_DELAY = 30
+# Kiwoom timestamps (expires_dt) are Korea Standard Time
+KST = ZoneInfo("Asia/Seoul")
+
+
+def kst_now(now: Optional[datetime] = None) -> datetime:
+    """
+    Korean market wall-clock time as a naive datetime (session hours, bar dates).
+    An aware `now` is converted to KST; a naive one is taken to be KST already.
+    """
+    now = now or datetime.now(KST)
+    if now.tzinfo is not None:
+        now = now.astimezone(KST).replace(tzinfo=None)
+    return now
+
+
+def parse_expires_dt(value) -> Optional[float]:
+    """Kiwoom expires_dt (YYYYMMDDHHMMSS, always KST whatever the host timezone) -> epoch seconds"""
+    try:
+        return datetime.strptime(str(value), "%Y%m%d%H%M%S").replace(tzinfo=KST).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenManager:
+    """
+    Process-wide Kiwoom access token (au10001).
+    - One token shared by every collector on the same transport
+    - Refreshed in the background REFRESH_MARGIN seconds before expiry
+    - refresh(stale) is single-flight: when many callers hit a 401 with the same
+      token, only the first one requests a new token, the rest reuse it
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def _valid(self) -> bool:
+        return self._token is not None and time.time() < self._expires_at - REFRESH_MARGIN / 2
+
+    def current(self) -> Optional[str]:
+        """Token if it is still valid (no network)"""
+        return self._token if self._valid() else None
+
+    def get(self) -> Optional[str]:
+        """Valid token, requesting one if needed (None on failure)"""
+        token = self.current()
+        if token:
+            return token
+        with self._lock:
+            if self._valid():
+                return self._token
+            token = self._fetch_locked()
+            if token is None and self._token is not None and time.time() < self._expires_at:
+                return self._token  # refresh failed, old token has not expired yet
+            return token
+
+    def refresh(self, stale: Optional[str] = None) -> Optional[str]:
+        """
+        Replace a rejected token. If another caller already replaced `stale`,
+        the newer token is returned without another au10001 call.
+        """
+        with self._lock:
+            if self._token is not None and self._token != stale and self._valid():
+                return self._token
+            return self._fetch_locked()
+
+    def _fetch_locked(self) -> Optional[str]:
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": os.getenv("KIWOOM_APP_KEY"),
+            "secretkey": os.getenv("KIWOOM_SECRET_KEY")
+        }
+        try:
+            res = self.transport.post("au10001", body, auth=False)
+            data = res.json()
+            token = data.get('token')
+            if not token:
+                raise ValueError(f"no token in response: {data.get('return_msg')}")
+        except Exception as e:
+            logger.error(f"Failed to get Kiwoom Token: {e}")
+            return None
+
+        self._token = token
+        self._expires_at = parse_expires_dt(data.get('expires_dt')) or time.time() + DEFAULT_TOKEN_TTL
+        logger.info(f"Kiwoom token issued (expires {datetime.fromtimestamp(self._expires_at, KST):%Y-%m-%d %H:%M:%S} KST)")
+        self._schedule(self._expires_at - REFRESH_MARGIN - time.time())
+        return token
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(delay, 1.0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        with self._lock:
+            if self._fetch_locked() is None and time.time() < self._expires_at:
+                # Keep the old token and try again shortly
+                self._schedule(RETRY_DELAY)
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,203 @@
+import os
+import time
+import threading
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from collectors.kiwoom_cache import ResponseCache
+from collectors.kiwoom_token import TokenManager
+from utils.latency import observe_request
+from utils.rate_limit import PriorityRateScheduler, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class KiwoomAuthError(Exception):
+    """No usable access token"""
+
+# Production endpoints. KIWOOM_BASE_URL / KIWOOM_WS_URL override them, e.g. to point
+# every client at the local simulator (scripts/kiwoom_simulator.py) for load tests.
+DEFAULT_BASE_URL = "https://api.kiwoom.com"
+WS_PATH = "/api/dostk/websocket"
+
+
+def default_base_url() -> str:
+    """REST base URL (read at call time so .env.local loaded later still applies)"""
+    return os.getenv("KIWOOM_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
+def default_ws_url(base_url: Optional[str] = None) -> str:
+    """WebSocket URL: KIWOOM_WS_URL, else derived from the REST base URL (https -> wss)"""
+    url = os.getenv("KIWOOM_WS_URL")
+    if url:
+        return url
+    base = base_url or default_base_url()
+    scheme, sep, rest = base.partition("://")
+    return {"https": "wss", "http": "ws"}.get(scheme, scheme) + sep + rest + WS_PATH
+
+# api-id -> REST path
+API_PATHS = {
+    "au10001": "/oauth2/token",      # Access Token
+    "ka10001": "/api/dostk/stkinfo",  # Stock Info (Name)
+    "ka10004": "/api/dostk/mrkcond",  # Hoga
+    "ka10080": "/api/dostk/chart",    # Minute Chart
+    "ka10081": "/api/dostk/chart",    # Daily Chart
+    "ka10082": "/api/dostk/chart",    # Weekly Chart
+    "kt00001": "/api/dostk/acnt",     # Deposit
+    "kt00004": "/api/dostk/acnt",     # Holdings
+    "kt10000": "/api/dostk/ordr",     # Buy
+    "kt10001": "/api/dostk/ordr",     # Sell
+}
+
+# (connect, read) timeouts in seconds.
+# Connect is short since the pooled connection is usually already open;
+# chart queries return large payloads so they get a longer read timeout.
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 5)
+API_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "ka10080": (3.05, 10),
+    "ka10081": (3.05, 10),
+    "ka10082": (3.05, 10),
+}
+
+# Request scheduling: orders > account/hoga > charts > names.
+# Orders and queries are throttled separately (Kiwoom limits them separately),
+# and each api-id can have its own tighter limit on top of its group.
+API_GROUPS: Dict[str, str] = {
+    "au10001": "token",
+    "kt10000": "order",
+    "kt10001": "order",
+}
+API_PRIORITIES: Dict[str, int] = {
+    "au10001": 0,
+    "kt10001": 0, "kt10000": 1,                   # Orders (sells before buys)
+    "kt00001": 1, "kt00004": 1, "ka10004": 1,     # Account / Hoga
+    "ka10080": 2, "ka10081": 2, "ka10082": 2,     # Charts
+    "ka10001": 3,                                 # Names
+}
+# requests per second
+GROUP_RATES: Dict[str, float] = {
+    "token": 1,
+    "order": float(os.getenv("KIWOOM_ORDER_RATE", "5")),
+    "query": float(os.getenv("KIWOOM_QUERY_RATE", "5")),
+}
+API_RATES: Dict[str, float] = {
+    "ka10080": 3, "ka10081": 3, "ka10082": 3,
+    "ka10001": 2,
+}
+
+
+def build_scheduler() -> PriorityRateScheduler:
+    """Priority scheduler over per-group and per-api-id token buckets"""
+    group_limiters = {group: RateLimiter(rate) for group, rate in GROUP_RATES.items()}
+    api_limiters = {api_id: RateLimiter(rate) for api_id, rate in API_RATES.items()}
+
+    def route(api_id: str):
+        group = API_GROUPS.get(api_id, "query")
+        limiters = [group_limiters[group]]
+        if api_id in api_limiters:
+            limiters.append(api_limiters[api_id])
+        return group, API_PRIORITIES.get(api_id, 2), limiters
+
+    return PriorityRateScheduler(route)
+
+
+class KiwoomTransport:
+    """
+    Shared HTTP transport for the Kiwoom REST API.
+    One pooled keep-alive session per base URL, so repeated calls (e.g. the
+    1s sell loop) reuse an open TLS connection instead of handshaking each time.
+    Per api-id headers (including Authorization) are built once per token.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = 10):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"content-type": "application/json;charset=UTF-8"})
+
+        # Process-wide token and request budget (shared by every collector on this transport)
+        self.tokens = TokenManager(self)
+        self.scheduler = build_scheduler()
+        # Read-only results (names, daily charts, hoga), shared by the sync and async clients
+        self.cache = ResponseCache(max_entries=int(os.getenv("KIWOOM_CACHE_SIZE", "4096")))
+        self._headers: Dict[str, Dict[str, str]] = {}
+        self._headers_token: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def headers(self, api_id: str, token: Optional[str] = None) -> Dict[str, str]:
+        """Pre-built per-request headers for api_id (rebuilt when the token changes)"""
+        with self._lock:
+            if token != self._headers_token:
+                self._headers = {}
+                self._headers_token = token
+            headers = self._headers.get(api_id)
+            if headers is None:
+                headers = {"api-id": api_id}
+                if token:
+                    headers["Authorization"] = f"Bearer {token}"
+                self._headers[api_id] = headers
+            return headers
+
+    def url(self, api_id: str) -> str:
+        return self.base_url + API_PATHS[api_id]
+
+    def _send(self, api_id: str, body: Dict[str, Any], token: Optional[str],
+              extra_headers: Optional[Dict[str, str]],
+              timeout: Optional[Tuple[float, float]]) -> requests.Response:
+        queued = time.monotonic()
+        self.scheduler.acquire(api_id)
+        sent = time.monotonic()
+        headers = self.headers(api_id, token)
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        try:
+            return self.session.post(
+                self.url(api_id),
+                headers=headers,
+                json=body,
+                timeout=timeout or API_TIMEOUTS.get(api_id, DEFAULT_TIMEOUT),
+            )
+        finally:
+            observe_request(api_id, sent - queued, time.monotonic() - sent)
+
+    def post(self, api_id: str, body: Dict[str, Any], auth: bool = True,
+             extra_headers: Optional[Dict[str, str]] = None,
+             timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        """
+        POST to the endpoint for api_id and raise on HTTP errors.
+        A 401 refreshes the shared token once and retries the request once.
+        """
+        token = None
+        if auth:
+            token = self.tokens.get()
+            if not token:
+                raise KiwoomAuthError(f"No Kiwoom token for {api_id}")
+
+        res = self._send(api_id, body, token, extra_headers, timeout)
+        if auth and res.status_code == 401:
+            logger.warning(f"Kiwoom {api_id} returned 401, refreshing token")
+            token = self.tokens.refresh(token)
+            if token:
+                res = self._send(api_id, body, token, extra_headers, timeout)
+        res.raise_for_status()
+        return res
+
+    def close(self):
+        self.tokens.close()
+        self.session.close()
+
+
+# Shared instances (one connection pool per base URL, process-wide)
+_transports: Dict[str, KiwoomTransport] = {}
+_transports_lock = threading.Lock()
+
+def get_transport(base_url: str) -> KiwoomTransport:
+    with _transports_lock:
+        if base_url not in _transports:
+            _transports[base_url] = KiwoomTransport(base_url)
+        return _transports[base_url]
@@ -0,0 +1,199 @@
+"""
+ListingCache - KOSPI/KOSDAQ 종목 리스트 디스크 캐시
+여러 프로세스(uvicorn 워커, 재시작)가 같은 파일을 공유해서
+종목 리스트 다운로드(fdr.StockListing)를 TTL당 한 번만 하도록 합니다.
+
+조회 순서: 메모리 -> 캐시 파일 -> scripts/fetch_krx_stocks.py 결과(JSON) -> 다운로드
+"""
+
+import os
+import io
+import json
+import zipfile
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from collectors.bar_store import DEFAULT_DATA_DIR, _atomic_write
+
+logger = logging.getLogger(__name__)
+
+LISTING_MARKETS = ["KOSPI", "KOSDAQ"]
+
+# 파일 포맷: 컬럼별 배열 .npz (문자열은 고정폭 유니코드, pickle 없이 읽음)
+# + _version(포맷 버전), _saved_at(저장 시각, epoch)
+CACHE_VERSION = 2
+LISTING_COLUMNS = ("Code", "Name", "Market", "Marcap", "Close")
+
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_DATA_DIR, "listing", "stock_list.npz")
+DEFAULT_KRX_JSON = os.path.join(os.path.dirname(__file__), "../../../data/krx_stock_list.json")
+
+# fetcher() -> 종목 리스트 DataFrame (Code/Name/Market/Marcap/Close)
+ListingFetcher = Callable[[], pd.DataFrame]
+
+
+def fdr_listing() -> pd.DataFrame:
+    """기본 다운로더: FinanceDataReader KOSPI + KOSDAQ 종목 리스트"""
+    import FinanceDataReader as fdr
+
+    all_stocks = []
+    for market in LISTING_MARKETS:
+        try:
+            df = fdr.StockListing(market)
+            df['Market'] = market
+            all_stocks.append(df)
+        except Exception as e:
+            logger.error(f"Failed to get {market} listing: {e}")
+
+    if not all_stocks:
+        return pd.DataFrame()
+    return pd.concat(all_stocks, ignore_index=True)
+
+
+def compact_listing(df: pd.DataFrame) -> pd.DataFrame:
+    """스크리너가 쓰는 컬럼만 남기고 타입 정리 (캐시 파일 크기 최소화)"""
+    out = pd.DataFrame(index=range(len(df)))
+    code = df['Code'] if 'Code' in df.columns else df.get('Symbol', pd.Series([""] * len(df)))
+    out['Code'] = code.fillna("").astype(str).to_numpy()
+    out['Name'] = df['Name'].fillna("").astype(str).to_numpy() if 'Name' in df.columns else ""
+    out['Market'] = df['Market'].fillna("KOSPI").astype(str).to_numpy() if 'Market' in df.columns else "KOSPI"
+    for col in ("Marcap", "Close"):
+        values = pd.to_numeric(df[col], errors="coerce") if col in df.columns else pd.Series(0, index=df.index)
+        out[col] = values.fillna(0).to_numpy(dtype="float64")
+    return out
+
+
+def read_krx_json(path: str, markets: Optional[List[str]] = LISTING_MARKETS
+                  ) -> Tuple[Optional[pd.DataFrame], Optional[datetime]]:
+    """fetch_krx_stocks.py 결과 -> (종목 리스트, updated_at). 기본은 KOSPI/KOSDAQ만, markets=None이면 ETF 포함 전체"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        updated_at = datetime.fromisoformat(data["updated_at"])
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+    rows = [
+        {
+            "Code": s.get("symbol", ""),
+            "Name": s.get("name", ""),
+            "Market": s.get("market", ""),
+            "Marcap": s.get("marcap", 0),
+            "Close": s.get("close", 0),
+        }
+        for s in data.get("stocks", [])
+        if markets is None or s.get("market") in markets
+    ]
+    if not rows:
+        return None, updated_at
+    return compact_listing(pd.DataFrame(rows)), updated_at
+
+
+class ListingCache:
+    """TTL 기반 종목 리스트 캐시 (메모리 + 프로세스 간 공유 파일)"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 fetcher: ListingFetcher = fdr_listing, krx_json: Optional[str] = DEFAULT_KRX_JSON):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl = float(ttl if ttl is not None else os.getenv("LISTING_CACHE_TTL", "21600"))  # 초 (기본 6시간)
+        self.fetcher = fetcher
+        self.krx_json = krx_json
+        self._frame: Optional[pd.DataFrame] = None
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _fresh(self, saved_at: float) -> bool:
+        return time.time() - saved_at < self.ttl
+
+    # ---- 파일 포맷 ----
+
+    def read_file(self) -> Tuple[Optional[pd.DataFrame], float]:
+        """캐시 파일 -> (종목 리스트, 저장 시각). 없거나 버전이 다르면 (None, 0)"""
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                version = int(data["_version"])
+                if version != CACHE_VERSION:
+                    logger.info(f"Ignoring listing cache {self.path} (version {version})")
+                    return None, 0.0
+                frame = pd.DataFrame({col: data[col] for col in LISTING_COLUMNS})
+                return frame, float(data["_saved_at"])
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Unreadable listing cache {self.path}: {e}")
+            return None, 0.0
+
+    def write_file(self, frame: pd.DataFrame, saved_at: float):
+        """캐시 파일 원자적 교체"""
+        columns = {col: frame[col].to_numpy(dtype=str if col in ("Code", "Name", "Market") else "float64")
+                   for col in LISTING_COLUMNS}
+        buf = io.BytesIO()
+        np.savez(buf, _version=np.int64(CACHE_VERSION), _saved_at=np.float64(saved_at), **columns)
+
+        def _write(p):
+            with open(p, "wb") as f:
+                f.write(buf.getvalue())
+        _atomic_write(self.path, _write)
+
+    # ---- 조회 ----
+
+    def _load(self) -> Tuple[Optional[pd.DataFrame], float]:
+        stale, saved_at = self.read_file()
+        if stale is not None and self._fresh(saved_at):
+            return stale, saved_at
+
+        if self.krx_json:
+            frame, updated_at = read_krx_json(self.krx_json)
+            if frame is not None and self._fresh(updated_at.timestamp()):
+                logger.info(f"Listing loaded from {self.krx_json} ({len(frame)} stocks)")
+                saved_at = updated_at.timestamp()
+                self.write_file(frame, saved_at)
+                return frame, saved_at
+
+        raw = self.fetcher()
+        if raw is None or raw.empty:
+            if stale is not None:
+                logger.warning(f"Listing download failed, using stale cache {self.path}")
+                return stale, saved_at
+            return None, 0.0
+        frame, saved_at = compact_listing(raw), time.time()
+        self.write_file(frame, saved_at)
+        logger.info(f"Listing downloaded and cached ({len(frame)} stocks)")
+        return frame, saved_at
+
+    def get(self, markets: Optional[List[str]] = None) -> pd.DataFrame:
+        """종목 리스트 (TTL 내에서는 네트워크 없이 반환, markets를 주면 해당 마켓만)"""
+        with self._lock:
+            if self._frame is None or not self._fresh(self._saved_at):
+                frame, saved_at = self._load()
+                if frame is not None:
+                    self._frame, self._saved_at = frame, saved_at
+            frame = self._frame
+
+        if frame is None:
+            return pd.DataFrame()
+        if markets:
+            return frame[frame['Market'].isin(markets)]
+        return frame
+
+    def invalidate(self):
+        """메모리/파일 캐시 모두 무효화 (다음 get에서 다시 로드)"""
+        with self._lock:
+            self._frame, self._saved_at = None, 0.0
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# 싱글톤 인스턴스
+_listing_cache_instance = None
+
+def get_listing_cache() -> ListingCache:
+    global _listing_cache_instance
+    if _listing_cache_instance is None:
+        _listing_cache_instance = ListingCache()
+    return _listing_cache_instance
@@ -0,0 +1,193 @@
+"""
+SymbolMaster - 메모리 종목 마스터 (종목코드 -> 종목명/마켓/규모/시가총액)
+scripts/fetch_krx_stocks.py 결과(data/krx_stock_list.json, ETF 포함)를 한 번 읽어
+컬럼별 NumPy 배열로 들고 있습니다. 종목명 조회는 네트워크(ka10001) 없이 O(1)입니다.
+
+- 조회: code -> 행 번호 dict 인덱스
+- 검색: 코드/종목명/초성 접두어 (정렬 배열 + searchsorted), 없으면 부분 일치
+- 갱신: SYMBOL_MASTER_TTL(기본 1일)이 지나거나 JSON 파일이 바뀌면 다음 조회 때 다시 로드
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from collectors.listing_cache import DEFAULT_KRX_JSON, get_listing_cache, read_krx_json
+from strategies.screener_plan import size_classes_of
+
+logger = logging.getLogger(__name__)
+
+# 한글 초성 (가-힣 음절 -> 초성)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = set(CHOSUNG)
+
+
+def to_chosung(text: str) -> str:
+    """'삼성전자' -> 'ㅅㅅㅈㅈ' (한글 음절만 초성으로, 나머지 문자는 그대로)"""
+    return "".join(
+        CHOSUNG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch
+        for ch in text
+    )
+
+
+def normalize_code(symbol: str) -> str:
+    """키움 형식 'A005930' -> '005930'"""
+    symbol = str(symbol).strip()
+    if len(symbol) == 7 and symbol[0] == "A":
+        return symbol[1:]
+    return symbol
+
+
+@dataclass
+class SymbolInfo:
+    code: str
+    name: str
+    market: str
+    size_class: str    # large / mid / small (스크리너와 같은 시가총액 기준)
+    market_cap: float  # 억 원
+
+
+class SymbolMaster:
+    """배열 기반 종목 마스터 (읽기 전용 스냅샷, 갱신 시 통째로 교체)"""
+
+    def __init__(self, listing: pd.DataFrame):
+        n = len(listing)
+        self.codes = listing["Code"].astype(str).to_numpy(dtype=str) if n else np.empty(0, dtype=str)
+        self.names = listing["Name"].astype(str).to_numpy(dtype=str) if n else np.empty(0, dtype=str)
+        self.markets = listing["Market"].astype(str).to_numpy(dtype=str) if n else np.empty(0, dtype=str)
+        marcap = listing["Marcap"].to_numpy(dtype=np.float64) if n else np.zeros(0)
+        self.market_cap = marcap / 100000000  # 원 -> 억
+        self.size_classes = size_classes_of(self.market_cap).astype(str)
+        self._index: Dict[str, int] = {code: i for i, code in enumerate(self.codes.tolist())}
+
+        # 접두어 검색용 정렬 배열 (값, 원래 행 번호)
+        lowered = np.char.lower(self.names)
+        chosung = np.array([to_chosung(name) for name in self.names.tolist()], dtype=str)
+        self._sorted = {}
+        for key, values in (("code", self.codes), ("name", lowered), ("chosung", chosung)):
+            order = np.argsort(values, kind="stable")
+            self._sorted[key] = (values[order], order)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return normalize_code(symbol) in self._index
+
+    def row(self, symbol: str) -> Optional[int]:
+        return self._index.get(normalize_code(symbol))
+
+    def name(self, symbol: str, default: Optional[str] = None) -> Optional[str]:
+        """종목명 (없으면 default)"""
+        i = self.row(symbol)
+        return str(self.names[i]) if i is not None else default
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        i = self.row(symbol)
+        if i is None:
+            return None
+        return SymbolInfo(
+            code=str(self.codes[i]), name=str(self.names[i]), market=str(self.markets[i]),
+            size_class=str(self.size_classes[i]), market_cap=float(self.market_cap[i]),
+        )
+
+    def _prefix_rows(self, key: str, prefix: str) -> np.ndarray:
+        values, order = self._sorted[key]
+        lo = np.searchsorted(values, prefix, side="left")
+        hi = np.searchsorted(values, prefix + "\U0010ffff", side="left")
+        return order[lo:hi]
+
+    def search(self, query: str, limit: int = 20) -> List[SymbolInfo]:
+        """
+        코드/종목명 검색: 접두어 일치가 먼저, 그 다음 부분 일치 (각각 시가총액 큰 순)
+        초성만 입력하면 초성으로 검색 ('ㅅㅅㅈㅈ' -> 삼성전자)
+        """
+        query = normalize_code(query).strip()
+        if not query or not len(self):
+            return []
+
+        if query.isdigit():
+            key, needle = "code", query
+        elif all(ch in _CHOSUNG_SET or ch == " " for ch in query):
+            key, needle = "chosung", query
+        else:
+            key, needle = "name", query.lower()
+
+        prefix = self._prefix_rows(key, needle)
+        rows = [prefix[np.argsort(-self.market_cap[prefix], kind="stable")]]
+        if len(prefix) < limit:
+            values, order = self._sorted[key]
+            contains = order[np.char.find(values, needle) > 0]
+            rows.append(contains[np.argsort(-self.market_cap[contains], kind="stable")])
+        return [self.get(str(self.codes[i])) for i in np.concatenate(rows)[:limit]]
+
+
+class SymbolMasterCache:
+    """SymbolMaster 싱글톤 로더 (TTL/파일 변경 시 다시 로드)"""
+
+    def __init__(self, krx_json: Optional[str] = DEFAULT_KRX_JSON, ttl: Optional[float] = None):
+        self.krx_json = krx_json
+        self.ttl = float(ttl if ttl is not None else os.getenv("SYMBOL_MASTER_TTL", "86400"))  # 초 (기본 1일)
+        self._master: Optional[SymbolMaster] = None
+        self._loaded_at = 0.0
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _json_mtime(self):
+        try:
+            return os.path.getmtime(self.krx_json) if self.krx_json else None
+        except OSError:
+            return None
+
+    def _load(self) -> Optional[SymbolMaster]:
+        if self.krx_json:
+            frame, _ = read_krx_json(self.krx_json, markets=None)
+            if frame is not None:
+                logger.info(f"Symbol master loaded from {self.krx_json} ({len(frame)} symbols)")
+                return SymbolMaster(frame)
+        # JSON이 없으면 종목 리스트 캐시(KOSPI/KOSDAQ, 하루 한 번 다운로드)
+        frame = get_listing_cache().get()
+        if frame.empty:
+            return None
+        logger.info(f"Symbol master loaded from listing cache ({len(frame)} symbols)")
+        return SymbolMaster(frame)
+
+    def get(self) -> SymbolMaster:
+        master = self._master
+        if master is not None and time.time() - self._loaded_at < self.ttl and self._json_mtime() == self._mtime:
+            return master
+        with self._lock:
+            mtime = self._json_mtime()
+            if self._master is None or time.time() - self._loaded_at >= self.ttl or mtime != self._mtime:
+                try:
+                    loaded = self._load()
+                except Exception as e:
+                    logger.error(f"Failed to load symbol master: {e}")
+                    loaded = None
+                if loaded is not None:
+                    self._master = loaded
+                elif self._master is None:
+                    self._master = SymbolMaster(pd.DataFrame())
+                # 실패해도 TTL 동안은 다시 시도하지 않음 (이전 스냅샷 유지)
+                self._loaded_at, self._mtime = time.time(), mtime
+            return self._master
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = 0.0
+
+
+# 싱글톤 인스턴스
+_symbol_master_cache = None
+
+def get_symbol_master() -> SymbolMaster:
+    global _symbol_master_cache
+    if _symbol_master_cache is None:
+        _symbol_master_cache = SymbolMasterCache()
+    return _symbol_master_cache.get()
@@ -27,6 +27,7 @@ class TradingConfig:
         self.buy_order_type = "limit"  # "limit"(지정가) or "market"(시장가)
         self.min_buy_amount = 50000    # 최소 매수 금액 (원)
         self.max_position_count = 10   # 최대 보유 종목 수
+        self.buy_enabled = True        # 신규 매수 허용 (전체 청산 시 중지, /start로 재개)
         
         # 익절/손절 설정 (기본값)
         self.take_profit_rate = 5.0    # 익절 기준 (%)
@@ -67,7 +68,8 @@ class TradingConfig:
         order_type_kr = "지정가" if self.buy_order_type == "limit" else "시장가"
         return (
             f"⚙️ 현재 설정\n\n"
-            f"💰 매수: {self.buy_ratio}% | {order_type_kr}\n"
+            f"💰 매수: {self.buy_ratio}% | {order_type_kr}"
+            f"{'' if self.buy_enabled else ' (🛑 중지됨)'}\n"
             f"📈 익절: +{self.take_profit_rate}%\n"
             f"📉 손절: {self.stop_loss_rate}%\n"
             f"📋 조건식: {self.condition_seq}번\n\n"
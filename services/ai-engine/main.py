@@ -70,6 +70,39 @@ async def run_chart_analysis(request: ChartAnalysisRequest):
         print(f"Analysis Endpoint Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/kiwoom/cache")
+def get_kiwoom_cache_stats():
+    """
+    Returns hit/miss counters of the Kiwoom response cache (names, daily charts, hoga).
+    """
+    from collectors.kiwoom_async import get_async_kiwoom
+    return get_async_kiwoom().cache.stats()
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Latency histograms (Kiwoom api-id round trips, rate-limit waits, order stages) in Prometheus text format.
+    """
+    from fastapi.responses import PlainTextResponse
+    from utils.latency import get_latency_metrics
+    return PlainTextResponse(get_latency_metrics().render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/kiwoom/latency")
+def get_kiwoom_latency():
+    """
+    Same histograms as /metrics, summarized as p50/p95/p99 (ms) per series.
+    """
+    from utils.latency import get_latency_metrics
+    return get_latency_metrics().summary()
+
+@app.get("/api/symbols/search")
+def search_symbols(q: str, limit: int = 20):
+    """
+    Searches the in-memory symbol master by code, name or Hangul initials (e.g. "ㅅㅅㅈㅈ").
+    """
+    from collectors.symbol_master import get_symbol_master
+    return {"results": [vars(info) for info in get_symbol_master().search(q, limit)]}
+
 class AlphaHRRequest(BaseModel):
     company_name: str
 
@@ -131,14 +164,32 @@ def get_market_map():
 
 
 # ============ Custom Stock Screener ============
-from strategies.screener import run_custom_screen, get_screener, get_screener_profiles
-from typing import Dict, Any
+from strategies.screener import run_custom_screen, run_custom_screens, stream_custom_screen, get_screener, get_screener_profiles
+from strategies.screener_panel import PROFILE_CONDITIONS, resolve_min_score
+from strategies.screener_live import get_live_screener, stream_live_screen
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError, model_validator
+from fastapi import Query
+import json
+from typing import Dict, Any, List
+from datetime import datetime
+
+class MinScoreMixin:
+    """Rejects a min_score outside 1..(number of conditions of the profile) with a 422"""
 
-class ScreenerRequest(BaseModel):
+    @model_validator(mode="after")
+    def check_min_score(self):
+        if self.profile_id in PROFILE_CONDITIONS:
+            resolve_min_score(self.profile_id, self.min_score)
+        return self
+
+class ScreenerRequest(MinScoreMixin, BaseModel):
     profile_id: Optional[str] = "momentum_surge"
     params: Optional[Dict[str, Any]] = None
-    min_score: Optional[int] = 10
+    min_score: Optional[int] = None
     max_stocks: Optional[int] = 500
+    markets: Optional[List[str]] = None
+    size_classes: Optional[List[str]] = None
 
 @app.post("/api/screener/run")
 async def run_screener(request: ScreenerRequest = ScreenerRequest()):
@@ -146,14 +197,109 @@ async def run_screener(request: ScreenerRequest = ScreenerRequest()):
     Runs the custom stock screener with user-defined conditions.
     profile_id: Screener profile ID (default: momentum_surge)
     params: Custom parameter overrides
-    min_score: Minimum number of conditions to match (default: 10 = all)
+    min_score: Minimum number of conditions to match, 1..number of profile conditions (default: all)
     max_stocks: Maximum number of stocks to check (default: 500)
+    markets: Market filter, e.g. ["KOSPI"] (default: all)
+    size_classes: Size filter, e.g. ["large", "mid"] (default: all)
+    Response includes timings.fetch_ms (data acquisition) and timings.compute_ms (condition checks).
     """
     try:
         result = await run_custom_screen(
             profile_id=request.profile_id,
             params=request.params,
             min_score=request.min_score,
+            max_stocks=request.max_stocks,
+            markets=request.markets,
+            size_classes=request.size_classes
+        )
+        return result
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _screener_event_stream(request: "ScreenerRequest") -> StreamingResponse:
+    async def event_stream():
+        async for event in stream_custom_screen(
+            profile_id=request.profile_id,
+            params=request.params,
+            min_score=request.min_score,
+            max_stocks=request.max_stocks,
+            markets=request.markets,
+            size_classes=request.size_classes
+        ):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=float)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/screener/stream")
+async def stream_screener(request: ScreenerRequest = ScreenerRequest()):
+    """
+    Streaming variant of /api/screener/run (Server-Sent Events).
+    Emits each result as soon as it reaches min_score, plus progress counters (checked/total),
+    and a final 'done' event with timings.
+    Read it with fetch() and the response body stream; browsers' EventSource only issues GETs,
+    so use GET /api/screener/stream for that.
+    """
+    return _screener_event_stream(request)
+
+@app.get("/api/screener/stream")
+async def stream_screener_get(
+    profile_id: str = "momentum_surge",
+    params: Optional[str] = Query(None, description="JSON object of parameter overrides"),
+    min_score: Optional[int] = None,
+    max_stocks: int = 500,
+    markets: Optional[List[str]] = Query(None),
+    size_classes: Optional[List[str]] = Query(None),
+):
+    """
+    Same stream as POST /api/screener/stream, for EventSource clients.
+    Settings go in the query string, e.g.
+    /api/screener/stream?profile_id=momentum_surge&min_score=8&markets=KOSPI&params={"volume_min_ratio":2}
+    (repeat markets / size_classes for several values).
+    """
+    try:
+        request = ScreenerRequest(
+            profile_id=profile_id,
+            params=json.loads(params) if params else None,
+            min_score=min_score,
+            max_stocks=max_stocks,
+            markets=markets,
+            size_classes=size_classes
+        )
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"params is not valid JSON: {e}")
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+    return _screener_event_stream(request)
+
+class ScreenerSpec(MinScoreMixin, BaseModel):
+    profile_id: Optional[str] = "momentum_surge"
+    params: Optional[Dict[str, Any]] = None
+    min_score: Optional[int] = None
+    label: Optional[str] = None
+    markets: Optional[List[str]] = None
+    size_classes: Optional[List[str]] = None
+
+class BatchScreenerRequest(BaseModel):
+    screens: List[ScreenerSpec]
+    max_stocks: Optional[int] = 500
+
+@app.post("/api/screener/batch")
+async def run_screener_batch(request: BatchScreenerRequest):
+    """
+    Runs several screener profiles / parameter sets against a single load of the universe data.
+    screens: List of {profile_id, params, min_score, label, markets, size_classes}
+    max_stocks: Maximum number of stocks to check per screen (default: 500)
+    Each entry in the response's 'screens' matches what /api/screener/run returns for the same settings.
+    """
+    try:
+        result = await run_custom_screens(
+            specs=[spec.model_dump() for spec in request.screens],
             max_stocks=request.max_stocks
         )
         return result
@@ -162,6 +308,40 @@ async def run_screener(request: ScreenerRequest = ScreenerRequest()):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/screener/live")
+async def get_live_screener_results(max_stocks: int = 500):
+    """
+    Intraday incremental momentum_surge screener, kept current by the real-time 0B tick feed.
+    The first call seeds it from daily bars (max_stocks symbols) and starts the feed; later calls
+    return the current matches right away.
+    """
+    feed = await get_live_screener(max_stocks)
+    results = feed.screener.results()
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "symbols": len(feed.screener.symbols),
+        "ticks": feed.ticks,
+        "total_matches": len(results),
+        "results": results
+    }
+
+@app.get("/api/screener/live/stream")
+async def stream_live_screener(max_stocks: int = 500):
+    """
+    Server-Sent Events for the intraday screener (works with a browser EventSource).
+    Emits a 'snapshot' event with the current matches, then a 'diff' event
+    (added / removed / updated) whenever ticks change the result set.
+    """
+    async def event_stream():
+        async for event in stream_live_screen(max_stocks):
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=float)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/screener/profiles")
 async def get_profiles():
     """
@@ -13,9 +13,10 @@ from telegram.ext import Application, ContextTypes, CommandHandler, MessageHandl
 from collectors.kiwoom_condition import KiwoomConditionCollector
 from strategies.auto_trader import AutoTrader
 from utils import send_telegram_message
+from utils.latency import get_latency_metrics, start_metrics_server
 from utils.menu_handlers import (
     get_state, reset_state,
-    render_main_menu, render_holdings_menu, render_stock_detail,
+    render_main_menu, render_holdings_menu, render_stock_detail, render_liquidate_confirm,
     render_value_select, render_new_buy_settings, render_global_settings,
     render_order_type_select, parse_value_input
 )
@@ -44,10 +45,15 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """/start: Start Auto Trading"""
     global trader, collector
     if trader and not trader.running:
+        config.buy_enabled = True
         trader.running = True
         asyncio.create_task(trader.run_sell_loop())
         asyncio.create_task(collector.run())
         await update.message.reply_text("🚀 자동매매 시스템을 시작합니다.\n(조건검색 + 자동손익절 감시 중)")
+    elif not config.buy_enabled:
+        # 전체 청산 후: 감시는 계속 작동 중이고 신규 매수만 멈춰 있던 상태
+        config.buy_enabled = True
+        await update.message.reply_text("▶️ 신규 매수를 재개합니다.\n(자동손익절 감시는 계속 작동 중)")
     else:
         await update.message.reply_text("✅ 이미 작동 중입니다.")
 
@@ -62,20 +68,33 @@ async def stop_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """/status: Check Account Status"""
-    global trader
+    global trader, collector
     try:
-        balance = trader.kiwoom.get_balance(trader.account_no)
-        holdings = trader.kiwoom.get_holdings(trader.account_no)
+        # 계좌 캐시 (ACCOUNT_MAX_AGE보다 오래됐을 때만 kt00004/kt00001 조회)
+        snap = await asyncio.to_thread(trader.account.snapshot)
         
-        msg = f"📊 *계좌 현황*\n예수금: {balance:,}원\n\n*보유 종목*:\n"
-        if not holdings:
+        msg = f"📊 *계좌 현황*\n예수금: {snap.cash:,}원\n\n*보유 종목*:\n"
+        if not snap.holdings:
             msg += "없음"
         else:
-            for h in holdings:
-                name = h.get('stk_nm', 'N/A')
-                qty = int(h.get('rmnd_qty', 0))
-                ret = float(h.get('pl_rt', 0))
-                msg += f"• {name}: {qty}주 ({ret}%)\n"
+            for h in snap.holdings.values():
+                msg += f"• {h.name}: {h.qty}주 ({h.pl_rt:.2f}%)\n"
+        if snap.pending:
+            msg += "\n*미체결 매수*:\n"
+            for p in snap.pending.values():
+                msg += f"• {p.name}: {p.qty}주 @ {p.price:,.0f}원\n"
+
+        if collector:
+            q = collector.orders.stats()
+            msg += (f"\n*주문 대기열*: {q['depth']}/{q['capacity']} "
+                    f"(처리 {q['completed']}, 중복 {q['deduped']}, 드롭 {q['dropped']}, "
+                    f"최대 대기 {q['max_wait_ms']:.0f}ms)")
+
+        # 신호 -> 주문 접수 지연 (p50/p95)
+        for side, label in (("buy", "매수"), ("sell", "매도")):
+            lat = get_latency_metrics().quantiles("stockiq_order_signal_to_ack_seconds", side=side)
+            if lat:
+                msg += f"\n*{label} 지연*: p50 {lat['p50_ms']:.0f}ms / p95 {lat['p95_ms']:.0f}ms ({lat['count']}건)"
         
         await update.message.reply_text(msg, parse_mode='Markdown')
     except Exception as e:
@@ -86,7 +105,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """/help: Show Commands"""
     msg = (
         "🤖 *StockIQ Bot 명령어*\n\n"
-        "/start - 자동매매 시작\n"
+        "/start - 자동매매 시작 (전체 청산 후 신규 매수 재개)\n"
         "/stop - 자동매매 중지\n"
         "/status - 계좌 현황 조회\n"
         "/m - 설정 메뉴\n"
@@ -124,7 +143,7 @@ async def handle_menu_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
         elif text == "1":
             # 보유 종목 관리
             try:
-                cached_holdings = trader.kiwoom.get_holdings(trader.account_no)
+                cached_holdings = await asyncio.to_thread(trader.account.holdings_list)
             except:
                 cached_holdings = []
             state["menu"] = "holdings"
@@ -141,6 +160,15 @@ async def handle_menu_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # 현재 상태 조회
             state["menu"] = "status"
             await update.message.reply_text(config.to_summary())
+        elif text == "5":
+            # 전체 청산 (확인 후 실행)
+            try:
+                cached_holdings = await asyncio.to_thread(trader.account.holdings_list, 0)
+            except Exception as e:
+                await update.message.reply_text(f"❌ 조회 실패: {e}")
+                return
+            state["menu"] = "confirm_liquidate"
+            await update.message.reply_text(render_liquidate_confirm(cached_holdings))
         else:
             await update.message.reply_text("❌ 잘못된 입력입니다.\n\n" + render_main_menu())
     
@@ -214,6 +242,7 @@ async def handle_menu_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
             try:
                 success = trader.kiwoom.place_order(trader.account_no, symbol, qty, 0, 'sell')
                 if success:
+                    trader.account.apply_fill(symbol, 'sell', qty, 0)
                     await update.message.reply_text(f"✅ {name} {qty}주 시장가 매도 주문 완료")
                     send_telegram_message(f"🔴 [수동매도] {name} {qty}주 시장가 매도")
                 else:
@@ -228,6 +257,25 @@ async def handle_menu_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
             state["menu"] = "stock_detail"
             await update.message.reply_text(render_stock_detail(stock_info, symbol))
     
+    # ===== 전체 청산 확인 =====
+    elif menu == "confirm_liquidate":
+        if text == "1" and cached_holdings:
+            # 신규 매수부터 막고, 보유 종목 전부 동시에 시장가 매도
+            config.buy_enabled = False
+            await update.message.reply_text(f"🚨 {len(cached_holdings)}종목 전체 청산 주문 중...")
+            try:
+                results = await trader.monitor.liquidate_all()
+                failed = [r.order.name for r in results if not r.success]
+                msg = f"✅ 전체 청산 주문 {len(results) - len(failed)}/{len(results)}건 접수"
+                if failed:
+                    msg += f"\n⚠️ 실패: {', '.join(failed)}"
+                await update.message.reply_text(msg)
+            except Exception as e:
+                logger.error(f"Liquidation error: {e}")
+                await update.message.reply_text(f"❌ 오류: {e}")
+        state["menu"] = "main"
+        await update.message.reply_text(render_main_menu())
+    
     # ===== 종목별 익절 설정 =====
     elif menu == "stock_tpr":
         symbol = state.get("selected_stock")
@@ -456,6 +504,9 @@ async def main():
     logger.info("🤖 Bot Started via Polling...")
     send_telegram_message("🤖 봇 서버가 시작되었습니다. /help 를 입력해보세요!")
 
+    # 지연 히스토그램 (/metrics, METRICS_PORT)
+    start_metrics_server()
+
     # Start Auto Trading Components
     trader.running = True
     sell_task = asyncio.create_task(trader.run_sell_loop())
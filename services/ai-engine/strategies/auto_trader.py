@@ -1,11 +1,13 @@
 
 import logging
-import time
-import math
 import os
-import asyncio
+import threading
+from collectors.account_state import get_account_state
 from collectors.kiwoom import KiwoomCollector
+from collectors.symbol_master import get_symbol_master
+from strategies.position_monitor import get_position_monitor
 from utils import send_telegram_message
+from utils.latency import OrderTrace, current_trace
 from config.trading_config import config
 
 logger = logging.getLogger(__name__)
@@ -15,150 +17,151 @@ class AutoTrader:
         self.kiwoom = KiwoomCollector()
         self.account_no = os.getenv("KIWOOM_ACCOUNT", "")
         self.running = False
+        # 보유 종목/주문가능금액 캐시 (계좌별 공유)
+        self.account = get_account_state(self.account_no)
+        # 실시간 체결(0B) 기반 익절/손절 감시
+        self.monitor = get_position_monitor(self.account_no)
+        # 동시에 진행 중인 매수 (OrderPipeline 워커가 여러 종목을 동시에 처리)
+        self._buying = set()
+        self._buying_lock = threading.Lock()
         
         if not self.account_no:
             logger.warning("KIWOOM_ACCOUNT not set in env. Auto trading might fail.")
 
-    def check_and_buy(self, symbol: str):
+    def check_and_buy(self, symbol: str) -> str:
         """
         Executes Buy Logic:
-        1. Check if already held (kt00004) -> User Logic: "이미 보유 중입니다." return
-        2. Check Balance (kt00001)
+        1. Check if already held (cached AccountState) -> User Logic: "이미 보유 중입니다." return
+        2. Check Balance (cached AccountState)
         3. Check Ask Price (ka10004)
         4. Calculate Qty (설정된 비율로 매수)
         5. Place Order (kt10000)
+        Each stage is timed on an OrderTrace (started at signal receipt when called from the
+        OrderPipeline) and the trace is logged with the outcome when the call returns.
+        Returns the outcome ("ordered" when the broker accepted the order).
         """
         symbol_code = symbol.replace('A', '') # Clean symbol just in case
-
-        # 최대 보유 종목수 체크
+        trace = current_trace() or OrderTrace("buy", symbol_code)
+
+        with self._buying_lock:
+            if symbol_code in self._buying:
+                logger.info(f"Skipping Buy: {symbol_code} already being bought")
+                trace.finish("duplicate")
+                return "duplicate"
+            self._buying.add(symbol_code)
+        outcome = "error"
+        try:
+            with trace.activate():
+                outcome = self._buy(symbol_code, trace)
+        finally:
+            with self._buying_lock:
+                self._buying.discard(symbol_code)
+            trace.finish(outcome)
+        return outcome
+
+    def _buy(self, symbol_code: str, trace: OrderTrace) -> str:
+        """Returns the outcome recorded on the trace"""
+        if not config.buy_enabled:
+            logger.info(f"Skipping Buy: new buys are paused ({symbol_code})")
+            return "paused"
+
+        # 1. 보유 종목/잔고는 AccountState 캐시에서 (ACCOUNT_MAX_AGE보다 오래되면 새로 조회)
         try:
-            holdings = self.kiwoom.get_holdings(self.account_no)
-            if len(holdings) >= config.max_position_count:
-                logger.info(f"Skipping Buy: Max positions reached ({len(holdings)}/{config.max_position_count})")
-                return
-                
-            for stock in holdings:
-                if stock['stk_cd'].replace('A', '') == symbol_code:
-                    logger.info(f"Skipping Buy: Already holding {symbol_code} ({stock['stk_nm']})")
-                    return
+            with trace.span("account"):
+                snap = self.account.snapshot()
         except Exception as e:
-            logger.error(f"Error checking holdings: {e}")
-            return
-
-        time.sleep(1) # Rate limit safety
+            logger.error(f"Error checking account: {e}")
+            return "account_error"
+
+        held = snap.holdings.get(symbol_code)
+        if held is not None:
+            logger.info(f"Skipping Buy: Already holding {symbol_code} ({held.name})")
+            return "held"
+        if symbol_code in snap.pending:
+            logger.info(f"Skipping Buy: Limit buy for {symbol_code} still pending")
+            return "pending"
+
+        # 최대 보유 종목수 체크 (미체결 지정가 매수, 다른 종목의 진행 중인 매수도 포함)
+        with self._buying_lock:
+            others = len(self._buying) - 1 + len(snap.pending)
+        if len(snap.holdings) + others >= config.max_position_count:
+            logger.info(f"Skipping Buy: Max positions reached ({len(snap.holdings)}+{others}/{config.max_position_count})")
+            return "max_positions"
+
+        # Rate limits are enforced per api-id by the Kiwoom transport scheduler
 
         # 2. Check Balance
+        # 설정된 비율로 매수 금액 계산 - 동시에 진행 중인 다른 매수가 잡아 둔 금액은 빼고 계산
+        expense = self.account.reserve_cash(symbol_code, config.buy_ratio / 100.0)
         try:
-            balance = self.kiwoom.get_balance(self.account_no)
-        except Exception as e:
-            logger.error(f"Error checking balance: {e}")
-            return
+            return self._order(symbol_code, expense, trace)
+        finally:
+            self.account.release_cash(symbol_code)
 
-        # 설정된 비율로 매수 금액 계산
-        expense = balance * (config.buy_ratio / 100.0)
-        
+    def _order(self, symbol_code: str, expense: int, trace: OrderTrace) -> str:
+        """Hoga -> qty -> order with expense set aside for this symbol"""
         # 최소 매수 금액 체크
         if expense < config.min_buy_amount:
             logger.warning(f"Expense {expense} below min amount {config.min_buy_amount}")
-            return
-
-        time.sleep(1)
+            return "no_cash"
 
         # 3. Check Ask Price (Hoga)
         try:
-            ask_price = self.kiwoom.get_hoga(symbol_code)
+            with trace.span("hoga"):
+                ask_price = self.kiwoom.get_hoga(symbol_code)
         except Exception as e:
             logger.error(f"Error checking hoga: {e}")
-            return
+            return "hoga_error"
 
         if ask_price <= 0:
             logger.warning(f"Invalid Ask Price for {symbol_code}: {ask_price}")
-            return
+            return "hoga_error"
 
         # 4. Calculate Qty
         qty = int(expense // ask_price)
         if qty == 0:
             logger.warning(f"Insufficient funds for {symbol_code} (Price: {ask_price}, Alloc: {expense})")
-            return
+            return "no_qty"
         
         logger.info(f"Buying {symbol_code}: {qty}ea @ {ask_price} (ratio: {config.buy_ratio}%)")
+        trace.note(qty=qty, price=ask_price, order_type=config.buy_order_type)
 
-        time.sleep(1)
-
-        # 5. Place Order
+        # 5. Place Order (span = rate-limit wait + submit until the broker's ack)
         # 주문 타입에 따라 다르게 처리
-        if config.buy_order_type == "market":
-            # 시장가 주문
-            success = self.kiwoom.place_order(self.account_no, symbol_code, qty, 0, 'buy')
-        else:
-            # 지정가 주문 (기본)
-            success = self.kiwoom.place_order(self.account_no, symbol_code, qty, int(ask_price), 'buy')
+        with trace.span("order"):
+            if config.buy_order_type == "market":
+                # 시장가 주문
+                success = self.kiwoom.place_order(self.account_no, symbol_code, qty, 0, 'buy')
+            else:
+                # 지정가 주문 (기본)
+                success = self.kiwoom.place_order(self.account_no, symbol_code, qty, int(ask_price), 'buy')
+        trace.acked()
         
         if success:
-            time.sleep(1)
-            name = self.kiwoom.get_master_name(symbol_code)
-            order_type_kr = "시장가" if config.buy_order_type == "market" else "지정가"
-            msg = f"🚀 [자동매수] {name}({symbol_code}) {qty}주 {order_type_kr} 매수 완료"
+            name = get_symbol_master().name(symbol_code, symbol_code)
+            if config.buy_order_type == "market":
+                self.account.apply_fill(symbol_code, 'buy', qty, ask_price, name)
+                msg = f"🚀 [자동매수] {name}({symbol_code}) {qty}주 시장가 매수 완료"
+            else:
+                # 지정가는 접수만 된 상태 -> kt00004에 잡힐 때까지 미체결로만 기록 (감시 대상 아님)
+                self.account.add_pending_buy(symbol_code, qty, ask_price, name)
+                msg = f"🚀 [자동매수] {name}({symbol_code}) {qty}주 지정가 매수 주문 접수 ({int(ask_price):,}원)"
             logger.info(msg)
-            send_telegram_message(msg)
-        else:
-            logger.error(f"Buy Order Failed for {symbol_code}")
+            with trace.span("notify"):
+                send_telegram_message(msg)
+            return "ordered"
+        logger.error(f"Buy Order Failed for {symbol_code}")
+        return "rejected"
 
     async def run_sell_loop(self):
         """
-        Polls portfolio every 1s and sells if Target/Stop reached.
+        Sells when Target/Stop is reached, driven by real-time ticks (see PositionMonitor).
+        The account state is reconciled with kt00004/kt00001 every POSITION_RECONCILE_SEC instead of polled every 1s.
         """
-        logger.info("Starting Sell Loop Monitor...")
         self.running = True
-        while self.running:
-            try:
-                holdings = self.kiwoom.get_holdings(self.account_no)
-                if not holdings:
-                    await asyncio.sleep(1)
-                    continue
-
-                for stock in holdings:
-                    try:
-                        pl_rt = float(stock['pl_rt'])
-                        symbol = stock['stk_cd'].replace('A', '')
-                        qty = int(stock['rmnd_qty'])
-                        name = stock['stk_nm']
-                        
-                        if qty <= 0: continue
-
-                        # 종목별 설정 가져오기 (개별 설정 우선, 없으면 전역)
-                        stock_config = config.get_stock_config(symbol)
-                        target_profit = stock_config['take_profit_rate']
-                        stop_loss = stock_config['stop_loss_rate']
-                        
-                        action = None
-                        if pl_rt > target_profit:
-                            action = f"익절 (>{target_profit}%)"
-                        elif pl_rt < stop_loss:
-                            action = f"손절 (<{stop_loss}%)"
-                        
-                        if action:
-                            logger.info(f"Triggering {action} for {name} ({pl_rt}%)")
-                            # Sell Market Price (03) -> Price 0
-                            success = self.kiwoom.place_order(self.account_no, symbol, qty, 0, 'sell')
-                            
-                            if success:
-                                msg = f"💰 [자동매도] {name} {action} 완료\n수익률: {pl_rt}%"
-                                send_telegram_message(msg)
-                                
-                                # 종목별 개별 설정 초기화
-                                config.clear_stock_override(symbol)
-                            else:
-                                send_telegram_message(f"⚠️ [매도실패] {name} {action} 주문 오류")
-                                
-                    except ValueError:
-                        continue # Parsing error
-
-            except Exception as e:
-                logger.error(f"Sell Loop Error: {e}")
-            
-            await asyncio.sleep(1)
+        await self.monitor.run()
 
     def stop(self):
         self.running = False
+        self.monitor.stop()
         logger.info("AutoTrader Stopped.")
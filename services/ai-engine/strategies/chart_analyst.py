@@ -1,13 +1,74 @@
 from typing import Dict
 import asyncio
 import pandas as pd
-from collectors.kiwoom import KiwoomCollector
+from collectors.kiwoom_async import get_async_kiwoom
+from collectors.bar_store import get_bar_store, kiwoom_to_frame, frame_to_kiwoom
 from llm_client import LLMClient
 
 class ChartAnalyst:
     def __init__(self):
-        self.kiwoom = KiwoomCollector()
+        self.kiwoom = get_async_kiwoom()
         self.llm = LLMClient()
+        # 키움 수정주가 일봉 저장소 (FDR 원주가 저장소와 섞이지 않음)
+        self.bars = get_bar_store("kiwoom")
+
+    def _read_stored_daily(self, symbol: str, count: int):
+        """
+        저장소 일봉 (count개 이상일 때만) - 파일 I/O라 스레드에서 호출
+        반환: (최신이면 일봉, 아니면 None / 마지막 장 마감까지는 받아 둬서 당일 봉만 있으면 되는지)
+        """
+        if len(self.bars.read(symbol)) < count:
+            return None, False
+        # 장중에는 당일(미완성) 봉이 INTRADAY_TTL 안에 저장된 경우만 최신
+        if self.bars.is_fresh(symbol, intraday=True):
+            return frame_to_kiwoom(self.bars.frame(symbol, count)), False
+        return None, self.bars.is_fresh(symbol)
+
+    def _store_daily(self, symbol: str, df: pd.DataFrame):
+        frame = kiwoom_to_frame(df)
+        if not frame.empty:
+            self.bars.write_frame(symbol, frame, covered_from=frame.index[0].date())
+
+    def _append_today(self, symbol: str, df: pd.DataFrame, count: int):
+        """키움에서 받은 당일 봉을 저장소 일봉 뒤에 덧붙이고 최근 count개 반환"""
+        self.bars.write_frame(symbol, kiwoom_to_frame(df))
+        return frame_to_kiwoom(self.bars.frame(symbol, count))
+
+    async def _get_daily_history(self, symbol: str, count: int):
+        """
+        일봉: 로컬 저장소 우선. 장중에는 당일 봉만 키움에서 받아 덧붙이고,
+        마지막 장 마감 이후 동기화되지 않았으면 전체를 키움에서 받아 저장
+        """
+        try:
+            stored, needs_today = await asyncio.to_thread(self._read_stored_daily, symbol, count)
+            if stored is not None:
+                return stored
+            if needs_today:
+                today = await self.kiwoom.get_price_history(symbol, "D", 1)
+                if not today.empty:
+                    return await asyncio.to_thread(self._append_today, symbol, today, count)
+        except Exception as e:
+            print(f"[ChartAnalyst] Bar store read failed ({e}). Falling back to Kiwoom.")
+
+        df = await self.kiwoom.get_price_history(symbol, "D", count)
+        try:
+            await asyncio.to_thread(self._store_daily, symbol, df)
+        except Exception as e:
+            print(f"[ChartAnalyst] Bar store write failed ({e})")
+        return df
+
+    async def _get_chart_bundle(self, symbol: str, intervals, count: int) -> Dict[str, pd.DataFrame]:
+        """필요한 주기를 한 번에 동시 조회 (중복 주기는 1회, 일봉은 로컬 저장소 경유)"""
+        intervals = list(dict.fromkeys(intervals))
+        others = [i for i in intervals if i != "D"]
+        tasks = [self.kiwoom.get_price_bundle(symbol, others, count)]
+        if "D" in intervals:
+            tasks.append(self._get_daily_history(symbol, count))
+        results = await asyncio.gather(*tasks)
+        bundle = results[0]
+        if "D" in intervals:
+            bundle["D"] = results[1]
+        return bundle
 
     def _calculate_indicators(self, df):
         if df.empty: return df
@@ -228,11 +289,11 @@ AI가 이 결론을 내린 구체적인 근거입니다.
             print(f"[ChartAnalyst] Analyzing {symbol} (Mode: {mode})...")
 
             # 1. Fetch Data 
-            # Use to_thread to avoid blocking event loop with synchronous requests
+            # All intervals in one concurrent bundle (LLM mode also needs weekly)
             # Increased to 200 for better indicator stability (RSI/MA/Bollinger)
-            df_daily = await asyncio.to_thread(self.kiwoom.get_price_history, symbol, "D", 200)
-            df_15m = await asyncio.to_thread(self.kiwoom.get_price_history, symbol, "15m", 200)
-            df_5m = await asyncio.to_thread(self.kiwoom.get_price_history, symbol, "5m", 200)
+            intervals = ["D", "15m", "5m"] if mode == "algo" else ["D", "W", "15m", "5m"]
+            bundle = await self._get_chart_bundle(symbol, intervals, 200)
+            df_daily, df_15m, df_5m = bundle["D"], bundle["15m"], bundle["5m"]
             
             if mode == "algo":
                 analysis = self._generate_heuristic_report(df_daily, df_15m, df_5m)
@@ -244,8 +305,7 @@ AI가 이 결론을 내린 구체적인 근거입니다.
                 }
 
             # LLM Mode: Ensure we have comprehensive data
-            df_weekly = await asyncio.to_thread(self.kiwoom.get_price_history, symbol, "W", 200)
-            df_15m = await asyncio.to_thread(self.kiwoom.get_price_history, symbol, "15m", 200)
+            df_weekly = bundle["W"]
             
             def format_df(df, name):
                 if df.empty: return f"[{name}] No Data"
@@ -0,0 +1,114 @@
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from collectors.account_state import AccountState, get_account_state
+from collectors.kiwoom_async import AsyncKiwoomCollector, get_async_kiwoom
+from config.trading_config import config
+from utils import send_telegram_message
+from utils.latency import OrderTrace
+
+logger = logging.getLogger(__name__)
+
+# Liquidation resubmits rejected sells (e.g. a 429 while the order budget is exhausted)
+LIQUIDATE_ATTEMPTS = 3
+LIQUIDATE_RETRY_DELAY = 1.0
+
+
+@dataclass
+class ExitOrder:
+    symbol: str
+    name: str
+    qty: int
+    price: float    # last price when triggered (used for the local fill)
+    pl_rt: float
+    reason: str
+    trace: Optional[OrderTrace] = None
+
+
+@dataclass
+class ExitResult:
+    order: ExitOrder
+    success: bool
+    ack_ms: Optional[float] = None
+
+
+class BatchExitExecutor:
+    """
+    Market sells for several positions at once.
+    - Every order in a batch is submitted concurrently on the async client; the shared
+      Kiwoom scheduler still meters them to the order rate (sells ahead of queued buys)
+    - Accepted sells update the AccountState right away
+    - The batch is reported in one Telegram message once every order has been acked
+    - attempts > 1 resubmits the rejected ones (after retry_delay) before reporting
+    """
+
+    def __init__(self, account_no: str, account: Optional[AccountState] = None,
+                 kiwoom: Optional[AsyncKiwoomCollector] = None):
+        self.account_no = account_no
+        self.account = account or get_account_state(account_no)
+        self.kiwoom = kiwoom or get_async_kiwoom()
+
+    async def execute(self, orders: List[ExitOrder], title: str = "자동매도",
+                      attempts: int = 1, retry_delay: float = LIQUIDATE_RETRY_DELAY) -> List[ExitResult]:
+        if not orders:
+            return []
+        logger.info(f"Submitting {len(orders)} market sell(s) ({title})")
+        results = list(await asyncio.gather(*(self._sell(order) for order in orders)))
+        for attempt in range(1, attempts):
+            failed = [i for i, r in enumerate(results) if not r.success]
+            if not failed:
+                break
+            logger.warning(f"Retrying {len(failed)} rejected sell(s) ({title}, attempt {attempt + 1}/{attempts})")
+            await asyncio.sleep(retry_delay)
+            retried = await asyncio.gather(*(self._sell(results[i].order) for i in failed))
+            for i, result in zip(failed, retried):
+                results[i] = result
+
+        msg = self.render_report(results, title)
+        notify_started = time.monotonic()
+        await asyncio.to_thread(send_telegram_message, msg)
+        notify_seconds = time.monotonic() - notify_started
+        for result in results:
+            trace = result.order.trace
+            if trace is not None:
+                trace.add("notify", notify_seconds)
+                trace.finish("ordered" if result.success else "rejected")
+        return results
+
+    async def _sell(self, order: ExitOrder) -> ExitResult:
+        trace = order.trace or OrderTrace("sell", order.symbol)
+        order.trace = trace
+        trace.note(qty=order.qty, price=order.price, pl_rt=round(order.pl_rt, 2), reason=order.reason)
+        with trace.activate(), trace.span("order"):
+            # Sell Market Price (03) -> Price 0
+            success = await self.kiwoom.place_order(self.account_no, order.symbol, order.qty, 0, 'sell')
+        trace.acked()
+        if success:
+            # 종목별 개별 설정 초기화
+            config.clear_stock_override(order.symbol)
+            self.account.apply_fill(order.symbol, 'sell', order.qty, order.price)
+        else:
+            logger.error(f"Sell Order Failed for {order.symbol} ({order.reason})")
+        return ExitResult(order=order, success=success, ack_ms=trace.ack_ms)
+
+    @staticmethod
+    def render_report(results: List[ExitResult], title: str) -> str:
+        if len(results) == 1:
+            result = results[0]
+            order = result.order
+            if result.success:
+                return f"💰 [{title}] {order.name} {order.reason} 완료\n수익률: {order.pl_rt:.2f}%"
+            return f"⚠️ [매도실패] {order.name} {order.reason} 주문 오류"
+
+        ok = sum(1 for r in results if r.success)
+        lines = [f"💰 [{title}] {len(results)}종목 시장가 매도 (성공 {ok} / 실패 {len(results) - ok})"]
+        for r in results:
+            mark = "✅" if r.success else "⚠️ 주문 오류"
+            lines.append(f"• {r.order.name} {r.order.qty}주 {r.order.pl_rt:+.2f}% {r.order.reason} {mark}")
+        acked = [r.ack_ms for r in results if r.ack_ms is not None]
+        if acked:
+            lines.append(f"\n마지막 주문 접수까지 {max(acked):.0f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,141 @@
+import os
+import time
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional
+
+from collectors.symbol_master import normalize_code
+from utils.latency import OrderTrace
+
+logger = logging.getLogger(__name__)
+
+# Bounded queue between condition hits and order execution
+ORDER_QUEUE_SIZE = int(os.getenv("ORDER_QUEUE_SIZE", "100"))
+# Buys that may run at the same time (one per symbol)
+ORDER_WORKERS = int(os.getenv("ORDER_WORKERS", "4"))
+# A symbol with an order accepted within this window (seconds) is not queued again
+ORDER_DEDUPE_SEC = float(os.getenv("ORDER_DEDUPE_SEC", "300"))
+# Handler outcome for an order the broker accepted (AutoTrader.check_and_buy)
+ORDER_ACCEPTED = "ordered"
+
+
+class OrderPipeline:
+    """
+    Condition hit -> buy, without blocking the WebSocket receive loop.
+    - submit() only enqueues (never awaits), so PINGs and further REAL packets keep flowing
+    - ORDER_WORKERS workers run the (blocking) handler in threads, one symbol each
+    - A symbol that is queued, in flight, or ordered within ORDER_DEDUPE_SEC is dropped as a duplicate
+      (the handler returns its outcome; only ORDER_ACCEPTED starts the window, so a signal
+      after a failed or skipped attempt is tried again)
+    - When the queue is full new signals are dropped (backpressure) and counted in stats()
+    - Each accepted signal starts an OrderTrace at receipt; the handler runs with it active,
+      so queue wait, handler stages and Kiwoom api-id calls land on the same trace
+    """
+
+    def __init__(self, handler: Callable[[str], Optional[str]], maxsize: int = ORDER_QUEUE_SIZE,
+                 workers: int = ORDER_WORKERS, dedupe_window: float = ORDER_DEDUPE_SEC):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.n_workers = workers
+        self.dedupe_window = dedupe_window
+        self.queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[str, float] = {}  # symbol -> enqueue time (queued or in flight)
+        self._recent: Dict[str, float] = {}   # symbol -> time its order was accepted
+        self._in_flight = 0
+        self.counters = {"submitted": 0, "accepted": 0, "deduped": 0, "dropped": 0,
+                         "completed": 0, "failed": 0}
+        self.max_depth = 0
+        self._wait = [0.0, 0.0]  # total, max queue wait (s)
+        self._exec = [0.0, 0.0]  # total, max execution time (s)
+
+    def start(self):
+        """Start the workers on the running loop (idempotent)"""
+        if self._workers and not all(w.done() for w in self._workers):
+            return
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self._pending.clear()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.n_workers)]
+        logger.info(f"Order pipeline started ({self.n_workers} workers, queue {self.maxsize})")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, symbol: str) -> bool:
+        """Enqueue a buy signal; False if it was a duplicate or the queue is full"""
+        symbol = normalize_code(symbol)
+        now = time.monotonic()
+        self.counters["submitted"] += 1
+
+        finished = self._recent.get(symbol)
+        if symbol in self._pending or (finished is not None and now - finished < self.dedupe_window):
+            self.counters["deduped"] += 1
+            logger.debug(f"Duplicate signal ignored: {symbol}")
+            return False
+        if self.queue is None:
+            raise RuntimeError("OrderPipeline.start() must be called first")
+        try:
+            self.queue.put_nowait((symbol, OrderTrace("buy", symbol, started=now)))
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            logger.warning(f"Order queue full ({self.maxsize}), dropping signal {symbol}")
+            return False
+
+        self._pending[symbol] = now
+        self.counters["accepted"] += 1
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return True
+
+    async def _worker(self, index: int):
+        while True:
+            symbol, trace = await self.queue.get()
+            started = time.monotonic()
+            self._record(self._wait, started - trace.started)
+            trace.add("queue", started - trace.started, trace.started)
+            self._in_flight += 1
+            try:
+                # to_thread copies the context, so the handler sees the active trace
+                with trace.activate():
+                    outcome = await asyncio.to_thread(self.handler, symbol)
+                self.counters["completed"] += 1
+                if outcome == ORDER_ACCEPTED:
+                    self._recent[symbol] = time.monotonic()
+            except Exception as e:
+                self.counters["failed"] += 1
+                trace.finish("error")
+                logger.error(f"Order worker {index} failed for {symbol}: {e}")
+            finally:
+                self._in_flight -= 1
+                finished = time.monotonic()
+                self._record(self._exec, finished - started)
+                self._pending.pop(symbol, None)
+                self._prune(finished)
+                self.queue.task_done()
+
+    @staticmethod
+    def _record(acc: List[float], seconds: float):
+        acc[0] += seconds
+        acc[1] = max(acc[1], seconds)
+
+    def _prune(self, now: float):
+        if len(self._recent) > 1000:
+            self._recent = {s: t for s, t in self._recent.items() if now - t < self.dedupe_window}
+
+    def stats(self) -> Dict[str, float]:
+        """Counters + backpressure (queue depth, waits) in ms"""
+        done = self.counters["completed"] + self.counters["failed"]
+        started = done + self._in_flight
+        return {
+            **self.counters,
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_depth": self.max_depth,
+            "capacity": self.maxsize,
+            "in_flight": self._in_flight,
+            "avg_wait_ms": round(self._wait[0] / started * 1000, 1) if started else 0.0,
+            "max_wait_ms": round(self._wait[1] * 1000, 1),
+            "avg_exec_ms": round(self._exec[0] / done * 1000, 1) if done else 0.0,
+            "max_exec_ms": round(self._exec[1] * 1000, 1),
+        }
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import websockets
+
+from collectors.account_state import Holding, get_account_state, parse_price
+from collectors.kiwoom_async import get_async_kiwoom
+from collectors.kiwoom_transport import default_ws_url
+from config.trading_config import config
+from strategies.exit_executor import LIQUIDATE_ATTEMPTS, BatchExitExecutor, ExitOrder, ExitResult
+from utils.latency import OrderTrace
+
+logger = logging.getLogger(__name__)
+
+# Holdings are re-read from kt00004 this often (seconds); ticks drive exits in between
+RECONCILE_INTERVAL = float(os.getenv("POSITION_RECONCILE_SEC", "30"))
+# After a failed exit order, wait this long before the next attempt on the same symbol
+EXIT_RETRY_DELAY = 5.0
+# Real-time registration group used for the 0B (주식체결) feed
+REAL_GROUP = "1"
+
+
+class PositionMonitor:
+    """
+    Event-driven take-profit / stop-loss.
+    - Holdings (qty, average price) come from the shared AccountState, reconciled with
+      kt00004/kt00001 every RECONCILE_INTERVAL seconds and updated right away on our own orders
+    - Every held symbol is registered on the real-time 0B feed; each tick recomputes
+      P/L and fires a market sell the moment a threshold is crossed
+    - Exits triggered in the same loop iteration (one REAL packet, one reconcile pass) are
+      sent together by the BatchExitExecutor and reported in one message
+    - Each exit is timed on an OrderTrace from the triggering tick to the broker's ack
+    """
+
+    def __init__(self, account_no: str):
+        self.account_no = account_no
+        self.kiwoom = get_async_kiwoom()
+        self.account = get_account_state(account_no)
+        self.account.add_listener(self._on_account_change)
+        self.running = False
+        self._exiting: Dict[str, float] = {}   # symbol -> exit started
+        self._retry_at: Dict[str, float] = {}  # symbol -> earliest next exit attempt
+        self.exits = BatchExitExecutor(account_no, self.account, self.kiwoom)
+        self._batch: List[ExitOrder] = []
+        self._flush_task: Optional[asyncio.Future] = None
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # --- Holdings ---
+
+    async def reconcile(self):
+        """Reload the account state (also checks thresholds at the broker's current price)"""
+        await asyncio.to_thread(self.account.refresh)
+        for holding in list(self.account.holdings.values()):
+            await self.check(holding)
+
+    def _on_account_change(self, added, removed):
+        """AccountState listener (any thread): follow holdings on the real-time feed"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        def subscribe():
+            asyncio.ensure_future(self._register(added, "REG"))
+            asyncio.ensure_future(self._register(removed, "REMOVE"))
+        loop.call_soon_threadsafe(subscribe)
+
+    # --- Exits ---
+
+    async def check(self, holding: Holding, received: Optional[float] = None):
+        """received: when the triggering tick arrived (start of the exit's trace)"""
+        received = received if received is not None else time.monotonic()
+        symbol = holding.symbol
+        if symbol in self._exiting or holding.qty <= 0 or holding.last_price <= 0:
+            return
+        if time.monotonic() < self._retry_at.get(symbol, 0.0):
+            return
+
+        stock_config = config.get_stock_config(symbol)
+        target_profit = stock_config['take_profit_rate']
+        stop_loss = stock_config['stop_loss_rate']
+        pl_rt = holding.pl_rt
+
+        action = None
+        if pl_rt > target_profit:
+            action = f"익절 (>{target_profit}%)"
+        elif pl_rt < stop_loss:
+            action = f"손절 (<{stop_loss}%)"
+        if action:
+            self._exiting[symbol] = time.monotonic()
+            logger.info(f"Triggering {action} for {holding.name} ({pl_rt:.2f}% @ {holding.last_price:,.0f})")
+            trace = OrderTrace("sell", symbol, started=received)
+            trace.add("trigger", time.monotonic() - received, received)
+            self._batch.append(ExitOrder(symbol=symbol, name=holding.name, qty=holding.qty,
+                                         price=holding.last_price, pl_rt=pl_rt, reason=action, trace=trace))
+            if self._flush_task is None:
+                self._flush_task = asyncio.ensure_future(self._flush())
+
+    async def _flush(self):
+        # Let the current packet / reconcile pass finish queuing its exits first
+        await asyncio.sleep(0)
+        batch, self._batch, self._flush_task = self._batch, [], None
+        await self._run_exits(batch, "자동매도")
+
+    async def _run_exits(self, orders: List[ExitOrder], title: str, attempts: int = 1) -> List[ExitResult]:
+        try:
+            results = await self.exits.execute(orders, title, attempts)
+        finally:
+            for order in orders:
+                self._exiting.pop(order.symbol, None)
+        for result in results:
+            if not result.success:
+                self._retry_at[result.order.symbol] = time.monotonic() + EXIT_RETRY_DELAY
+        return results
+
+    async def liquidate_all(self) -> List[ExitResult]:
+        """Panic exit: market-sell every holding at once (symbols already exiting are left to that order)"""
+        await asyncio.to_thread(self.account.refresh)
+        orders = []
+        for holding in list(self.account.holdings.values()):
+            if holding.symbol in self._exiting or holding.qty <= 0:
+                continue
+            self._exiting[holding.symbol] = time.monotonic()
+            orders.append(ExitOrder(symbol=holding.symbol, name=holding.name, qty=holding.qty,
+                                    price=holding.last_price, pl_rt=holding.pl_rt, reason="전체 청산"))
+        logger.warning(f"Liquidating all positions ({len(orders)} symbols)")
+        return await self._run_exits(orders, "전체청산", LIQUIDATE_ATTEMPTS)
+
+    # --- Real-time feed ---
+
+    async def _register(self, symbols: Iterable[str], trnm: str):
+        symbols = list(symbols)
+        if not symbols or self._ws is None:
+            return
+        packet = {
+            'trnm': trnm,
+            'grp_no': REAL_GROUP,
+            'refresh': '1',  # keep the other registrations in the group
+            'data': [{'item': symbols, 'type': ['0B']}],
+        }
+        try:
+            await self._ws.send(json.dumps(packet))
+        except Exception as e:
+            logger.warning(f"Real-time {trnm} failed for {symbols}: {e}")
+
+    async def on_tick(self, symbol: str, values: dict):
+        received = time.monotonic()
+        holding = self.account.update_price(symbol.replace('A', ''), parse_price(values.get('10')))
+        if holding is not None:
+            await self.check(holding, received)
+
+    async def _reconcile_loop(self):
+        while self.running:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"Position reconcile error: {e}")
+            await asyncio.sleep(RECONCILE_INTERVAL)
+
+    async def run(self):
+        if self._task is not None and not self._task.done():
+            logger.info("Position Monitor already running.")
+            return
+        logger.info("Starting Position Monitor (real-time 0B feed)...")
+        self.running = True
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        reconcile_task = asyncio.create_task(self._reconcile_loop())
+        uri = default_ws_url(self.kiwoom.base_url)
+        try:
+            while self.running:
+                try:
+                    async with websockets.connect(uri) as websocket:
+                        token = await self.kiwoom._get_token()
+                        await websocket.send(json.dumps({'trnm': 'LOGIN', 'token': token}))
+
+                        async for message in websocket:
+                            data = json.loads(message)
+                            trnm = data.get('trnm')
+
+                            if trnm == 'LOGIN':
+                                if data.get('return_code') != 0:
+                                    logger.error(f"Position feed login failed: {data.get('return_msg')}")
+                                    break
+                                self._ws = websocket
+                                await self._register(list(self.account.holdings), "REG")
+                            elif trnm == 'PING':
+                                await websocket.send(message)  # Echo PING
+                            elif trnm == 'REAL':
+                                for item in data.get('data', []):
+                                    if item.get('type') == '0B':
+                                        await self.on_tick(item.get('item', ''), item.get('values', {}))
+                            if not self.running:
+                                break
+                except websockets.ConnectionClosed:
+                    logger.warning("Position feed closed. Reconnecting in 5s...")
+                except Exception as e:
+                    logger.error(f"Position feed error: {e}")
+                finally:
+                    self._ws = None
+                if self.running:
+                    await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            if self.running:
+                raise  # cancelled from outside, not by stop()
+        finally:
+            reconcile_task.cancel()
+            self._task = None
+            logger.info("Position Monitor stopped.")
+
+    def stop(self):
+        """Stop right away (the feed may be idle, so the run task is cancelled rather than polled)"""
+        self.running = False
+        if self._task is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+
+# One monitor per account (every AutoTrader instance shares it)
+_position_monitors: Dict[str, PositionMonitor] = {}
+
+def get_position_monitor(account_no: str) -> PositionMonitor:
+    if account_no not in _position_monitors:
+        _position_monitors[account_no] = PositionMonitor(account_no)
+    return _position_monitors[account_no]
@@ -4,13 +4,29 @@ Custom Stock Screener with Multiple Profiles
 여러 스크리너 프로필을 지원합니다.
 """
 
-import FinanceDataReader as fdr
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator, TYPE_CHECKING
 from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import logging
+import os
+import threading
+import time
+
+from collectors.bar_store import BarStore, get_bar_store
+from collectors.listing_cache import ListingCache, get_listing_cache
+from strategies.screener_plan import plan_universe
+from strategies.screener_panel import (
+    UniversePanel, PanelIndicators,
+    PROFILE_CONDITIONS, PROFILE_EVALUATORS, PROFILE_WINDOWS, resolve_min_score,
+    score_masks, conditions_for,
+)
+
+if TYPE_CHECKING:
+    from strategies.screener_live import IncrementalScreener
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +76,77 @@ def get_size_class(market_cap: float) -> str:
         return "small"
 
 
+def momentum_surge_conditions(close: float, open_price: float, high: float, volume: float,
+                              prev_close: float, vol_20d_avg: float, ma5: float, ma20: float,
+                              market_cap: float, params: Dict[str, Any]) -> Tuple[float, List[str]]:
+    """
+    모멘텀 급등 10개 조건 판정 (종목 1개, 스칼라 값)
+    check_momentum_surge와 증분 스크리너(IncrementalScreener)가 공유합니다.
+    
+    Returns:
+        (전일 대비 등락률, 충족 조건 목록)
+    """
+    # 파라미터 추출
+    change_min = params.get("change_min", 3.0)
+    change_max = params.get("change_max", 10.0)
+    volume_min_ratio = params.get("volume_min_ratio", 1.5)
+    volume_max_ratio = params.get("volume_max_ratio", 3.0)
+    upper_wick_pct = params.get("upper_wick_pct", 1.0)
+    price_min = params.get("price_min", 3000)
+    price_max = params.get("price_max", 30000)
+    market_cap_min = params.get("market_cap_min", 1000)
+    
+    # 전일 종가 대비 등락률
+    change_pct = ((close - prev_close) / prev_close) * 100 if prev_close > 0 else 0
+    
+    # 상한가 (전일 종가 기준 +30%)
+    upper_limit = prev_close * 1.30
+    
+    conditions_met = []
+    
+    # ① 전일 등락률 조건
+    if change_min <= change_pct <= change_max:
+        conditions_met.append("change_range")
+    
+    # ② 전일 종가 < 상한가
+    if params.get("not_upper_limit", True) and close < upper_limit:
+        conditions_met.append("not_upper_limit")
+    
+    # ③ 전일 거래량 >= 평균 * min_ratio
+    if volume >= vol_20d_avg * volume_min_ratio:
+        conditions_met.append("volume_min")
+    
+    # ④ 전일 거래량 <= 평균 * max_ratio
+    if volume <= vol_20d_avg * volume_max_ratio:
+        conditions_met.append("volume_max")
+    
+    # ⑤ 양봉
+    if params.get("bullish_candle", True) and close >= open_price:
+        conditions_met.append("bullish_candle")
+    
+    # ⑥ 윗꼬리
+    if high > 0 and ((high - close) / high) >= (upper_wick_pct / 100):
+        conditions_met.append("upper_wick")
+    
+    # ⑦ 5일선 위
+    if params.get("above_ma5", True) and close > ma5:
+        conditions_met.append("above_ma5")
+    
+    # ⑧ 정배열
+    if params.get("ma5_above_ma20", True) and ma5 > ma20:
+        conditions_met.append("ma5_above_ma20")
+    
+    # ⑨ 가격 범위
+    if price_min <= close <= price_max:
+        conditions_met.append("price_range")
+    
+    # ⑩ 시가총액
+    if market_cap >= market_cap_min:
+        conditions_met.append("market_cap")
+    
+    return change_pct, conditions_met
+
+
 # ==== 스크리너 프로필 정의 ====
 
 SCREENER_PROFILES: Dict[str, ScreenerProfile] = {
@@ -85,7 +172,7 @@ SCREENER_PROFILES: Dict[str, ScreenerProfile] = {
     "value_bounce": ScreenerProfile(
         id="value_bounce",
         name="가치 반등",
-        description="과매도 후 반등 시그널을 찾는 스크리너 (준비중)",
+        description="과매도 후 반등 시그널을 찾는 스크리너",
         conditions=[
             ScreenerCondition("rsi_max", "RSI 최대", value=30, min_value=10, max_value=50),
             ScreenerCondition("below_ma20", "20일선 아래", value=True),
@@ -95,7 +182,7 @@ SCREENER_PROFILES: Dict[str, ScreenerProfile] = {
     "breakout": ScreenerProfile(
         id="breakout",
         name="신고가 돌파",
-        description="52주 신고가 돌파 종목 (준비중)",
+        description="52주 신고가 돌파 종목",
         conditions=[
             ScreenerCondition("new_high_52w", "52주 신고가", value=True),
             ScreenerCondition("volume_min_ratio", "거래량 배율", value=2.0, min_value=1.0, max_value=10.0),
@@ -107,10 +194,13 @@ SCREENER_PROFILES: Dict[str, ScreenerProfile] = {
 class StockScreener:
     """커스텀 종목 스크리너"""
     
-    def __init__(self):
+    def __init__(self, bar_store: Optional[BarStore] = None, fetch_workers: Optional[int] = None,
+                 listing_cache: Optional[ListingCache] = None):
         self.profiles = SCREENER_PROFILES
-        self._stock_list_cache = None
-        self._cache_date = None
+        self.bars = bar_store or get_bar_store()
+        self.listings = listing_cache or get_listing_cache()
+        # 동시 데이터 수집 스레드 수
+        self.fetch_workers = fetch_workers or int(os.getenv("SCREENER_FETCH_WORKERS", "8"))
     
     def get_profiles(self) -> List[Dict[str, Any]]:
         """모든 스크리너 프로필 반환"""
@@ -156,41 +246,35 @@ class StockScreener:
             ]
         }
     
-    def get_stock_list(self, markets: List[str] = ["KOSPI", "KOSDAQ"]) -> pd.DataFrame:
-        """종목 리스트 가져오기 (캐시 사용)"""
-        today = datetime.now().date()
-        
-        if self._stock_list_cache is not None and self._cache_date == today:
-            return self._stock_list_cache
-        
-        all_stocks = []
-        for market in markets:
-            try:
-                df = fdr.StockListing(market)
-                df['Market'] = market
-                all_stocks.append(df)
-            except Exception as e:
-                logger.error(f"Failed to get {market} listing: {e}")
-        
-        if all_stocks:
-            self._stock_list_cache = pd.concat(all_stocks, ignore_index=True)
-            self._cache_date = today
-            return self._stock_list_cache
-        
-        return pd.DataFrame()
+    def get_stock_list(self, markets: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        종목 리스트 가져오기 (디스크 캐시 사용, 프로세스 간 공유)
+        markets를 주면 해당 마켓만 걸러서 반환합니다.
+        """
+        return self.listings.get(markets)
     
     def get_stock_data(self, symbol: str, days: int = 30) -> Optional[pd.DataFrame]:
-        """개별 종목 데이터 가져오기"""
+        """개별 종목 데이터 가져오기 (로컬 저장소 우선, 마지막 장 마감 이후 봉만 증분 다운로드)"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days + 10)  # 여유 있게 가져오기
-            
-            df = fdr.DataReader(symbol, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+            df = self.bars.ensure(symbol, days)
             
             if df is None or len(df) < 5:
                 return None
             
-            return df.tail(days)
+            return df
+        except Exception as e:
+            logger.debug(f"Failed to get data for {symbol}: {e}")
+            return None
+    
+    def get_stock_bars(self, symbol: str, days: int = 30) -> Optional[np.ndarray]:
+        """개별 종목 일봉 배열 (패널 평가용, DataFrame 변환 없음)"""
+        try:
+            bars = self.bars.ensure_bars(symbol, days)
+            
+            if bars is None or len(bars) < 5:
+                return None
+            
+            return bars
         except Exception as e:
             logger.debug(f"Failed to get data for {symbol}: {e}")
             return None
@@ -202,16 +286,6 @@ class StockScreener:
         if len(df) < 21:  # 최소 21일 데이터 필요
             return None
         
-        # 파라미터 추출
-        change_min = params.get("change_min", 3.0)
-        change_max = params.get("change_max", 10.0)
-        volume_min_ratio = params.get("volume_min_ratio", 1.5)
-        volume_max_ratio = params.get("volume_max_ratio", 3.0)
-        upper_wick_pct = params.get("upper_wick_pct", 1.0)
-        price_min = params.get("price_min", 3000)
-        price_max = params.get("price_max", 30000)
-        market_cap_min = params.get("market_cap_min", 1000)
-        
         # 최근 데이터
         today = df.iloc[-1]
         
@@ -219,13 +293,7 @@ class StockScreener:
         open_price = today['Open']
         high = today['High']
         volume = today['Volume']
-        
-        # 전일 종가 대비 등락률
-        if len(df) >= 2:
-            prev_close = df.iloc[-2]['Close']
-            change_pct = ((close - prev_close) / prev_close) * 100 if prev_close > 0 else 0
-        else:
-            change_pct = 0
+        prev_close = df.iloc[-2]['Close']
         
         # 20일 평균 거래량
         vol_20d_avg = df['Volume'].tail(20).mean()
@@ -234,59 +302,16 @@ class StockScreener:
         ma5 = df['Close'].tail(5).mean()
         ma20 = df['Close'].tail(20).mean()
         
-        # 상한가 (전일 종가 기준 +30%)
-        if len(df) >= 2:
-            prev_close = df.iloc[-2]['Close']
-            upper_limit = prev_close * 1.30
-        else:
-            upper_limit = close * 1.30
-        
-        conditions_met = []
-        
-        # ① 전일 등락률 조건
-        if change_min <= change_pct <= change_max:
-            conditions_met.append("change_range")
-        
-        # ② 전일 종가 < 상한가
-        if params.get("not_upper_limit", True) and close < upper_limit:
-            conditions_met.append("not_upper_limit")
-        
-        # ③ 전일 거래량 >= 평균 * min_ratio
-        if volume >= vol_20d_avg * volume_min_ratio:
-            conditions_met.append("volume_min")
-        
-        # ④ 전일 거래량 <= 평균 * max_ratio
-        if volume <= vol_20d_avg * volume_max_ratio:
-            conditions_met.append("volume_max")
-        
-        # ⑤ 양봉
-        if params.get("bullish_candle", True) and close >= open_price:
-            conditions_met.append("bullish_candle")
-        
-        # ⑥ 윗꼬리
-        if high > 0 and ((high - close) / high) >= (upper_wick_pct / 100):
-            conditions_met.append("upper_wick")
-        
-        # ⑦ 5일선 위
-        if params.get("above_ma5", True) and close > ma5:
-            conditions_met.append("above_ma5")
-        
-        # ⑧ 정배열
-        if params.get("ma5_above_ma20", True) and ma5 > ma20:
-            conditions_met.append("ma5_above_ma20")
-        
-        # ⑨ 가격 범위
-        if price_min <= close <= price_max:
-            conditions_met.append("price_range")
-        
-        # ⑩ 시가총액
-        if market_cap >= market_cap_min:
-            conditions_met.append("market_cap")
+        change_pct, conditions_met = momentum_surge_conditions(
+            close, open_price, high, volume, prev_close,
+            vol_20d_avg, ma5, ma20, market_cap, params
+        )
         
         return ScreenerResult(
             symbol=symbol,
             name=name,
             market=market,
+            size_class=get_size_class(market_cap),
             close=close,
             change_pct=change_pct,
             volume=int(volume),
@@ -295,116 +320,365 @@ class StockScreener:
             score=len(conditions_met)
         )
     
-    def run_screen(self, profile_id: str = "momentum_surge", 
-                   params: Optional[Dict[str, Any]] = None,
-                   min_score: int = 10, 
-                   max_stocks: int = 500,
-                   markets: Optional[List[str]] = None,
-                   size_classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def screen_panel(self, profile_id: str, panel: UniversePanel, params: Dict[str, Any],
+                     min_score: Optional[int], indicators: Optional[PanelIndicators] = None,
+                     include: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """
-        스크리닝 실행
+        프로필 조건을 패널 전체에 대해 벡터 연산으로 평가
+        (momentum_surge는 check_momentum_surge와 동일한 점수)
         
-        Args:
-            profile_id: 스크리너 프로필 ID
-            params: 파라미터 오버라이드 (없으면 기본값 사용)
-            min_score: 최소 충족 조건 수
-            max_stocks: 최대 검사 종목 수
-            markets: 마켓 필터 (["KOSPI", "KOSDAQ"] 등)
-            size_classes: 규모 필터 (["large", "mid", "small"] 등)
+        indicators: 같은 패널의 PanelIndicators를 넘기면 여러 프로필이 지표 계산을 공유
+        include: 평가 대상 종목 마스크 (없으면 패널 전체)
         """
-        logger.info(f"Starting screener '{profile_id}' with min_score={min_score}, max_stocks={max_stocks}, markets={markets}, size_classes={size_classes}")
+        evaluate = PROFILE_EVALUATORS.get(profile_id)
+        if evaluate is None or len(panel) == 0:
+            return []
         
-        # 프로필에서 기본 파라미터 가져오기
+        ind = indicators or PanelIndicators(panel)
+        order = PROFILE_CONDITIONS[profile_id]
+        eligible, masks = evaluate(ind, params)
+        scores = score_masks(masks, order)
+        change_pct = ind.change_pct()
+        
+        # None = 전부 충족, 범위 밖은 ValueError (API 모델에서 먼저 거름)
+        min_score = resolve_min_score(profile_id, min_score)
+        
+        selected = eligible & (scores >= min_score)
+        if include is not None:
+            selected &= include
+        
+        results = []
+        for i in np.flatnonzero(selected):
+            market_cap = float(panel.market_caps[i])
+            results.append(self._result_to_dict(ScreenerResult(
+                symbol=panel.symbols[i],
+                name=panel.names[i],
+                market=panel.markets[i],
+                size_class=get_size_class(market_cap),
+                close=float(panel.close[i, -1]),
+                change_pct=float(change_pct[i]),
+                volume=int(panel.volume[i, -1]),
+                market_cap=market_cap,
+                conditions_met=conditions_for(masks, order, i),
+                score=int(scores[i]),
+            )))
+        return results
+    
+    @staticmethod
+    def _result_to_dict(result: ScreenerResult) -> Dict[str, Any]:
+        """API 응답용 결과 변환"""
+        return {
+            "symbol": result.symbol,
+            "name": result.name,
+            "market": result.market,
+            "size_class": result.size_class,
+            "close": result.close,
+            "change_pct": round(result.change_pct, 2),
+            "volume": result.volume,
+            "market_cap": round(result.market_cap, 0),
+            "conditions_met": result.conditions_met,
+            "score": result.score,
+        }
+    
+    def select_candidates(self, stock_list: pd.DataFrame, profile_id: str, params: Dict[str, Any],
+                          max_stocks: int, min_score: Optional[int] = None,
+                          markets: Optional[List[str]] = None,
+                          size_classes: Optional[List[str]] = None) -> List[Tuple[str, str, str, float]]:
+        """
+        종목 리스트에서 검사 대상 (symbol, name, market, market_cap) 선정
+        마켓/규모 필터와 정적 조건(가격/시총)의 점수 상한을 일봉 수집 전에 벡터 마스크로 적용합니다.
+        """
+        return plan_universe(stock_list, profile_id, params, min_score, max_stocks, markets, size_classes)
+    
+    def fetch_as_completed(self, candidates: List[Tuple[str, str, str, float]],
+                           days: int = 30) -> Iterator[Tuple[Tuple[str, str, str, float], Optional[np.ndarray]]]:
+        """
+        종목 데이터를 스레드 풀로 동시에 가져오며, 끝나는 순서대로 반환
+        (동시 요청 수는 fetch_workers, 호스트별 속도 제한은 BarStore의 RateLimiter가 담당)
+        """
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix="screener-fetch")
+        try:
+            futures = {
+                executor.submit(self.get_stock_bars, cand[0], days): cand
+                for cand in candidates
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def iter_screen(self, profile_id: str, params: Dict[str, Any], min_score: Optional[int],
+                    candidates: List[Tuple[str, str, str, float]],
+                    stats: Optional[Dict[str, Any]] = None,
+                    batch_size: int = 64,
+                    flush_interval: float = 0.2) -> Iterator[List[Dict[str, Any]]]:
+        """
+        데이터가 도착하는 대로 작은 묶음(batch) 단위로 패널을 만들어 조건 평가
+        매 묶음마다 조건을 충족한 결과 목록을 yield 합니다.
+        
+        stats: 진행 상황/시간 측정값이 기록될 dict (checked, total, fetch_ms, compute_ms)
+        """
+        stats = stats if stats is not None else {}
+        window = PROFILE_WINDOWS.get(profile_id, 30)
+        stats.update({"total": len(candidates), "checked": 0, "fetch_ms": 0.0, "compute_ms": 0.0})
+        
+        buffer = []
+        last_flush = time.perf_counter()
+        
+        def flush():
+            t0 = time.perf_counter()
+            panel = UniversePanel.from_bars(buffer, window=window)
+            results = self.screen_panel(profile_id, panel, params, min_score)
+            stats["compute_ms"] += (time.perf_counter() - t0) * 1000
+            buffer.clear()
+            return results
+        
+        fetched = self.fetch_as_completed(candidates, days=window)
+        while True:
+            t0 = time.perf_counter()
+            try:
+                (symbol, name, market, market_cap), bars = next(fetched)
+            except StopIteration:
+                break
+            finally:
+                stats["fetch_ms"] += (time.perf_counter() - t0) * 1000
+            
+            stats["checked"] += 1
+            if bars is not None:
+                buffer.append((symbol, name, market, market_cap, bars))
+            
+            now = time.perf_counter()
+            if buffer and (len(buffer) >= batch_size or now - last_flush >= flush_interval):
+                last_flush = now
+                yield flush()
+        
+        if buffer:
+            yield flush()
+    
+    def resolve_params(self, profile_id: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """프로필 기본 파라미터 + 사용자 오버라이드 (알 수 없는 프로필이면 None)"""
         profile = self.profiles.get(profile_id)
         if not profile:
-            logger.error(f"Unknown profile: {profile_id}")
-            return []
+            return None
         
         # 기본 파라미터 구성
-        default_params = {c.name: c.value for c in profile.conditions}
+        resolved = {c.name: c.value for c in profile.conditions}
         
         # 사용자 파라미터로 오버라이드
         if params:
-            default_params.update(params)
+            resolved.update(params)
+        return resolved
+    
+    def prepare_screen(self, profile_id: str, params: Optional[Dict[str, Any]],
+                       max_stocks: int, min_score: Optional[int] = None,
+                       markets: Optional[List[str]] = None,
+                       size_classes: Optional[List[str]] = None) -> Optional[Tuple[Dict[str, Any], List[Tuple[str, str, str, float]]]]:
+        """파라미터 확정 + 검사 대상 선정 (실패 시 None)"""
+        # 프로필에서 기본 파라미터 가져오기
+        default_params = self.resolve_params(profile_id, params)
+        if default_params is None:
+            logger.error(f"Unknown profile: {profile_id}")
+            return None
         
         stock_list = self.get_stock_list()
         
         if stock_list.empty:
             logger.error("Failed to get stock list")
-            return []
+            return None
+        
+        candidates = self.select_candidates(stock_list, profile_id, default_params, max_stocks,
+                                            min_score, markets, size_classes)
+        return default_params, candidates
+    
+    def run_screen_timed(self, profile_id: str = "momentum_surge",
+                         params: Optional[Dict[str, Any]] = None,
+                         min_score: Optional[int] = None,
+                         max_stocks: int = 500,
+                         markets: Optional[List[str]] = None,
+                         size_classes: Optional[List[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        스크리닝 실행 (결과, 실행 통계) 반환
+        
+        실행 통계: checked/total 종목 수, fetch_ms(데이터 수집 대기), compute_ms(조건 평가)
+        """
+        if profile_id in PROFILE_CONDITIONS:
+            min_score = resolve_min_score(profile_id, min_score)
+        logger.info(f"Starting screener '{profile_id}' with min_score={min_score}, max_stocks={max_stocks}, markets={markets}, size_classes={size_classes}")
+        stats: Dict[str, Any] = {}
+        
+        prepared = self.prepare_screen(profile_id, params, max_stocks, min_score, markets, size_classes)
+        if prepared is None:
+            return [], stats
+        default_params, candidates = prepared
         
         results = []
-        checked = 0
+        for batch in self.iter_screen(profile_id, default_params, min_score, candidates, stats):
+            results.extend(batch)
         
-        # 가격/시총 필터용 파라미터
-        price_min = default_params.get("price_min", 3000)
-        price_max = default_params.get("price_max", 30000)
-        market_cap_min = default_params.get("market_cap_min", 1000)
+        # 점수 높은 순으로 정렬 (동점은 종목 리스트 순서)
+        order = {cand[0]: i for i, cand in enumerate(candidates)}
+        results.sort(key=lambda x: (-x["score"], -x["change_pct"], order[x["symbol"]]))
         
-        for _, row in stock_list.iterrows():
-            if checked >= max_stocks:
-                break
-            
-            symbol = row.get('Code', row.get('Symbol', ''))
-            name = row.get('Name', '')
-            market = row.get('Market', 'KOSPI')
-            
-            # 타입 변환 (문자열일 수 있음)
-            try:
-                market_cap_raw = row.get('Marcap', 0)
-                market_cap = float(market_cap_raw) / 100000000 if market_cap_raw else 0  # 원 -> 억
-            except (ValueError, TypeError):
-                market_cap = 0
-            
-            if not symbol or not name:
-                continue
-            
-            # 시가총액 필터
-            if market_cap < market_cap_min:
-                continue
-            
-            # 가격 필터 (종목 리스트에 Close가 있으면 사용)
-            try:
-                close_price = float(row.get('Close', 0))
-            except (ValueError, TypeError):
-                close_price = 0
-            
-            if close_price > 0 and (close_price < price_min or close_price > price_max):
-                continue
-            
-            checked += 1
-            
-            # 개별 종목 데이터 가져오기
-            df = self.get_stock_data(symbol)
-            
-            if df is None:
-                continue
-            
-            # 프로필에 따른 조건 체크
-            if profile_id == "momentum_surge":
-                result = self.check_momentum_surge(symbol, name, market, df, market_cap, default_params)
+        logger.info(
+            f"Screener completed. Checked {stats['checked']} stocks, found {len(results)} matches "
+            f"(fetch {stats['fetch_ms']:.0f}ms, compute {stats['compute_ms']:.0f}ms)"
+        )
+        
+        return results, stats
+    
+    def run_screens(self, specs: List[Dict[str, Any]],
+                    max_stocks: int = 500) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        여러 프로필/파라미터 조합을 한 번의 데이터 로드로 평가
+        
+        각 spec의 검사 대상을 합친 종목만 한 번 가져와 하나의 패널을 만들고,
+        spec마다 자기 프로필 window만큼의 꼬리 패널에서 조건 마스크를 계산합니다
+        (RSI 등 시작점에 따라 값이 달라지는 지표도 run_screen과 같은 구간에서 계산).
+        지표는 window가 같은 spec끼리 PanelIndicators로 공유하므로,
+        spec별 결과는 같은 조건으로 run_screen을 따로 실행한 결과와 같습니다.
+        
+        Args:
+            specs: [{"profile_id", "params", "min_score", "label", "markets", "size_classes"}] 목록
+            max_stocks: spec별 최대 검사 종목 수
+        
+        Returns:
+            (spec별 결과 목록, 실행 통계)
+        """
+        logger.info(f"Starting batch screener with {len(specs)} specs, max_stocks={max_stocks}")
+        stats: Dict[str, Any] = {"total": 0, "checked": 0, "fetch_ms": 0.0, "compute_ms": 0.0}
+        
+        stock_list = self.get_stock_list()
+        if stock_list.empty:
+            logger.error("Failed to get stock list")
+            return [], stats
+        
+        # spec별 파라미터와 검사 대상 구성 -> 전체 대상은 합집합
+        plans = []
+        universe: Dict[str, Tuple[str, str, str, float]] = {}
+        for i, spec in enumerate(specs):
+            profile_id = spec.get("profile_id") or "momentum_surge"
+            params = self.resolve_params(profile_id, spec.get("params"))
+            plan = {
+                "label": spec.get("label") or f"{profile_id}#{i + 1}",
+                "profile_id": profile_id,
+                "params": params,
+                "min_score": spec.get("min_score"),
+                "candidates": [],
+            }
+            if params is None:
+                logger.error(f"Unknown profile: {profile_id}")
+                plan["error"] = f"Unknown profile: {profile_id}"
             else:
-                # 다른 프로필은 아직 미구현
+                plan["min_score"] = resolve_min_score(profile_id, plan["min_score"])
+                plan["candidates"] = self.select_candidates(
+                    stock_list, profile_id, params, max_stocks, plan["min_score"],
+                    spec.get("markets"), spec.get("size_classes")
+                )
+                for cand in plan["candidates"]:
+                    universe.setdefault(cand[0], cand)
+            plans.append(plan)
+        
+        window = max([PROFILE_WINDOWS.get(p["profile_id"], 30) for p in plans if "error" not in p] or [30])
+        stats["total"] = len(universe)
+        
+        # 1회 데이터 로드
+        t0 = time.perf_counter()
+        loaded = {}
+        for (symbol, name, market, market_cap), bars in self.fetch_as_completed(list(universe.values()), days=window):
+            stats["checked"] += 1
+            if bars is not None:
+                loaded[symbol] = (symbol, name, market, market_cap, bars)
+        stats["fetch_ms"] = (time.perf_counter() - t0) * 1000
+        
+        # 1개 패널 -> 프로필 window별 꼬리 패널 + 공유 지표, spec별로 마스크만 평가
+        t0 = time.perf_counter()
+        rows = [loaded[symbol] for symbol in universe if symbol in loaded]
+        panel = UniversePanel.from_bars(rows, window=window)
+        indicators_by_window: Dict[int, PanelIndicators] = {}
+        index = {symbol: i for i, symbol in enumerate(panel.symbols)}
+        
+        outputs = []
+        for plan in plans:
+            output = {
+                "label": plan["label"],
+                "profile_id": plan["profile_id"],
+                "params": plan["params"],
+                "min_score": plan["min_score"],
+            }
+            if "error" in plan:
+                output.update({"error": plan["error"], "total_matches": 0, "results": []})
+                outputs.append(output)
                 continue
             
-            if result and result.score >= min_score:
-                results.append({
-                    "symbol": result.symbol,
-                    "name": result.name,
-                    "market": result.market,
-                    "close": result.close,
-                    "change_pct": round(result.change_pct, 2),
-                    "volume": result.volume,
-                    "market_cap": round(result.market_cap, 0),
-                    "conditions_met": result.conditions_met,
-                    "score": result.score,
-                })
-        
-        # 점수 높은 순으로 정렬
-        results.sort(key=lambda x: (-x["score"], -x["change_pct"]))
-        
-        logger.info(f"Screener completed. Checked {checked} stocks, found {len(results)} matches")
+            include = np.zeros(len(panel), dtype=bool)
+            order = {}
+            for rank, cand in enumerate(plan["candidates"]):
+                if cand[0] in index:
+                    include[index[cand[0]]] = True
+                    order[cand[0]] = rank
+            
+            profile_window = PROFILE_WINDOWS.get(plan["profile_id"], 30)
+            indicators = indicators_by_window.get(profile_window)
+            if indicators is None:
+                indicators = indicators_by_window[profile_window] = PanelIndicators(panel.tail(profile_window))
+            results = self.screen_panel(plan["profile_id"], indicators.panel, plan["params"], plan["min_score"],
+                                        indicators=indicators, include=include)
+            results.sort(key=lambda x: (-x["score"], -x["change_pct"], order[x["symbol"]]))
+            output.update({"checked": len(plan["candidates"]), "total_matches": len(results), "results": results})
+            outputs.append(output)
+        stats["compute_ms"] = (time.perf_counter() - t0) * 1000
+        
+        logger.info(
+            f"Batch screener completed. Loaded {len(rows)}/{len(universe)} stocks once for {len(specs)} specs "
+            f"(fetch {stats['fetch_ms']:.0f}ms, compute {stats['compute_ms']:.0f}ms)"
+        )
+        
+        return outputs, stats
+    
+    def incremental(self, params: Optional[Dict[str, Any]] = None, min_score: int = 10,
+                    max_stocks: int = 500) -> "IncrementalScreener":
+        """
+        장중 증분 스크리너 생성 (momentum_surge)
+        검사 대상 종목의 일봉으로 롤링 상태를 초기화하고 1회 채점한 뒤 반환합니다.
+        이후에는 update_tick/update_bar + refresh()로 변경된 종목만 재채점합니다.
+        """
+        from strategies.screener_live import IncrementalScreener
         
+        resolved = self.resolve_params("momentum_surge", params)
+        live = IncrementalScreener(resolved, min_score)
+        
+        stock_list = self.get_stock_list()
+        if stock_list.empty:
+            logger.error("Failed to get stock list")
+            return live
+        
+        candidates = self.select_candidates(stock_list, "momentum_surge", resolved, max_stocks, min_score)
+        for (symbol, name, market, market_cap), bars in self.fetch_as_completed(candidates, days=30):
+            if bars is not None:
+                live.seed(symbol, name, market, market_cap, bars)
+        live.refresh()
+        
+        logger.info(f"Incremental screener ready: {len(live.symbols)} symbols, {len(live.results())} matches")
+        return live
+    
+    def run_screen(self, profile_id: str = "momentum_surge", 
+                   params: Optional[Dict[str, Any]] = None,
+                   min_score: Optional[int] = None, 
+                   max_stocks: int = 500,
+                   markets: Optional[List[str]] = None,
+                   size_classes: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        스크리닝 실행
+        
+        Args:
+            profile_id: 스크리너 프로필 ID
+            params: 파라미터 오버라이드 (없으면 기본값 사용)
+            min_score: 최소 충족 조건 수 (None이면 전부 충족)
+            max_stocks: 최대 검사 종목 수
+            markets: 마켓 필터 (["KOSPI", "KOSDAQ"] 등)
+            size_classes: 규모 필터 (["large", "mid", "small"] 등)
+        """
+        results, _ = self.run_screen_timed(profile_id, params, min_score, max_stocks, markets, size_classes)
         return results
     
     def get_conditions_info(self, profile_id: str = "momentum_surge") -> List[Dict[str, Any]]:
@@ -439,16 +713,21 @@ def get_screener() -> StockScreener:
 async def run_custom_screen(
     profile_id: str = "momentum_surge",
     params: Optional[Dict[str, Any]] = None,
-    min_score: int = 10, 
-    max_stocks: int = 500
+    min_score: Optional[int] = None, 
+    max_stocks: int = 500,
+    markets: Optional[List[str]] = None,
+    size_classes: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """스크리너 실행 (API용)"""
     screener = get_screener()
-    results = screener.run_screen(
-        profile_id=profile_id, 
+    results, stats = await asyncio.to_thread(
+        screener.run_screen_timed,
+        profile_id=profile_id,
         params=params,
-        min_score=min_score, 
-        max_stocks=max_stocks
+        min_score=min_score,
+        max_stocks=max_stocks,
+        markets=markets,
+        size_classes=size_classes
     )
     
     profile = screener.get_profile(profile_id)
@@ -457,12 +736,112 @@ async def run_custom_screen(
         "timestamp": datetime.now().isoformat(),
         "profile": profile,
         "conditions": screener.get_conditions_info(profile_id),
-        "min_score": min_score,
+        "min_score": resolve_min_score(profile_id, min_score) if profile_id in PROFILE_CONDITIONS else min_score,
         "total_matches": len(results),
+        "checked": stats.get("checked", 0),
+        "timings": {
+            "fetch_ms": round(stats.get("fetch_ms", 0.0), 1),
+            "compute_ms": round(stats.get("compute_ms", 0.0), 1),
+        },
         "results": results
     }
 
 
+async def run_custom_screens(
+    specs: List[Dict[str, Any]],
+    max_stocks: int = 500
+) -> Dict[str, Any]:
+    """여러 스크리너 조합을 한 번의 데이터 로드로 실행 (API용)"""
+    screener = get_screener()
+    screens, stats = await asyncio.to_thread(screener.run_screens, specs, max_stocks)
+    
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "checked": stats.get("checked", 0),
+        "timings": {
+            "fetch_ms": round(stats.get("fetch_ms", 0.0), 1),
+            "compute_ms": round(stats.get("compute_ms", 0.0), 1),
+        },
+        "screens": screens
+    }
+
+
+async def stream_custom_screen(
+    profile_id: str = "momentum_surge",
+    params: Optional[Dict[str, Any]] = None,
+    min_score: Optional[int] = None,
+    max_stocks: int = 500,
+    markets: Optional[List[str]] = None,
+    size_classes: Optional[List[str]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    스크리너 실행 스트리밍 (API용)
+    min_score를 넘은 결과를 찾는 즉시 이벤트로 내보냅니다.
+    
+    이벤트 type: start(total) / result / progress(checked, total) / done(timings) / error
+    """
+    screener = get_screener()
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    _END = object()
+    
+    def emit(event):
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+    
+    def worker():
+        try:
+            prepared = screener.prepare_screen(profile_id, params, max_stocks, min_score, markets, size_classes)
+            if prepared is None:
+                emit({"type": "error", "detail": f"Failed to prepare screener '{profile_id}'"})
+                return
+            resolved, candidates = prepared
+            emit({"type": "start", "profile_id": profile_id,
+                  "min_score": resolve_min_score(profile_id, min_score), "total": len(candidates)})
+            
+            stats: Dict[str, Any] = {}
+            matches = 0
+            batches = screener.iter_screen(profile_id, resolved, min_score, candidates, stats,
+                                           batch_size=16, flush_interval=0.1)
+            try:
+                for batch in batches:
+                    if cancelled.is_set():
+                        return
+                    for result in batch:
+                        emit({"type": "result", "result": result})
+                    matches += len(batch)
+                    emit({"type": "progress", "checked": stats["checked"], "total": stats["total"]})
+            finally:
+                batches.close()
+            
+            emit({
+                "type": "done",
+                "checked": stats.get("checked", 0),
+                "total_matches": matches,
+                "timings": {
+                    "fetch_ms": round(stats.get("fetch_ms", 0.0), 1),
+                    "compute_ms": round(stats.get("compute_ms", 0.0), 1),
+                },
+            })
+        except Exception as e:
+            logger.error(f"Streaming screener error: {e}")
+            emit({"type": "error", "detail": str(e)})
+        finally:
+            emit(_END)
+    
+    task = loop.run_in_executor(None, worker)
+    try:
+        while True:
+            event = await queue.get()
+            if event is _END:
+                break
+            yield event
+    finally:
+        # 클라이언트 연결이 끊기면 남은 수집 작업 중단
+        cancelled.set()
+        await asyncio.shield(task)
+
+
 async def get_screener_profiles() -> List[Dict[str, Any]]:
     """스크리너 프로필 목록 반환 (API용)"""
     screener = get_screener()
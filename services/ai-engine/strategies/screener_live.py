@@ -0,0 +1,381 @@
+"""
+Incremental Screener - 장중 증분 스크리닝 (momentum_surge)
+종목별 롤링 상태(20일 거래량 합, MA5/MA20 합, 전일 종가)를 유지하면서
+새 체결/봉이 들어온 종목만 O(1)로 갱신하고 다시 채점합니다.
+"""
+
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set
+
+import numpy as np
+import websockets
+
+from collectors.account_state import parse_price
+from collectors.kiwoom_async import get_async_kiwoom
+from collectors.kiwoom_transport import default_ws_url
+from strategies.screener import (
+    ScreenerResult, StockScreener, get_screener, get_size_class, momentum_surge_conditions,
+)
+
+logger = logging.getLogger(__name__)
+
+WINDOW = 20       # 거래량/MA20 창
+MIN_BARS = 21     # check_momentum_surge와 같은 최소 봉 수
+
+# 실시간 체결(0B)을 모아 재채점하는 주기 (초)
+LIVE_REFRESH_SEC = float(os.getenv("LIVE_SCREENER_REFRESH_SEC", "1.0"))
+# 실시간 등록 그룹 (PositionMonitor는 "1"을 사용) / REG 1회당 종목 수
+LIVE_REAL_GROUP = "2"
+LIVE_REG_CHUNK = 100
+
+
+@dataclass
+class _SymbolState:
+    """종목별 롤링 상태 (마지막 원소가 당일 봉)"""
+    name: str
+    market: str
+    market_cap: float
+    date: int = 0                  # 당일 봉 날짜 (YYYYMMDD)
+    bar_count: int = 0             # 누적 봉 수 (최소 봉 수 판정용)
+    open: float = 0.0
+    high: float = 0.0
+    prev_close: float = 0.0
+    closes: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW))
+    volumes: Deque[float] = field(default_factory=lambda: deque(maxlen=WINDOW))
+    sum_close5: float = 0.0
+    sum_close20: float = 0.0
+    sum_volume20: float = 0.0
+
+    def resum(self):
+        """창 합계 재계산 (새 봉마다 1회, 부동소수 누적 오차 방지)"""
+        closes = list(self.closes)
+        self.sum_close5 = float(sum(closes[-5:]))
+        self.sum_close20 = float(sum(closes))
+        self.sum_volume20 = float(sum(self.volumes))
+
+    def roll(self, date: int, open_price: float, high: float, close: float, volume: float):
+        """새 봉 추가: 기존 당일 봉은 과거 봉이 됨"""
+        if self.closes:
+            self.prev_close = self.closes[-1]
+        self.closes.append(close)
+        self.volumes.append(volume)
+        self.date = date
+        self.open = open_price
+        self.high = high
+        self.bar_count += 1
+        self.resum()
+
+    def replace_last(self, open_price: float, high: float, close: float, volume: float):
+        """당일 봉 갱신: 창 합계는 차이만큼만 조정"""
+        delta_close = close - self.closes[-1]
+        self.sum_close20 += delta_close
+        self.sum_close5 += delta_close
+        self.sum_volume20 += volume - self.volumes[-1]
+        self.closes[-1] = close
+        self.volumes[-1] = volume
+        self.open = open_price
+        self.high = high
+
+    @property
+    def close(self) -> float:
+        return self.closes[-1]
+
+    @property
+    def volume(self) -> float:
+        return self.volumes[-1]
+
+    @property
+    def ma5(self) -> float:
+        return self.sum_close5 / min(5, len(self.closes))
+
+    @property
+    def ma20(self) -> float:
+        return self.sum_close20 / len(self.closes)
+
+    @property
+    def vol_20d_avg(self) -> float:
+        return self.sum_volume20 / len(self.volumes)
+
+
+@dataclass
+class ScreenDiff:
+    """갱신 전후 결과 차이"""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    updated: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.updated)
+
+
+class IncrementalScreener:
+    """momentum_surge 증분 스크리너 (변경된 종목만 재채점, 결과 diff를 구독자에게 전달)"""
+
+    def __init__(self, params: Dict[str, Any], min_score: int = 10):
+        self.params = params
+        self.min_score = min_score
+        self._states: Dict[str, _SymbolState] = {}
+        self._dirty: Set[str] = set()
+        self._matches: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[Callable[[ScreenDiff], None]] = []
+        self._lock = threading.Lock()
+
+    # ---- 상태 입력 ----
+
+    def seed(self, symbol: str, name: str, market: str, market_cap: float, bars: np.ndarray):
+        """과거 일봉(BarStore 구조화 배열)으로 종목 상태 초기화"""
+        state = _SymbolState(name=name, market=market, market_cap=market_cap)
+        for bar in bars[-(WINDOW + 1):]:
+            state.roll(int(bar["date"]), float(bar["open"]), float(bar["high"]),
+                       float(bar["close"]), float(bar["volume"]))
+        state.bar_count = len(bars)
+        with self._lock:
+            self._states[symbol] = state
+            self._dirty.add(symbol)
+
+    def update_bar(self, symbol: str, date: int, open_price: float, high: float,
+                   close: float, volume: float) -> bool:
+        """
+        봉 갱신 (date가 당일 봉과 같으면 교체, 더 최근이면 새 봉으로 추가)
+        값이 바뀐 경우에만 재채점 대상으로 표시합니다.
+        """
+        with self._lock:
+            return self._apply_bar(symbol, date, open_price, high, close, volume)
+
+    def update_tick(self, symbol: str, price: float, cum_volume: Optional[float], date: int,
+                    trade_volume: float = 0.0) -> bool:
+        """
+        실시간 체결 반영 (시가/고가는 자동 갱신)
+        cum_volume: 당일 누적 거래량, 없으면(None) 당일 거래량에 trade_volume(체결량)을 더함
+        """
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None:
+                return False
+            if date != state.date:
+                volume = cum_volume if cum_volume is not None else trade_volume
+                return self._apply_bar(symbol, date, price, price, price, volume)
+            volume = cum_volume if cum_volume is not None else state.volume + trade_volume
+            return self._apply_bar(symbol, date, state.open, max(state.high, price), price, volume)
+
+    def _apply_bar(self, symbol: str, date: int, open_price: float, high: float,
+                   close: float, volume: float) -> bool:
+        """update_bar/update_tick 공통 (self._lock을 잡은 상태에서 호출)"""
+        state = self._states.get(symbol)
+        if state is None or date < state.date:
+            return False
+        if date == state.date:
+            if (close == state.close and volume == state.volume
+                    and high == state.high and open_price == state.open):
+                return False
+            state.replace_last(open_price, high, close, volume)
+        else:
+            state.roll(date, open_price, high, close, volume)
+        self._dirty.add(symbol)
+        return True
+
+    # ---- 채점 / 결과 ----
+
+    def _score(self, symbol: str, state: _SymbolState) -> Optional[Dict[str, Any]]:
+        if state.bar_count < MIN_BARS or not state.closes:
+            return None
+        change_pct, conditions_met = momentum_surge_conditions(
+            state.close, state.open, state.high, state.volume, state.prev_close,
+            state.vol_20d_avg, state.ma5, state.ma20, state.market_cap, self.params
+        )
+        if len(conditions_met) < self.min_score:
+            return None
+        return StockScreener._result_to_dict(ScreenerResult(
+            symbol=symbol,
+            name=state.name,
+            market=state.market,
+            size_class=get_size_class(state.market_cap),
+            close=state.close,
+            change_pct=change_pct,
+            volume=int(state.volume),
+            market_cap=state.market_cap,
+            conditions_met=conditions_met,
+            score=len(conditions_met),
+        ))
+
+    def refresh(self) -> ScreenDiff:
+        """변경된 종목만 재채점하고 결과 diff 반환 (변경이 있으면 구독자에게도 전달)"""
+        diff = ScreenDiff()
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for symbol in dirty:
+                result = self._score(symbol, self._states[symbol])
+                previous = self._matches.get(symbol)
+                if result is None:
+                    if previous is not None:
+                        del self._matches[symbol]
+                        diff.removed.append(symbol)
+                elif previous is None:
+                    self._matches[symbol] = result
+                    diff.added.append(result)
+                elif result != previous:
+                    self._matches[symbol] = result
+                    diff.updated.append(result)
+            listeners = list(self._listeners)
+
+        if not diff.empty:
+            for listener in listeners:
+                try:
+                    listener(diff)
+                except Exception as e:
+                    logger.error(f"Screener listener error: {e}")
+        return diff
+
+    def results(self) -> List[Dict[str, Any]]:
+        """현재 조건 충족 종목 (점수 높은 순)"""
+        with self._lock:
+            results = list(self._matches.values())
+        results.sort(key=lambda x: (-x["score"], -x["change_pct"]))
+        return results
+
+    def subscribe(self, listener: Callable[[ScreenDiff], None]):
+        """결과 변경(추가/제거/갱신) 구독"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ScreenDiff], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._states)
+
+
+class LiveScreenerFeed:
+    """
+    IncrementalScreener를 키움 실시간 체결(0B)에 연결
+    - 초기화한 종목 전체를 0B로 등록하고, 틱마다 update_tick (10: 현재가, 13: 누적거래량, 15: 체결량)
+    - LIVE_REFRESH_SEC마다 refresh()로 바뀐 종목만 재채점 -> 구독자에게 diff 전달
+    """
+
+    def __init__(self, screener: IncrementalScreener):
+        self.screener = screener
+        self.kiwoom = get_async_kiwoom()
+        self.running = False
+        self.ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def on_tick(self, symbol: str, values: dict) -> bool:
+        price = parse_price(values.get('10'))
+        if price <= 0:
+            return False
+        cum_volume = parse_price(values.get('13')) if values.get('13') else None
+        self.ticks += 1
+        return self.screener.update_tick(symbol.replace('A', ''), price, cum_volume,
+                                         int(datetime.now().strftime("%Y%m%d")),
+                                         trade_volume=parse_price(values.get('15')))
+
+    async def _register(self, websocket, symbols: List[str]):
+        for i in range(0, len(symbols), LIVE_REG_CHUNK):
+            await websocket.send(json.dumps({
+                'trnm': 'REG',
+                'grp_no': LIVE_REAL_GROUP,
+                'refresh': '1',  # 앞 묶음 등록 유지
+                'data': [{'item': symbols[i:i + LIVE_REG_CHUNK], 'type': ['0B']}],
+            }))
+
+    async def _refresh_loop(self):
+        while self.running:
+            await asyncio.sleep(LIVE_REFRESH_SEC)
+            try:
+                self.screener.refresh()
+            except Exception as e:
+                logger.error(f"Live screener refresh error: {e}")
+
+    async def run(self):
+        self.running = True
+        refresh_task = asyncio.create_task(self._refresh_loop())
+        uri = default_ws_url(self.kiwoom.base_url)
+        try:
+            while self.running:
+                try:
+                    async with websockets.connect(uri) as websocket:
+                        token = await self.kiwoom._get_token()
+                        await websocket.send(json.dumps({'trnm': 'LOGIN', 'token': token}))
+
+                        async for message in websocket:
+                            data = json.loads(message)
+                            trnm = data.get('trnm')
+
+                            if trnm == 'LOGIN':
+                                if data.get('return_code') != 0:
+                                    logger.error(f"Live screener login failed: {data.get('return_msg')}")
+                                    break
+                                await self._register(websocket, self.screener.symbols)
+                                logger.info(f"Live screener registered {len(self.screener.symbols)} symbols on 0B")
+                            elif trnm == 'PING':
+                                await websocket.send(message)  # Echo PING
+                            elif trnm == 'REAL':
+                                for item in data.get('data', []):
+                                    if item.get('type') == '0B':
+                                        self.on_tick(item.get('item', ''), item.get('values', {}))
+                except websockets.ConnectionClosed:
+                    logger.warning("Live screener feed closed. Reconnecting in 5s...")
+                except Exception as e:
+                    logger.error(f"Live screener feed error: {e}")
+                if self.running:
+                    await asyncio.sleep(5)
+        finally:
+            refresh_task.cancel()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+
+
+# 싱글톤 (기본 조건 momentum_surge, 프로세스당 1개)
+_live_feed: Optional[LiveScreenerFeed] = None
+_live_lock = asyncio.Lock()
+
+async def get_live_screener(max_stocks: int = 500) -> LiveScreenerFeed:
+    """장중 증분 스크리너를 처음 요청 시 초기화하고 0B 피드를 시작"""
+    global _live_feed
+    async with _live_lock:
+        if _live_feed is None:
+            live = await asyncio.to_thread(get_screener().incremental, None, 10, max_stocks)
+            _live_feed = LiveScreenerFeed(live)
+            _live_feed.start()
+    return _live_feed
+
+
+async def stream_live_screen(max_stocks: int = 500) -> AsyncIterator[Dict[str, Any]]:
+    """
+    장중 증분 스크리너 스트리밍 (API용)
+    이벤트 type: snapshot(현재 결과 전체) 후 diff(added/removed/updated)
+    """
+    feed = await get_live_screener(max_stocks)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def listener(diff: ScreenDiff):
+        loop.call_soon_threadsafe(queue.put_nowait, diff)
+
+    feed.screener.subscribe(listener)
+    try:
+        yield {"type": "snapshot", "results": feed.screener.results()}
+        while True:
+            diff = await queue.get()
+            yield {"type": "diff", "added": diff.added, "removed": diff.removed, "updated": diff.updated}
+    finally:
+        feed.screener.unsubscribe(listener)
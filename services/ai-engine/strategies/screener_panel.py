@@ -0,0 +1,388 @@
+"""
+Universe Panel - 종목 × 일자 OHLCV 패널
+스크리너 조건을 종목별 루프 대신 NumPy 컬럼 연산으로 한 번에 평가합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class UniversePanel:
+    """종목 × 일자 패널 (최근 봉이 마지막 열에 오도록 오른쪽 정렬, 빈 칸은 NaN)"""
+    symbols: List[str]
+    names: List[str]
+    markets: List[str]
+    market_caps: np.ndarray  # 억 단위
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    lengths: np.ndarray  # 종목별 유효 봉 수
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def window(self) -> int:
+        return self.close.shape[1]
+
+    def tail(self, window: int) -> "UniversePanel":
+        """최근 window개 봉만 남긴 패널 (같은 window로 따로 만든 패널과 동일)"""
+        if window >= self.window:
+            return self
+        return UniversePanel(
+            symbols=self.symbols, names=self.names, markets=self.markets, market_caps=self.market_caps,
+            open=self.open[:, -window:], high=self.high[:, -window:], low=self.low[:, -window:],
+            close=self.close[:, -window:], volume=self.volume[:, -window:],
+            lengths=np.minimum(self.lengths, window),
+        )
+
+    @classmethod
+    def from_frames(cls, rows: List[Tuple[str, str, str, float, pd.DataFrame]],
+                    window: int) -> "UniversePanel":
+        """
+        (symbol, name, market, market_cap, df) 목록으로 패널 구성
+
+        df는 FinanceDataReader 형식 (Open/High/Low/Close/Volume 컬럼, 날짜 오름차순)
+        """
+        n = len(rows)
+        columns = {c: np.full((n, window), np.nan) for c in ("Open", "High", "Low", "Close", "Volume")}
+        lengths = np.zeros(n, dtype=np.int64)
+
+        for i, (_, _, _, _, df) in enumerate(rows):
+            tail = df.tail(window)
+            k = len(tail)
+            lengths[i] = k
+            if k == 0:
+                continue
+            for col, arr in columns.items():
+                arr[i, window - k:] = tail[col].to_numpy(dtype=np.float64)
+
+        return cls(
+            symbols=[r[0] for r in rows],
+            names=[r[1] for r in rows],
+            markets=[r[2] for r in rows],
+            market_caps=np.array([r[3] for r in rows], dtype=np.float64),
+            open=columns["Open"],
+            high=columns["High"],
+            low=columns["Low"],
+            close=columns["Close"],
+            volume=columns["Volume"],
+            lengths=lengths,
+        )
+
+    @classmethod
+    def from_bars(cls, rows: List[Tuple[str, str, str, float, np.ndarray]],
+                  window: int) -> "UniversePanel":
+        """
+        (symbol, name, market, market_cap, bars) 목록으로 패널 구성
+
+        bars는 BarStore 구조화 배열 (date/open/high/low/close/volume, 날짜 오름차순).
+        DataFrame을 거치지 않으므로 로컬 저장소 데이터는 이 경로가 훨씬 빠릅니다.
+        """
+        n = len(rows)
+        columns = {c: np.full((n, window), np.nan) for c in ("open", "high", "low", "close", "volume")}
+        lengths = np.zeros(n, dtype=np.int64)
+
+        for i, (_, _, _, _, bars) in enumerate(rows):
+            tail = bars[-window:]
+            k = len(tail)
+            lengths[i] = k
+            if k == 0:
+                continue
+            for col, arr in columns.items():
+                arr[i, window - k:] = tail[col]
+
+        return cls(
+            symbols=[r[0] for r in rows],
+            names=[r[1] for r in rows],
+            markets=[r[2] for r in rows],
+            market_caps=np.array([r[3] for r in rows], dtype=np.float64),
+            open=columns["open"],
+            high=columns["high"],
+            low=columns["low"],
+            close=columns["close"],
+            volume=columns["volume"],
+            lengths=lengths,
+        )
+
+
+def tail_mean(values: np.ndarray, n: int) -> np.ndarray:
+    """최근 n개 봉 평균 (pandas Series.tail(n).mean()과 동일하게 NaN 제외)"""
+    tail = values[:, -n:]
+    valid = ~np.isnan(tail)
+    total = np.where(valid, tail, 0.0).sum(axis=1)
+    count = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+class PanelIndicators:
+    """
+    패널 단위 지표 커널
+    각 지표는 패널당 한 번만 계산되어 캐시되고, 모든 프로필이 같은 값을 재사용합니다.
+    """
+
+    def __init__(self, panel: UniversePanel):
+        self.panel = panel
+        self._cache: Dict[Tuple, np.ndarray] = {}
+
+    def _cached(self, key: Tuple, compute) -> np.ndarray:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.panel.close[:, -1]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.panel.open[:, -1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.panel.high[:, -1]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.panel.volume[:, -1]
+
+    @property
+    def prev_close(self) -> np.ndarray:
+        return self.panel.close[:, -2]
+
+    def has_bars(self, n: int) -> np.ndarray:
+        """최소 n개 봉을 가진 종목"""
+        return self._cached(("has_bars", n), lambda: self.panel.lengths >= n)
+
+    def change_pct(self) -> np.ndarray:
+        """전일 종가 대비 등락률 (%)"""
+        def compute():
+            prev = self.prev_close
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(prev > 0, ((self.close - prev) / prev) * 100, 0.0)
+        return self._cached(("change_pct",), compute)
+
+    def ma(self, n: int) -> np.ndarray:
+        """종가 n일 이동평균"""
+        return self._cached(("ma", n), lambda: tail_mean(self.panel.close, n))
+
+    def volume_avg(self, n: int) -> np.ndarray:
+        """거래량 n일 평균 (당일 포함)"""
+        return self._cached(("volume_avg", n), lambda: tail_mean(self.panel.volume, n))
+
+    def volume_ratio(self, n: int = 20) -> np.ndarray:
+        """당일 거래량 / n일 평균 거래량"""
+        def compute():
+            avg = self.volume_avg(n)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(avg > 0, self.volume / np.where(avg > 0, avg, 1.0), np.nan)
+        return self._cached(("volume_ratio", n), compute)
+
+    def prior_high(self, n: int = 252) -> np.ndarray:
+        """당일을 제외한 직전 n개 봉의 최고가"""
+        def compute():
+            prior = self.panel.high[:, -(n + 1):-1]
+            with np.errstate(invalid="ignore"):
+                filled = np.where(np.isnan(prior), -np.inf, prior).max(axis=1)
+            return np.where(np.isfinite(filled), filled, np.nan)
+        return self._cached(("prior_high", n), compute)
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """
+        Wilder RSI 최신값 (ChartAnalyst와 동일: ewm(com=period-1, adjust=False, min_periods=period))
+        시간축으로만 순회하고 종목축은 벡터 연산합니다.
+        """
+        def compute():
+            close = self.panel.close
+            n, w = close.shape
+            alpha = 1.0 / period
+            starts = w - self.panel.lengths
+            avg_gain = np.full(n, np.nan)
+            avg_loss = np.full(n, np.nan)
+            for t in range(w):
+                active = t >= starts
+                if t > 0:
+                    delta = close[:, t] - close[:, t - 1]
+                else:
+                    delta = np.full(n, np.nan)
+                with np.errstate(invalid="ignore"):
+                    gain = np.where(delta > 0, delta, 0.0)
+                    loss = np.where(delta < 0, -delta, 0.0)
+                first = active & np.isnan(avg_gain)
+                step = active & ~first
+                avg_gain = np.where(first, gain, np.where(step, (1 - alpha) * avg_gain + alpha * gain, avg_gain))
+                avg_loss = np.where(first, loss, np.where(step, (1 - alpha) * avg_loss + alpha * loss, avg_loss))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rs = avg_gain / avg_loss
+                rsi = 100 - (100 / (1 + rs))
+            return np.where(self.panel.lengths >= period, rsi, np.nan)
+        return self._cached(("rsi", period), compute)
+
+
+# 프로필별 점수 조건 이름 (conditions_met 순서)
+# momentum_surge는 check_momentum_surge의 conditions_met 순서와 동일
+MOMENTUM_SURGE_CONDITIONS = [
+    "change_range",
+    "not_upper_limit",
+    "volume_min",
+    "volume_max",
+    "bullish_candle",
+    "upper_wick",
+    "above_ma5",
+    "ma5_above_ma20",
+    "price_range",
+    "market_cap",
+]
+
+VALUE_BOUNCE_CONDITIONS = [
+    "rsi_oversold",
+    "below_ma20",
+    "volume_surge",
+]
+
+BREAKOUT_CONDITIONS = [
+    "new_high_52w",
+    "volume_min",
+]
+
+PROFILE_CONDITIONS: Dict[str, List[str]] = {
+    "momentum_surge": MOMENTUM_SURGE_CONDITIONS,
+    "value_bounce": VALUE_BOUNCE_CONDITIONS,
+    "breakout": BREAKOUT_CONDITIONS,
+}
+
+# 프로필별 필요 봉 수 (패널 window)
+PROFILE_WINDOWS: Dict[str, int] = {
+    "momentum_surge": 30,
+    "value_bounce": 60,   # RSI(14) 안정화 구간 포함
+    "breakout": 253,      # 52주(252 거래일) + 당일
+}
+
+# 52주 신고가로 인정할 최소 직전 봉 수 (252봉 중 거래정지 등으로 빠진 날 약간 허용)
+BREAKOUT_MIN_PRIOR_BARS = 240
+
+
+def resolve_min_score(profile_id: str, min_score: Optional[int]) -> int:
+    """
+    min_score 확정: None이면 프로필 조건 전부 충족, 범위(1~조건 수) 밖이면 ValueError
+    """
+    n = len(PROFILE_CONDITIONS.get(profile_id, []))
+    if min_score is None:
+        return n
+    if not 1 <= min_score <= n:
+        raise ValueError(f"min_score for '{profile_id}' must be between 1 and {n} (got {min_score})")
+    return min_score
+
+
+def evaluate_momentum_surge(ind: PanelIndicators,
+                            params: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    모멘텀 급등 10개 조건을 패널 전체에 대해 한 번에 평가
+
+    Returns:
+        (eligible, masks)
+        eligible: 최소 21일 데이터를 가진 종목
+        masks: 조건 이름 -> bool 배열
+    """
+    change_min = params.get("change_min", 3.0)
+    change_max = params.get("change_max", 10.0)
+    volume_min_ratio = params.get("volume_min_ratio", 1.5)
+    volume_max_ratio = params.get("volume_max_ratio", 3.0)
+    upper_wick_pct = params.get("upper_wick_pct", 1.0)
+    price_min = params.get("price_min", 3000)
+    price_max = params.get("price_max", 30000)
+    market_cap_min = params.get("market_cap_min", 1000)
+
+    eligible = ind.has_bars(21)
+
+    close = ind.close
+    high = ind.high
+    volume = ind.volume
+    change_pct = ind.change_pct()
+    vol_20d_avg = ind.volume_avg(20)
+    ma5 = ind.ma(5)
+    ma20 = ind.ma(20)
+    upper_limit = ind.prev_close * 1.30
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        wick = np.where(high > 0, (high - close) / np.where(high > 0, high, 1.0), -np.inf)
+
+    masks = {
+        "change_range": (change_min <= change_pct) & (change_pct <= change_max),
+        "not_upper_limit": (close < upper_limit) & bool(params.get("not_upper_limit", True)),
+        "volume_min": volume >= vol_20d_avg * volume_min_ratio,
+        "volume_max": volume <= vol_20d_avg * volume_max_ratio,
+        "bullish_candle": (close >= ind.open) & bool(params.get("bullish_candle", True)),
+        "upper_wick": (high > 0) & (wick >= (upper_wick_pct / 100)),
+        "above_ma5": (close > ma5) & bool(params.get("above_ma5", True)),
+        "ma5_above_ma20": (ma5 > ma20) & bool(params.get("ma5_above_ma20", True)),
+        "price_range": (price_min <= close) & (close <= price_max),
+        "market_cap": ind.panel.market_caps >= market_cap_min,
+    }
+    masks = {name: m & eligible for name, m in masks.items()}
+
+    return eligible, masks
+
+
+def evaluate_value_bounce(ind: PanelIndicators,
+                          params: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """가치 반등: RSI 과매도 + 20일선 아래 + 거래량 급증"""
+    rsi_max = params.get("rsi_max", 30)
+    volume_surge = params.get("volume_surge", 2.0)
+
+    eligible = ind.has_bars(20)
+    rsi = ind.rsi(14)
+
+    masks = {
+        "rsi_oversold": ~np.isnan(rsi) & (rsi <= rsi_max),
+        "below_ma20": (ind.close < ind.ma(20)) & bool(params.get("below_ma20", True)),
+        "volume_surge": ind.volume >= ind.volume_avg(20) * volume_surge,
+    }
+    masks = {name: m & eligible for name, m in masks.items()}
+
+    return eligible, masks
+
+
+def evaluate_breakout(ind: PanelIndicators,
+                      params: Dict[str, Any]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    신고가 돌파: 직전 52주 최고가 돌파 + 거래량 증가
+    직전 봉이 BREAKOUT_MIN_PRIOR_BARS개 이상인 종목만 대상 (신규 상장주의 "상장 후 최고가" 제외)
+    """
+    volume_min_ratio = params.get("volume_min_ratio", 2.0)
+
+    eligible = ind.has_bars(BREAKOUT_MIN_PRIOR_BARS + 1)
+    prior_high = ind.prior_high(252)
+
+    masks = {
+        "new_high_52w": ~np.isnan(prior_high) & (ind.close > prior_high) & bool(params.get("new_high_52w", True)),
+        "volume_min": ind.volume >= ind.volume_avg(20) * volume_min_ratio,
+    }
+    masks = {name: m & eligible for name, m in masks.items()}
+
+    return eligible, masks
+
+
+PROFILE_EVALUATORS = {
+    "momentum_surge": evaluate_momentum_surge,
+    "value_bounce": evaluate_value_bounce,
+    "breakout": evaluate_breakout,
+}
+
+
+def score_masks(masks: Dict[str, np.ndarray], order: List[str]) -> np.ndarray:
+    """조건 마스크 합계 = 종목별 점수"""
+    if not order:
+        return np.zeros(0, dtype=np.int64)
+    return np.sum([masks[name] for name in order], axis=0, dtype=np.int64)
+
+
+def conditions_for(masks: Dict[str, np.ndarray], order: List[str], i: int) -> List[str]:
+    """i번째 종목이 충족한 조건 이름 목록"""
+    return [name for name in order if masks[name][i]]
@@ -0,0 +1,110 @@
+"""
+Screener Filter Planner - 종목 리스트 단계 사전 필터 (pushdown)
+일봉을 가져오기 전에 종목 리스트(get_stock_list) 컬럼만으로 판정 가능한 조건을
+벡터 마스크로 계산해, 검사할 필요가 없는 종목을 미리 제외합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from strategies.screener_panel import PROFILE_CONDITIONS, resolve_min_score
+
+
+def listing_columns(stock_list: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """종목 리스트 -> 정규화된 컬럼 배열 (symbol, name, market, market_cap(억), close)"""
+    n = len(stock_list)
+
+    def column(*names, default=""):
+        for name in names:
+            if name in stock_list.columns:
+                return stock_list[name]
+        return pd.Series([default] * n, index=stock_list.index)
+
+    def numeric(name):
+        if name not in stock_list.columns:
+            return np.zeros(n)
+        return pd.to_numeric(stock_list[name], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+
+    symbols = column("Code", "Symbol").fillna("").astype(str).to_numpy()
+    names = column("Name").fillna("").astype(str).to_numpy()
+    markets = column("Market", default="KOSPI").fillna("KOSPI").astype(str).to_numpy()
+
+    return {
+        "symbol": symbols,
+        "name": names,
+        "market": markets,
+        "market_cap": numeric("Marcap") / 100000000,  # 원 -> 억
+        "close": numeric("Close"),
+    }
+
+
+def size_classes_of(market_cap: np.ndarray) -> np.ndarray:
+    """get_size_class의 벡터 버전 (억 단위)"""
+    return np.select([market_cap >= 10000, market_cap >= 3000], ["large", "mid"], "small")
+
+
+# 프로필별 정적 조건: 종목 리스트 컬럼만으로 판정 가능한 점수 조건
+# (conditions, params) -> (통과 마스크, 판정 가능 마스크)
+StaticCheck = Callable[[Dict[str, np.ndarray], Dict[str, Any]], Tuple[np.ndarray, np.ndarray]]
+
+
+def _market_cap_check(cols: Dict[str, np.ndarray], params: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    passed = cols["market_cap"] >= params.get("market_cap_min", 1000)
+    return passed, np.ones(len(passed), dtype=bool)
+
+
+def _price_range_check(cols: Dict[str, np.ndarray], params: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    close = cols["close"]
+    passed = (params.get("price_min", 3000) <= close) & (close <= params.get("price_max", 30000))
+    # 종목 리스트에 종가가 없으면 일봉을 보기 전까지 판정 불가
+    return passed, close > 0
+
+
+PROFILE_STATIC_CONDITIONS: Dict[str, Dict[str, StaticCheck]] = {
+    "momentum_surge": {
+        "market_cap": _market_cap_check,
+        "price_range": _price_range_check,
+    },
+}
+
+
+def plan_universe(stock_list: pd.DataFrame, profile_id: str, params: Dict[str, Any],
+                  min_score: Optional[int], max_stocks: int,
+                  markets: Optional[List[str]] = None,
+                  size_classes: Optional[List[str]] = None) -> List[Tuple[str, str, str, float]]:
+    """
+    검사 대상 (symbol, name, market, market_cap) 목록 계산
+
+    1. 마켓/규모 필터 (markets, size_classes)
+    2. 정적 조건으로 점수 상한 계산: 상한 = 전체 조건 수 - 확실히 실패한 정적 조건 수
+       상한이 min_score에 못 미치는 종목은 일봉을 보기 전에 제외
+    3. 종목 리스트 순서대로 최대 max_stocks개
+    """
+    if stock_list is None or stock_list.empty:
+        return []
+
+    cols = listing_columns(stock_list)
+    keep = (cols["symbol"] != "") & (cols["name"] != "")
+
+    if markets:
+        keep &= np.isin(np.char.upper(cols["market"].astype(str)), [m.upper() for m in markets])
+
+    if size_classes:
+        keep &= np.isin(size_classes_of(cols["market_cap"]), [c.lower() for c in size_classes])
+
+    order = PROFILE_CONDITIONS.get(profile_id, [])
+    static = PROFILE_STATIC_CONDITIONS.get(profile_id, {})
+    if order and static:
+        failed = np.zeros(len(stock_list), dtype=np.int64)
+        for check in static.values():
+            passed, known = check(cols, params)
+            failed += known & ~passed
+        upper_bound = len(order) - failed
+        keep &= upper_bound >= resolve_min_score(profile_id, min_score)
+
+    idx = np.flatnonzero(keep)[:max_stocks]
+    return [
+        (cols["symbol"][i], cols["name"][i], cols["market"][i], float(cols["market_cap"][i]))
+        for i in idx
+    ]
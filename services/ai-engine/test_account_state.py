@@ -0,0 +1,199 @@
+import sys
+import os
+import asyncio
+import threading
+
+# Add current directory to path so we can import collectors
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from collectors.account_state import REFRESH_ATTEMPTS, AccountState
+from strategies.exit_executor import ExitResult
+from strategies.position_monitor import PositionMonitor
+
+
+class FakeKiwoom:
+    """
+    kt00004/kt00001 stand-in; set `gate` to hold the next fetch_holdings until it is released.
+    The held read returns the rows as they were when it started unless `read_late` is set.
+    """
+
+    def __init__(self, cash=1_000_000):
+        self.rows = []
+        self.cash = cash
+        self.gate = None
+        self.read_late = False
+        self.reads = 0
+        self.fetching = threading.Event()
+
+    def fetch_holdings(self, account_no):
+        self.reads += 1
+        rows = [dict(r) for r in self.rows]
+        gate, self.gate = self.gate, None
+        self.fetching.set()
+        if gate is not None:
+            gate.wait(5)
+            if self.read_late:
+                rows = [dict(r) for r in self.rows]
+        return rows
+
+    def fetch_balance(self, account_no):
+        return self.cash
+
+    def hold(self, symbol, qty, avg):
+        self.rows = [r for r in self.rows if r["stk_cd"] != f"A{symbol}"]
+        if qty:
+            self.rows.append({"stk_cd": f"A{symbol}", "stk_nm": symbol, "rmnd_qty": str(qty),
+                              "avg_prc": str(avg), "cur_prc": str(avg)})
+
+
+def make_state(cash=1_000_000):
+    kiwoom = FakeKiwoom(cash)
+    state = AccountState("test", kiwoom=kiwoom)
+    state.refresh()
+    return state, kiwoom
+
+
+def refresh_during(state, kiwoom, action, read_late=False):
+    """Run action() while refresh() is reading the broker"""
+    gate = threading.Event()
+    kiwoom.gate, kiwoom.fetching, kiwoom.read_late = gate, threading.Event(), read_late
+    kiwoom.reads = 0
+    thread = threading.Thread(target=state.refresh)
+    thread.start()
+    kiwoom.fetching.wait(5)
+    action()
+    gate.set()
+    thread.join(5)
+
+
+def buy_at_broker_and_locally(state, kiwoom):
+    kiwoom.hold("005930", 10, 70000)
+    kiwoom.cash = 300_000
+    state.apply_fill("005930", "buy", 10, 70000, "삼성전자")
+
+
+def test_fill_during_refresh_is_read_again():
+    state, kiwoom = make_state()
+    # kt00004 was read before the fill, kt00001 after it: neither half is trusted
+    refresh_during(state, kiwoom, lambda: buy_at_broker_and_locally(state, kiwoom))
+    assert kiwoom.reads == 2
+    assert state.holdings["005930"].qty == 10
+    assert state.cash == 300_000
+
+
+def test_fill_already_in_broker_data_is_not_applied_twice():
+    state, kiwoom = make_state()
+    # the fill lands after the refresh started but before kt00004 answers, which includes it
+    refresh_during(state, kiwoom, lambda: buy_at_broker_and_locally(state, kiwoom), read_late=True)
+    assert state.holdings["005930"].qty == 10
+    assert state.cash == 300_000
+
+
+def test_sell_during_refresh_is_read_again():
+    state, kiwoom = make_state()
+    kiwoom.hold("000660", 5, 100000)
+    state.refresh()
+    removed = []
+    state.add_listener(lambda added, gone: removed.extend(gone))
+
+    def sell():
+        kiwoom.hold("000660", 0, 0)
+        kiwoom.cash += 550_000
+        state.apply_fill("000660", "sell", 5, 110000)
+    refresh_during(state, kiwoom, sell)
+    assert "000660" not in state.holdings
+    assert state.cash == 1_000_000 + 550_000
+    assert removed == ["000660"]
+
+
+def test_refresh_gives_up_while_orders_keep_landing():
+    state, kiwoom = make_state()
+    fetch = kiwoom.fetch_holdings
+
+    def busy_fetch(account_no):
+        state.apply_fill("005930", "buy", 1, 70000, "삼성전자")
+        return fetch(account_no)
+    kiwoom.fetch_holdings = busy_fetch
+    try:
+        state.refresh()
+        assert False, "refresh should raise"
+    except RuntimeError:
+        pass
+    # the state built from our own fills is kept
+    assert state.holdings["005930"].qty == REFRESH_ATTEMPTS
+    assert state.cash == 1_000_000 - REFRESH_ATTEMPTS * 70000
+
+
+def test_limit_buy_stays_pending_until_listed():
+    state, kiwoom = make_state()
+    state.add_pending_buy("035420", 3, 200000, "NAVER")
+    snap = state.snapshot()
+    assert "035420" not in snap.holdings and "035420" in snap.pending
+    assert snap.cash == 1_000_000 - 600_000
+
+    # still open at the broker (ord_alow_amt already excludes it)
+    kiwoom.cash = 400_000
+    state.refresh()
+    assert "035420" in state.pending and "035420" not in state.holdings and state.cash == 400_000
+
+    kiwoom.hold("035420", 3, 200000)
+    state.refresh()
+    assert "035420" in state.holdings and not state.pending
+
+
+def test_reserved_cash_is_shared_between_buys():
+    state, _ = make_state(1_000_000)
+    assert state.reserve_cash("A", 0.5) == 500_000
+    assert state.reserve_cash("B", 0.5) == 250_000
+    state.apply_fill("A", "buy", 1, 480_000, "A")   # fill takes the cash and drops A's reservation
+    assert state.reserve_cash("C", 1.0) == 1_000_000 - 480_000 - 250_000
+    state.release_cash("B")
+    state.release_cash("C")
+    assert state.reserve_cash("D", 1.0) == 520_000
+
+
+class FakeExits:
+    def __init__(self):
+        self.orders = []
+
+    async def execute(self, orders, title, attempts=1):
+        self.orders.extend(orders)
+        return [ExitResult(order=order, success=True) for order in orders]
+
+
+def test_reconcile_uses_broker_price_while_feed_stalled():
+    state, kiwoom = make_state()
+    kiwoom.hold("005930", 10, 70000)
+    state.refresh()
+    state.update_price("005930", 70500)   # last tick before the feed stalls
+
+    monitor = PositionMonitor("test")
+    monitor.account, monitor.exits = state, FakeExits()
+    kiwoom.rows[0]["cur_prc"] = "-63000"   # -10%: only kt00004 sees the drop
+
+    async def reconcile():
+        await monitor.reconcile()
+        await asyncio.sleep(0)   # let the batched exit flush
+        await asyncio.sleep(0)
+    asyncio.run(reconcile())
+    assert state.holdings["005930"].last_price == 63000
+    assert [order.symbol for order in monitor.exits.orders] == ["005930"]
+
+    # a tick newer than the read keeps its price
+    kiwoom.rows[0]["cur_prc"] = "60000"
+    fetch = kiwoom.fetch_holdings
+
+    def tick_during_read(account_no):
+        rows = fetch(account_no)
+        state.update_price("005930", 64000)
+        return rows
+    kiwoom.fetch_holdings = tick_during_read
+    state.refresh()
+    assert state.holdings["005930"].last_price == 64000
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
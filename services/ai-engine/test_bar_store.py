@@ -0,0 +1,115 @@
+import sys
+import os
+import asyncio
+import tempfile
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path so we can import collectors
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import collectors.bar_store as bar_store
+from collectors.bar_store import BAR_DTYPE, BarSource, BarStore, last_session_close
+from strategies.chart_analyst import ChartAnalyst
+
+# 뉴욕 (UTC-4, 2026년 10월 서머타임): 한국보다 13시간 늦음
+NEW_YORK = timezone(timedelta(hours=-4))
+
+
+def offline_store(root):
+    """네트워크 없이 쓰는 저장소 (다운로더 호출 시 실패)"""
+    def fetch(symbol, start, end):
+        raise AssertionError("offline")
+    return BarStore(root, source=BarSource("offline", fetch))
+
+
+def one_bar(day):
+    bars = np.zeros(1, dtype=BAR_DTYPE)
+    bars["date"] = day
+    bars["close"] = 100.0
+    return bars
+
+
+def weekday_bars(days, end="2026-10-19"):
+    """end(포함)까지 평일 days개 봉"""
+    dates = np.busday_offset(end, -np.arange(days)[::-1], roll="backward")
+    bars = np.zeros(days, dtype=BAR_DTYPE)
+    bars["date"] = [int(str(d).replace("-", "")) for d in dates]
+    bars["close"] = np.arange(days) + 100.0
+    return bars
+
+
+class FakeKiwoom:
+    def __init__(self, today):
+        self.today = today
+        self.calls = []
+
+    async def get_price_history(self, symbol, interval="D", count=60):
+        self.calls.append(count)
+        return pd.DataFrame({"date": [self.today], "open": [200], "high": [210], "low": [190],
+                             "close": [205], "volume": [1000]})
+
+
+def test_session_clock_is_kst_whatever_the_host_timezone():
+    # 한국 금 16:00 = 뉴욕 금 03:00 (뉴욕 시계로는 아직 목요일 장 마감 이후)
+    now = datetime(2026, 10, 16, 3, 0, tzinfo=NEW_YORK)
+    assert last_session_close(now) == datetime(2026, 10, 16, 15, 30)
+    # 한국 월 10:00 = 뉴욕 일 21:00
+    assert last_session_close(datetime(2026, 10, 18, 21, 0, tzinfo=NEW_YORK)) == datetime(2026, 10, 16, 15, 30)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = offline_store(root)
+        # 한국 금 15:00 (장중)에 받은 당일 봉 = 뉴욕 금 02:00
+        store.write("005930", one_bar(20261016), now=datetime(2026, 10, 16, 2, 0, tzinfo=NEW_YORK))
+        assert store.read_meta("005930")["partial"] == 20261016
+        assert store.is_fresh("005930", now=datetime(2026, 10, 16, 2, 0, 30, tzinfo=NEW_YORK))
+        assert not store.is_fresh("005930", now=datetime(2026, 10, 16, 2, 5, tzinfo=NEW_YORK))
+
+        # 한국 금 16:00 (장 마감 후)에 받은 봉은 완성 봉: 다음 장 마감까지 최신
+        store.write("005930", one_bar(20261016), now=now)
+        assert "partial" not in store.read_meta("005930")
+        assert store.is_fresh("005930", now=datetime(2026, 10, 19, 1, 0, tzinfo=NEW_YORK))      # 한국 월 14:00
+        assert not store.is_fresh("005930", now=datetime(2026, 10, 19, 3, 0, tzinfo=NEW_YORK))  # 한국 월 16:00
+
+
+def test_intraday_freshness_needs_todays_bar():
+    with tempfile.TemporaryDirectory() as root:
+        store = offline_store(root)
+        store.write("005930", weekday_bars(30), now=datetime(2026, 10, 19, 16, 0))   # 월 장 마감 후
+        tuesday = datetime(2026, 10, 20, 10, 0)
+        assert store.is_fresh("005930", now=tuesday)
+        assert not store.is_fresh("005930", now=tuesday, intraday=True)
+        assert store.is_fresh("005930", now=datetime(2026, 10, 20, 8, 0), intraday=True)   # 장 시작 전
+
+
+def test_chart_analyst_appends_todays_bar_during_session():
+    clock = [datetime(2026, 10, 20, 10, 0)]   # 화 장중 (KST)
+    kst_now = bar_store.kst_now
+    bar_store.kst_now = lambda now=None: kst_now(now or clock[0])
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            analyst = ChartAnalyst.__new__(ChartAnalyst)
+            analyst.bars = offline_store(root)
+            analyst.kiwoom = FakeKiwoom("20261020")
+            analyst.bars.write("005930", weekday_bars(30), now=datetime(2026, 10, 19, 16, 0))
+
+            df = asyncio.run(analyst._get_daily_history("005930", 20))
+            assert analyst.kiwoom.calls == [1]   # 전체가 아니라 당일 봉만
+            assert len(df) == 20 and list(df["date"][-2:]) == ["20261019", "20261020"]
+            assert df["close"].iloc[-1] == 205
+
+            # 저장된 당일 봉은 INTRADAY_TTL 동안 그대로 사용
+            clock[0] += timedelta(seconds=10)
+            df = asyncio.run(analyst._get_daily_history("005930", 20))
+            assert analyst.kiwoom.calls == [1] and df["date"].iloc[-1] == "20261020"
+    finally:
+        bar_store.kst_now = kst_now
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,226 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+# Add current directory to path so we can import collectors
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from collectors.kiwoom import (
+    KiwoomCollector, continuation_headers, history_complete, merge_pages, next_page_key,
+)
+from collectors.kiwoom_cache import INTRADAY_BAR_TTL, ResponseCache, Uncached, until_next_session
+
+
+def chart_page(days):
+    """One parsed chart page (parse_price_history output, oldest first)"""
+    return pd.DataFrame({
+        "date": [d.strftime("%Y%m%d") for d in days],
+        "close": [d.toordinal() % 1000 for d in days],
+    })
+
+
+def trading_days(n, end=date(2026, 10, 16)):
+    days, d = [], end
+    while len(days) < n:
+        if d.weekday() < 5:
+            days.append(d)
+        d -= timedelta(days=1)
+    return days[::-1]
+
+
+def test_merge_pages_orders_dedupes_and_trims():
+    days = trading_days(30)
+    # newest page first, the boundary day repeated on both pages
+    pages = [chart_page(days[14:]), chart_page(days[:15])]
+    merged = merge_pages(pages, None, None)
+    assert list(merged["date"]) == [d.strftime("%Y%m%d") for d in days]
+
+    assert list(merge_pages(pages, 10, None)["date"]) == [d.strftime("%Y%m%d") for d in days[-10:]]
+    start = days[5].strftime("%Y%m%d")
+    assert merge_pages(pages, None, start)["date"].iloc[0] == start
+    assert merge_pages([], 10, None).empty
+
+
+def test_history_complete():
+    days = trading_days(30)
+    pages = [chart_page(days[15:])]
+    assert not history_complete(pages, 20, None)
+    assert history_complete(pages + [chart_page(days[:15])], 20, None)
+    # start: done once the oldest bar of the last page reaches back to it
+    assert history_complete(pages, None, days[15].strftime("%Y%m%d"))
+    assert not history_complete(pages, None, days[10].strftime("%Y%m%d"))
+
+
+def test_continuation_headers_round_trip():
+    assert next_page_key({"cont-yn": "N", "next-key": "abc"}) is None
+    key = next_page_key({"cont-yn": "Y", "next-key": "abc"})
+    assert continuation_headers(key) == {"cont-yn": "Y", "next-key": "abc"}
+    assert continuation_headers(None) is None
+
+
+class FakeResponse:
+    def __init__(self, items, next_key):
+        self.content = json.dumps({"stk_dt_pole_chart_qry": items, "return_code": 0}).encode()
+        self.headers = {"cont-yn": "Y", "next-key": next_key} if next_key else {}
+
+
+class FakeTransport:
+    """Serves `days` as daily chart pages of `page_size` bars, newest first"""
+
+    def __init__(self, days, page_size):
+        self.days = days[::-1]
+        self.page_size = page_size
+        self.requests = []
+
+    def post(self, api_id, body, extra_headers=None):
+        self.requests.append(extra_headers)
+        offset = int(extra_headers["next-key"]) if extra_headers else 0
+        chunk = self.days[offset:offset + self.page_size]
+        items = [{"dt": d.strftime("%Y%m%d"), "open_pric": "+100", "high_pric": "+110",
+                  "low_pric": "-90", "cur_prc": "+105", "trde_qty": "1000"} for d in chunk]
+        more = offset + self.page_size < len(self.days)
+        return FakeResponse(items, str(offset + self.page_size) if more else None)
+
+
+def test_price_history_follows_pages():
+    days = trading_days(250)
+    collector = KiwoomCollector(base_url="http://kiwoom.test")
+    collector.transport = FakeTransport(days, page_size=100)
+    collector._get_token = lambda: "token"
+
+    df = collector._load_price_history("005930", "ka10081", {}, 150, None, 50)
+    assert len(df) == 150
+    assert list(df["date"]) == [d.strftime("%Y%m%d") for d in days[-150:]]
+    # stops as soon as the count is covered: 2 pages, the second with next-key 100
+    assert collector.transport.requests == [None, {"cont-yn": "Y", "next-key": "100"}]
+
+    collector.transport = FakeTransport(days, page_size=100)
+    df = collector._load_price_history("005930", "ka10081", {}, None, days[0].strftime("%Y%m%d"), 50)
+    assert len(df) == 250 and len(collector.transport.requests) == 3
+
+
+def test_cache_ttl_and_uncached():
+    cache = ResponseCache(ttls={"short": 0.05, "none": 0})
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("short", "k", loader) == 1
+    assert cache.get_or_load("short", "k", loader) == 1   # hit
+    time.sleep(0.06)
+    assert cache.get_or_load("short", "k", loader) == 2   # expired
+    assert cache.get_or_load("none", "k", loader) == 3    # api-id without TTL: never cached
+    assert cache.get_or_load("none", "k", loader) == 4
+    assert cache.get_or_load("short", "u", lambda: Uncached("partial")) == "partial"
+    assert cache.get_or_load("short", "u", lambda: "full") == "full"
+    stats = cache.stats()["apis"]["short"]
+    assert stats["hits"] == 1 and stats["misses"] == 4
+
+
+def test_until_next_session():
+    assert until_next_session(datetime(2026, 10, 16, 10, 0)) == INTRADAY_BAR_TTL           # Fri, open
+    assert until_next_session(datetime(2026, 10, 16, 16, 0)) == (datetime(2026, 10, 19, 9, 0)
+                                                                 - datetime(2026, 10, 16, 16, 0)).total_seconds()
+    assert until_next_session(datetime(2026, 10, 19, 8, 0)) == 3600                        # Mon, before open
+
+
+def test_until_next_session_on_a_non_kst_host():
+    utc = timezone.utc
+    # Fri 10:00 KST is still Fri 01:00 UTC (before a UTC-clock open)
+    assert until_next_session(datetime(2026, 10, 16, 1, 0, tzinfo=utc)) == INTRADAY_BAR_TTL
+    # Fri 16:00 KST = Fri 07:00 UTC: closed until Mon 09:00 KST
+    assert until_next_session(datetime(2026, 10, 16, 7, 0, tzinfo=utc)) == (datetime(2026, 10, 19, 9, 0)
+                                                                            - datetime(2026, 10, 16, 16, 0)).total_seconds()
+    # Mon 08:00 KST = Sun 23:00 UTC
+    assert until_next_session(datetime(2026, 10, 18, 23, 0, tzinfo=utc)) == 3600
+
+
+def test_cache_single_flight_threads():
+    cache = ResponseCache(ttls={"api": 60})
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("api", "k", loader)))
+               for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert calls == [1] and results == ["value"] * 8
+    assert cache.stats()["apis"]["api"]["coalesced"] == 7
+
+
+def test_cache_single_flight_shares_errors_without_caching():
+    cache = ResponseCache(ttls={"api": 60})
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_load("api", "k", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert errors == ["boom"] * 4
+    assert cache.get_or_load("api", "k", lambda: "ok") == "ok"   # the error was not cached
+
+
+def test_cache_single_flight_async():
+    cache = ResponseCache(ttls={"api": 60})
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def main():
+        results = await asyncio.gather(*(cache.get_or_load_async("api", "k", loader) for _ in range(10)))
+        assert results == ["value"] * 10
+        # a cancelled waiter does not cancel the shared load
+        owner = asyncio.ensure_future(cache.get_or_load_async("api", "k2", loader))
+        waiter = asyncio.ensure_future(cache.get_or_load_async("api", "k2", loader))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        assert await owner == "value"
+
+    asyncio.run(main())
+    assert calls == [1, 1]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
@@ -0,0 +1,135 @@
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add current directory to path so we can import strategies/collectors
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from collectors.bar_store import BAR_DTYPE, BarSource, BarStore, bars_to_frame
+from collectors.listing_cache import ListingCache
+from strategies.screener import StockScreener
+from strategies.screener_panel import UniversePanel
+from strategies.screener_live import IncrementalScreener
+
+
+def synth_bars(rng, days, start="2025-01-02"):
+    """합성 일봉 (가끔 거래량/가격 급등이 섞인 랜덤 워크, 평일만)"""
+    bars = np.zeros(days, dtype=BAR_DTYPE)
+    dates = np.busday_offset(start, np.arange(days), roll="forward")
+    bars["date"] = [int(str(d).replace("-", "")) for d in dates]
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    jump = rng.random(days) < 0.05
+    close[jump] *= 1.08
+    bars["close"] = np.round(close)
+    bars["open"] = np.round(close * (1 + rng.normal(0, 0.01, days)))
+    bars["high"] = np.maximum(bars["open"], bars["close"]) * (1 + rng.random(days) * 0.02)
+    bars["low"] = np.minimum(bars["open"], bars["close"]) * (1 - rng.random(days) * 0.02)
+    volume = rng.lognormal(11, 0.5, days)
+    volume[jump] *= 3
+    bars["volume"] = np.round(volume)
+    return bars
+
+
+def offline_screener(root):
+    """임시 폴더 저장소를 쓰는 스크리너 (data/ 아래에 파일을 만들지 않고, 다운로드하지 않음)"""
+    def no_fetch(*args):
+        raise AssertionError("offline")
+    return StockScreener(bar_store=BarStore(root, source=BarSource("offline", no_fetch)),
+                         listing_cache=ListingCache(os.path.join(root, "stock_list.npz"),
+                                                    fetcher=no_fetch, krx_json=None))
+
+
+def synth_rows(n=300, seed=7):
+    """(symbol, name, market, market_cap(억), bars) - 일부는 21봉 미만"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        days = int(rng.integers(5, 40)) if i % 10 == 0 else 60
+        rows.append((f"{i:06d}", f"종목{i}", "KOSPI" if i % 2 else "KOSDAQ",
+                     float(rng.lognormal(8, 1.5)), synth_bars(rng, days)))
+    return rows
+
+
+def test_panel_matches_check_momentum_surge():
+    """패널 경로(screen_panel)와 행 단위 경로(check_momentum_surge)의 점수/조건이 같아야 함"""
+    with tempfile.TemporaryDirectory() as root:
+        screener = offline_screener(root)
+    params = screener.resolve_params("momentum_surge")
+    rows = synth_rows()
+
+    panel = UniversePanel.from_bars(rows, window=30)
+    by_symbol = {r["symbol"]: r for r in screener.screen_panel("momentum_surge", panel, params, 1)}
+
+    compared = 0
+    for symbol, name, market, market_cap, bars in rows:
+        expected = screener.check_momentum_surge(symbol, name, market, bars_to_frame(bars), market_cap, params)
+        got = by_symbol.get(symbol)
+        if expected is None or expected.score < 1:
+            assert got is None, symbol
+            continue
+        assert got is not None, symbol
+        assert got["score"] == expected.score, symbol
+        assert got["conditions_met"] == expected.conditions_met, symbol
+        assert got["change_pct"] == round(expected.change_pct, 2), symbol
+        compared += 1
+    assert compared > 100
+
+
+def test_incremental_rolling_sums_match_recompute():
+    """틱/새 봉으로 갱신한 롤링 합계가 같은 봉으로 새로 계산한 값과 같고, 채점도 check_momentum_surge와 같아야 함"""
+    rng = np.random.default_rng(11)
+    with tempfile.TemporaryDirectory() as root:
+        screener = offline_screener(root)
+    params = screener.resolve_params("momentum_surge")
+    live = IncrementalScreener(params, min_score=1)
+
+    bars = synth_bars(rng, 40)
+    seeded, future = bars[:30].copy(), bars[30:]
+    live.seed("000001", "종목", "KOSPI", 5000.0, seeded)
+
+    history = seeded.copy()
+    for bar in future:
+        # 당일 봉: 시가로 시작 -> 틱 몇 개 (누적 거래량 증가) -> 마지막 틱이 종가
+        date = int(bar["date"])
+        prices = [bar["open"], *rng.uniform(bar["low"], bar["high"], 3), bar["close"]]
+        volumes = np.linspace(bar["volume"] / len(prices), bar["volume"], len(prices))
+        for price, volume in zip(prices, volumes):
+            live.update_tick("000001", float(price), float(volume), date)
+        history = np.append(history, bar)
+        history[-1]["high"] = max(bar["open"], *prices)
+
+        state = live._states["000001"]
+        closes, vols = history["close"][-20:], history["volume"][-20:]
+        assert abs(state.sum_close20 - closes.sum()) < 1e-6
+        assert abs(state.sum_close5 - closes[-5:].sum()) < 1e-6
+        assert abs(state.sum_volume20 - vols.sum()) < 1e-6
+        assert state.prev_close == history["close"][-2]
+
+        live.refresh()
+        expected = screener.check_momentum_surge("000001", "종목", "KOSPI", bars_to_frame(history), 5000.0, params)
+        got = {r["symbol"]: r for r in live.results()}.get("000001")
+        if expected.score < 1:
+            assert got is None
+        else:
+            assert got["score"] == expected.score
+            assert got["conditions_met"] == expected.conditions_met
+
+
+def test_incremental_trade_volume_without_cumulative():
+    """누적 거래량(13)이 없는 틱은 체결량(15)을 당일 거래량에 더함"""
+    live = IncrementalScreener({}, min_score=1)
+    live.seed("000001", "종목", "KOSPI", 5000.0, synth_bars(np.random.default_rng(3), 25))
+    today = 20990101
+    live.update_tick("000001", 100.0, None, today, trade_volume=10)
+    live.update_tick("000001", 101.0, None, today, trade_volume=5)
+    state = live._states["000001"]
+    assert state.volume == 15 and state.close == 101.0 and state.open == 100.0 and state.high == 101.0
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: OK")
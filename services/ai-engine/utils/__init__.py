@@ -1 +1,2 @@
 from .telegram_bot import send_telegram_message
+from .rate_limit import RateLimiter, PriorityRateScheduler, get_rate_limiter
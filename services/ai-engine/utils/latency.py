@@ -0,0 +1,281 @@
+"""
+Latency - 주문 경로 지연 측정 (단계별 span -> 히스토그램, 주문별 trace 로그)
+
+- OrderTrace: 신호 수신(조건검색 REAL / 실시간 체결 틱)부터 주문 접수 응답, 텔레그램 알림까지
+  단계별 소요 시간을 기록하고, 끝나면 trace 한 줄(JSON)을 order_trace 로거로 남김
+  (ORDER_TRACE_LOG를 지정하면 그 파일에도 JSONL로 저장)
+- 키움 트랜스포트(sync/async)는 api-id별 요청 시간과 rate limit 대기 시간을 기록하고,
+  진행 중인 trace가 있으면 그 trace에도 span으로 붙임 (contextvars, to_thread에도 전파됨)
+- 히스토그램은 Prometheus 텍스트 형식(/metrics)과 백분위 요약(summary)으로 내보냄
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "stockiq_order_stage_seconds": "Time spent in each stage of an order (side, stage)",
+    "stockiq_order_signal_to_ack_seconds": "Signal receipt to broker order acknowledgement (side)",
+    "stockiq_order_total_seconds": "Signal receipt to end of order handling (side, outcome)",
+    "stockiq_kiwoom_request_seconds": "Kiwoom REST round trip per api-id",
+    "stockiq_kiwoom_rate_wait_seconds": "Wait for the Kiwoom rate-limit scheduler per api-id",
+}
+
+# 주문별 trace 로그 (한 줄 = 주문 하나, JSON)
+trace_logger = logging.getLogger("order_trace")
+_trace_log_path = os.getenv("ORDER_TRACE_LOG")
+if _trace_log_path:
+    _handler = logging.FileHandler(_trace_log_path, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    trace_logger.addHandler(_handler)
+    trace_logger.setLevel(logging.INFO)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus와 같은 le 버킷)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸 = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """버킷 안에서 선형 보간한 백분위 추정치 (초)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lo = self.buckets[i - 1] if i > 0 else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lo + (hi - lo) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class LatencyMetrics:
+    """이름 + 라벨별 히스토그램 모음 (thread-safe)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._series.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self.buckets)
+            hist.observe(max(0.0, seconds))
+
+    def quantiles(self, name: str, qs=(0.5, 0.95, 0.99), **labels) -> Optional[Dict[str, float]]:
+        """특정 시리즈의 백분위 (ms), 관측값이 없으면 None"""
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            hist = self._series.get(name, {}).get(key)
+            if hist is None or not hist.count:
+                return None
+            result = {f"p{int(q * 100)}_ms": round(hist.quantile(q) * 1000, 1) for q in qs}
+            result.update(count=hist.count, max_ms=round(hist.max * 1000, 1))
+            return result
+
+    def summary(self) -> Dict[str, List[dict]]:
+        """이름별 [{라벨..., count, p50_ms, p95_ms, p99_ms, max_ms}]"""
+        with self._lock:
+            out = {}
+            for name, series in sorted(self._series.items()):
+                out[name] = [
+                    {**dict(key), "count": h.count,
+                     **{f"p{q}_ms": round(h.quantile(q / 100) * 1000, 1) for q in (50, 95, 99)},
+                     "max_ms": round(h.max * 1000, 1)}
+                    for key, h in sorted(series.items())
+                ]
+            return out
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._series.items()):
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, h in sorted(series.items()):
+                    labels = ",".join(f'{k}="{v}"' for k, v in key)
+                    sep = "," if labels else ""
+                    cumulative = 0
+                    for bound, n in zip(self.buckets + (float("inf"),), h.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+                    suffix = f"{{{labels}}}" if labels else ""
+                    lines.append(f"{name}_sum{suffix} {h.sum:.6f}")
+                    lines.append(f"{name}_count{suffix} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+# 싱글톤 인스턴스
+_metrics = LatencyMetrics()
+
+def get_latency_metrics() -> LatencyMetrics:
+    return _metrics
+
+
+_current_trace: ContextVar[Optional["OrderTrace"]] = ContextVar("order_trace", default=None)
+
+def current_trace() -> Optional["OrderTrace"]:
+    return _current_trace.get()
+
+
+class OrderTrace:
+    """
+    주문 하나의 단계별 타이밍
+    - started: 신호 수신 시각 (time.monotonic, 큐 대기 전에 잡아야 signal-to-ack에 포함됨)
+    - span(stage): 단계 구간 측정, add(stage, seconds): 밖에서 잰 구간 추가
+    - acked(): 주문 접수 응답 시점 (signal-to-ack 히스토그램)
+    - finish(outcome): 전체 시간 기록 + trace 로그 한 줄
+    """
+
+    def __init__(self, side: str, symbol: str, started: Optional[float] = None):
+        self.side = side
+        self.symbol = symbol
+        self.started = started if started is not None else time.monotonic()
+        self.wall_start = time.time() - (time.monotonic() - self.started)
+        self.trace_id = f"{side}-{symbol}-{int(self.wall_start * 1000)}"
+        self.spans: List[dict] = []
+        self.attrs: Dict[str, object] = {}
+        self.ack_ms: Optional[float] = None
+        self.finished = False
+
+    def _offset_ms(self, at: float) -> float:
+        return round((at - self.started) * 1000, 1)
+
+    def add(self, stage: str, seconds: float, start: Optional[float] = None, record: bool = True):
+        """구간 추가 (record=False면 trace에만 남기고 단계 히스토그램에는 넣지 않음)"""
+        start = start if start is not None else time.monotonic() - seconds
+        self.spans.append({"stage": stage, "at_ms": self._offset_ms(start), "ms": round(seconds * 1000, 1)})
+        if record:
+            _metrics.observe("stockiq_order_stage_seconds", seconds, side=self.side, stage=stage)
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.monotonic()
+        try:
+            yield self
+        finally:
+            self.add(stage, time.monotonic() - start, start)
+
+    @contextmanager
+    def activate(self):
+        """이 trace를 현재 컨텍스트에 걸어 둠 (트랜스포트의 api-id 구간이 여기에 붙음)"""
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    def note(self, **attrs):
+        self.attrs.update(attrs)
+
+    def acked(self):
+        elapsed = time.monotonic() - self.started
+        self.ack_ms = round(elapsed * 1000, 1)
+        _metrics.observe("stockiq_order_signal_to_ack_seconds", elapsed, side=self.side)
+
+    def finish(self, outcome: str):
+        if self.finished:
+            return
+        self.finished = True
+        elapsed = time.monotonic() - self.started
+        _metrics.observe("stockiq_order_total_seconds", elapsed, side=self.side, outcome=outcome)
+        record = {
+            "trace_id": self.trace_id,
+            "side": self.side,
+            "symbol": self.symbol,
+            "outcome": outcome,
+            "signal_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.wall_start))
+                         + f".{int(self.wall_start * 1000) % 1000:03d}",
+            "total_ms": round(elapsed * 1000, 1),
+            "ack_ms": self.ack_ms,
+            "spans": self.spans,
+            **self.attrs,
+        }
+        trace_logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def observe_request(api_id: str, wait_seconds: float, request_seconds: float):
+    """키움 요청 1건 (트랜스포트에서 호출): api-id별 히스토그램 + 진행 중인 trace의 span"""
+    _metrics.observe("stockiq_kiwoom_rate_wait_seconds", wait_seconds, api_id=api_id)
+    _metrics.observe("stockiq_kiwoom_request_seconds", request_seconds, api_id=api_id)
+    trace = _current_trace.get()
+    if trace is not None:
+        now = time.monotonic()
+        if wait_seconds >= 0.0005:
+            trace.add(f"{api_id}.wait", wait_seconds, now - request_seconds - wait_seconds, record=False)
+        trace.add(api_id, request_seconds, now - request_seconds, record=False)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/metrics":
+            body, content_type = _metrics.render(), "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body, content_type = json.dumps(_metrics.summary()), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 스크레이프마다 로그 남기지 않음
+
+
+def start_metrics_server(port: Optional[int] = None, host: Optional[str] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    FastAPI가 없는 프로세스(main_auto)용 /metrics 서버 (데몬 스레드, METRICS_PORT=0이면 끔)
+    기본은 127.0.0.1에만 열림 - 외부 스크레이퍼가 필요하면 METRICS_HOST=0.0.0.0으로 명시
+    """
+    port = int(port if port is not None else os.getenv("METRICS_PORT", "9108"))
+    host = host or os.getenv("METRICS_HOST", "127.0.0.1")
+    if port <= 0:
+        return None
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"Metrics server failed to start on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Metrics server listening on {host}:{port} (/metrics, /metrics.json)")
+    return server
@@ -44,7 +44,8 @@ def render_main_menu() -> str:
         "1. 📊 보유 종목 관리\n"
         "2. 🎯 신규 매수 설정\n"
         "3. ⚙️ 전체 설정\n"
-        "4. 📈 현재 상태\n\n"
+        "4. 📈 현재 상태\n"
+        "5. 🚨 전체 청산\n\n"
         "0. 종료\n\n"
         "👉 번호 입력:"
     )
@@ -92,6 +93,28 @@ def render_stock_detail(stock_info: dict, symbol: str) -> str:
     )
 
 
+def render_liquidate_confirm(holdings: list) -> str:
+    """전체 청산 확인"""
+    if not holdings:
+        return (
+            "🚨 전체 청산\n\n"
+            "보유 중인 종목이 없습니다.\n\n"
+            "0. ⬅️ 뒤로\n\n"
+            "👉 번호:"
+        )
+    lines = [f"🚨 전체 청산 ({len(holdings)}종목)\n"]
+    for h in holdings:
+        lines.append(f"• {h.get('stk_nm', 'N/A')} {h.get('rmnd_qty', 0)}주  {float(h.get('pl_rt', 0)):+.2f}%")
+    lines.append(
+        "\n모든 보유 종목을 동시에 시장가 매도하고\n"
+        "신규 매수를 중지합니다. (/start로 재개)\n\n"
+        "1. 🔴 전체 청산 실행\n"
+        "0. 취소\n\n"
+        "👉 번호:"
+    )
+    return "\n".join(lines)
+
+
 def render_value_select(param_name: str, current_value: float, value_type: str = "default") -> str:
     """값 선택 메뉴"""
     if value_type == "stop_loss":
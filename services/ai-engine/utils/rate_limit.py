@@ -0,0 +1,148 @@
+"""
+Rate Limiter - 토큰 버킷 기반 요청 속도 제한 (thread-safe)
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class RateLimiter:
+    """초당 rate개, 최대 burst개까지 몰아서 허용하는 토큰 버킷"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, int(rate)))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """토큰을 소비하지 않고, tokens개를 얻기까지 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 얻으면 0, 아니면 다음 토큰까지 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+
+# key -> (대기열 그룹, 우선순위(작을수록 먼저), 소비할 버킷들)
+Route = Callable[[str], Tuple[str, int, Sequence[RateLimiter]]]
+
+POLL_INTERVAL = 0.005  # 비동기 대기자가 앞 순서를 기다릴 때 확인 주기(초)
+
+
+class PriorityRateScheduler:
+    """
+    여러 토큰 버킷을 묶어 우선순위 순으로 배분하는 스케줄러 (스레드/asyncio 공용)
+
+    - 요청(key)마다 route로 그룹/우선순위/버킷을 정함
+    - 그룹별 대기열에서 우선순위 -> 도착 순서로 맨 앞 요청만 버킷을 소비
+      (다른 그룹은 서로 막지 않음)
+    - 버킷에 여유가 있으면 기다리지 않고 바로 통과
+    """
+
+    def __init__(self, route: Route):
+        self.route = route
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List[list]] = {}
+        self._seq = itertools.count()
+
+    def _enqueue(self, key: str) -> Tuple[str, list]:
+        group, priority, limiters = self.route(key)
+        entry = [priority, next(self._seq), tuple(limiters)]
+        heapq.heappush(self._queues.setdefault(group, []), entry)
+        return group, entry
+
+    def _try_take(self, group: str, entry: list) -> Optional[float]:
+        """(잠금 상태에서) 통과하면 0, 버킷 대기면 대기 시간, 앞 순서가 있으면 None"""
+        queue = self._queues[group]
+        if queue[0] is not entry:
+            return None
+        limiters = entry[2]
+        wait = max((limiter.wait_time() for limiter in limiters), default=0.0)
+        if wait > 0:
+            return wait
+        for limiter in limiters:
+            limiter.try_acquire()
+        heapq.heappop(queue)
+        self._cond.notify_all()
+        return 0.0
+
+    def _discard(self, group: str, entry: list):
+        queue = self._queues[group]
+        if entry in queue:
+            queue.remove(entry)
+            heapq.heapify(queue)
+            self._cond.notify_all()
+
+    def acquire(self, key: str):
+        """차례가 오고 버킷에 여유가 생길 때까지 대기 (스레드)"""
+        with self._cond:
+            group, entry = self._enqueue(key)
+            try:
+                while True:
+                    wait = self._try_take(group, entry)
+                    if wait == 0:
+                        return
+                    self._cond.wait(wait)
+            except BaseException:
+                self._discard(group, entry)
+                raise
+
+    async def acquire_async(self, key: str):
+        """acquire의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        with self._cond:
+            group, entry = self._enqueue(key)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(group, entry)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait if wait is not None else POLL_INTERVAL)
+        except BaseException:
+            with self._cond:
+                self._discard(group, entry)
+            raise
+
+    def pending(self) -> Dict[str, int]:
+        """그룹별 대기 중인 요청 수"""
+        with self._cond:
+            return {group: len(queue) for group, queue in self._queues.items()}
+
+
+# 호스트별 공유 인스턴스
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(host: str, rate: float, burst: Optional[int] = None) -> RateLimiter:
+    """호스트별 RateLimiter (프로세스 내 공유, 최초 생성 시 설정 적용)"""
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = RateLimiter(rate, burst)
+        return _limiters[host]